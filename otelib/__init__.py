@@ -6,8 +6,9 @@ A package to interact with the Open Translation Environment (OTE) API.
 from __future__ import annotations
 
 from .client import OTEClient
+from .pipeline import Pipeline
 
-__all__ = ("OTEClient",)
+__all__ = ("OTEClient", "Pipeline")
 
 __version__ = "1.0.0"
 __author__ = "SINTEF"
@@ -2,22 +2,42 @@
 
 from __future__ import annotations
 
+import os
 import warnings
 from abc import ABC, abstractmethod
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from typing import TYPE_CHECKING
 
 from otelib.backends.factories import strategy_factory
 from otelib.backends.utils import Backend, StrategyType
+from otelib.pipeline import Pipeline
 from otelib.warnings import IgnoringConfigOptions
 
 if TYPE_CHECKING:  # pragma: no cover
+    from collections.abc import (
+        Iterable,
+        Iterator,
+        Mapping,
+        MutableMapping,
+        Sequence,
+    )
+    from concurrent.futures import Future
     from typing import Any
 
     from otelib.backends.strategies import AbstractBaseStrategy
 
+    BatchInput = Mapping[str | StrategyType | AbstractBaseStrategy, dict[str, Any]]
+
 
 class AbstractBaseClient(ABC):
-    """The abstract base class defining the API for a backend client."""
+    """The abstract base class defining the API for a backend client.
+
+    Custom configuration options for all backends:
+        result_cache (MutableMapping | None): The cache for memoizing pipeline
+            results, e.g., a bounded `otelib.cache.LRUCache`, shared by all strategies
+            created by the client. Defaults to `None`, i.e., results are not memoized.
+
+    """
 
     _backend: Backend | str
 
@@ -28,6 +48,7 @@ class AbstractBaseClient(ABC):
 
         self._source = ""
         self._backend = Backend(self._backend)
+        self._result_cache: MutableMapping[str, Any] | None = None
 
         self._validate_source(source)
         self._set_config(config)
@@ -54,6 +75,7 @@ class AbstractBaseClient(ABC):
 
     def _set_config(self, config: dict[str, Any]) -> None:
         """Set the custom client configuration options."""
+        self._result_cache = config.pop("result_cache", None)
         if config:
             warnings.warn(
                 f"The given configuration option(s) for {tuple(config)} is/are "
@@ -62,6 +84,21 @@ class AbstractBaseClient(ABC):
                 stacklevel=2,
             )
 
+    def close(self) -> None:  # noqa: B027
+        """Release any resources held by the client.
+
+        This method should be overridden in the given implementation if the client
+        holds on to resources, e.g., network connections.
+        """
+
+    async def aclose(self) -> None:
+        """Release any resources held by the client asynchronously.
+
+        This method should be overridden in the given implementation if the client
+        holds on to resources that must be awaited when released.
+        """
+        self.close()
+
     @abstractmethod
     def _create_strategy(
         self, strategy_cls: type[AbstractBaseStrategy], **config
@@ -80,6 +117,226 @@ class AbstractBaseClient(ABC):
     def create_strategy(
         self, strategy_type: str | StrategyType, **config
     ) -> AbstractBaseStrategy:
-        """Create a strategy."""
+        """Create a strategy.
+
+        Besides the strategy configuration, `memoize=False` may be given to never
+        memoize results of pipelines with this strategy.
+        """
+        strategy_cls = strategy_factory(self._backend, strategy_type)
+        memoize = config.pop("memoize", True)
+        return self._set_result_cache(
+            self._create_strategy(strategy_cls, **config), memoize
+        )
+
+    def _create_many(
+        self, strategies: list[tuple[type[AbstractBaseStrategy], dict[str, Any]]]
+    ) -> list[AbstractBaseStrategy]:
+        """Create many strategies.
+
+        This method should not be run by a user, hence it is "private".
+        The method is used with the `create_many()` method and allows a backend to
+        create strategies concurrently or in a single request.
+        By default, `_create_strategy()` is called for each strategy in turn.
+
+        Parameters:
+            strategies: The strategy classes and configurations to create.
+
+        Returns:
+            The newly created strategies, in the same order.
+
+        """
+        return [
+            self._create_strategy(strategy_cls, **config)
+            for strategy_cls, config in strategies
+        ]
+
+    def create_many(
+        self, strategies: Iterable[tuple[str | StrategyType, dict[str, Any]]]
+    ) -> list[AbstractBaseStrategy]:
+        """Create many strategies.
+
+        Besides the strategy configuration, `memoize=False` may be given to never
+        memoize results of pipelines with a strategy.
+
+        Parameters:
+            strategies: The strategy types and configurations to create.
+
+        Returns:
+            The newly created strategies, in the same order.
+
+        """
+        to_create: list[tuple[type[AbstractBaseStrategy], dict[str, Any]]] = []
+        memoize: list[bool] = []
+        for strategy_type, strategy_config in strategies:
+            config = dict(strategy_config)
+            memoize.append(config.pop("memoize", True))
+            to_create.append((strategy_factory(self._backend, strategy_type), config))
+
+        return [
+            self._set_result_cache(strategy, strategy_memoize)
+            for strategy, strategy_memoize in zip(
+                self._create_many(to_create), memoize, strict=True
+            )
+        ]
+
+    async def _acreate_strategy(
+        self, strategy_cls: type[AbstractBaseStrategy], **config
+    ) -> AbstractBaseStrategy:
+        """Create a strategy asynchronously.
+
+        This method should not be run by a user, hence it is "private".
+        The method is used with the `acreate_strategy()` method and allows a backend
+        supporting non-blocking I/O to customize its strategy creation method.
+        By default, `_create_strategy()` is run in a separate thread.
+
+        Returns:
+            The newly created strategy.
+
+        """
+        import asyncio
+
+        return await asyncio.to_thread(self._create_strategy, strategy_cls, **config)
+
+    async def acreate_strategy(
+        self, strategy_type: str | StrategyType, **config
+    ) -> AbstractBaseStrategy:
+        """Create a strategy asynchronously.
+
+        See `create_strategy()`.
+        """
         strategy_cls = strategy_factory(self._backend, strategy_type)
-        return self._create_strategy(strategy_cls, **config)
+        memoize = config.pop("memoize", True)
+        return self._set_result_cache(
+            await self._acreate_strategy(strategy_cls, **config), memoize
+        )
+
+    def _set_result_cache(
+        self, strategy: AbstractBaseStrategy, memoize: bool
+    ) -> AbstractBaseStrategy:
+        """Set the client's result cache for a newly created strategy."""
+        strategy.result_cache = self._result_cache
+        strategy.memoize = memoize
+        return strategy
+
+    def run_batch(
+        self,
+        pipeline: AbstractBaseStrategy | Pipeline,
+        inputs: Iterable[BatchInput],
+        max_workers: int | None = None,
+    ) -> Iterator[tuple[int, bytes]]:
+        """Run a pipeline once for each of many inputs.
+
+        Each input maps a strategy in the pipeline to the configuration fields that
+        should differ from the configuration it was created with.
+        A strategy is given either as the strategy object itself or as its strategy
+        type, if only one strategy of that type is in the pipeline.
+
+        Only strategies with differing fields are created anew for an input, all other
+        strategies are reused as they are.
+
+        Parameters:
+            pipeline: The pipeline, or the last strategy of the pipeline, to run.
+            inputs: The configuration fields to vary for each run.
+            max_workers: The maximum number of pipelines to run in parallel.
+                Defaults to the number of CPUs plus 4, at most 32, like
+                `concurrent.futures.ThreadPoolExecutor`.
+
+        Yields:
+            A tuple of the index of the input in `inputs` and the output from the
+            pipeline's `get()` method, as soon as each pipeline run completes.
+
+        """
+        template = (
+            pipeline
+            if isinstance(pipeline, Pipeline)
+            else Pipeline.from_strategy(pipeline)
+        )
+        inputs = iter(enumerate(inputs))
+        max_workers = max_workers or min(32, (os.cpu_count() or 1) + 4)
+
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        running: dict[Future[bytes], int] = {}
+        try:
+            while True:
+                # Keep a bounded number of runs queued, to only consume inputs as
+                # results are yielded.
+                for index, overrides in inputs:
+                    future = executor.submit(self._run_batch_input, template, overrides)
+                    running[future] = index
+                    if len(running) >= 2 * max_workers:
+                        break
+
+                if not running:
+                    return
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield running.pop(future), future.result()
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def _run_batch_input(self, template: Pipeline, overrides: BatchInput) -> bytes:
+        """Run a single input for `run_batch()`.
+
+        Parameters:
+            template: The pipeline to vary.
+            overrides: The input, mapping strategies to differing configuration fields.
+
+        Returns:
+            The output from the pipeline's `get()` method.
+
+        """
+        configs = _resolve_batch_input(template.strategies, overrides)
+
+        strategies: list[AbstractBaseStrategy] = []
+        for index, template_strategy in enumerate(template.strategies):
+            if index in configs:
+                if template_strategy.config is None:
+                    raise ValueError(
+                        f"Cannot vary the configuration of {template_strategy!r}, "
+                        "since it has not been created."
+                    )
+                strategy = self._set_result_cache(
+                    self._create_strategy(
+                        type(template_strategy),
+                        **{
+                            **template_strategy.config.model_dump(
+                                mode="json", exclude_unset=True
+                            ),
+                            **configs[index],
+                        },
+                    ),
+                    template_strategy.memoize,
+                )
+            else:
+                strategy = template_strategy
+            strategies.append(strategy)
+
+        return template._substitute(strategies).get()
+
+
+def _resolve_batch_input(
+    template: Sequence[AbstractBaseStrategy], overrides: BatchInput
+) -> dict[int, dict[str, Any]]:
+    """Map the strategies in a `run_batch()` input to their index in the pipeline."""
+    configs: dict[int, dict[str, Any]] = {}
+    for key, config in overrides.items():
+        if isinstance(key, str):
+            strategy_type = StrategyType(key)
+            indices = [
+                index
+                for index, strategy in enumerate(template)
+                if strategy.strategy_type == strategy_type
+            ]
+        else:
+            indices = [
+                index for index, strategy in enumerate(template) if strategy is key
+            ]
+
+        if len(indices) != 1:
+            raise ValueError(
+                f"{key!r} must identify exactly one strategy in the pipeline, "
+                f"found {len(indices)}."
+            )
+        configs.setdefault(indices[0], {}).update(config)
+    return configs
@@ -2,12 +2,18 @@
 
 from __future__ import annotations
 
-from .dataresource import DataResource
-from .filter import Filter
-from .function import Function
-from .mapping import Mapping
-from .parser import Parser
-from .transformation import Transformation
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:  # pragma: no cover
+    from typing import Any
+
+    from .dataresource import DataResource
+    from .filter import Filter
+    from .function import Function
+    from .mapping import Mapping
+    from .parser import Parser
+    from .transformation import Transformation
 
 __all__ = (
     "DataResource",
@@ -17,3 +23,10 @@ __all__ = (
     "Parser",
     "Transformation",
 )
+
+
+def __getattr__(name: str) -> Any:
+    """Import the strategies lazily, as importing OTEAPI Core models is slow."""
+    if name in __all__:
+        return getattr(importlib.import_module(f"{__name__}.{name.lower()}"), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
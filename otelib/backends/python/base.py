@@ -2,23 +2,55 @@
 
 from __future__ import annotations
 
-import json
+import copy
+import threading
 import warnings
+import weakref
+from collections.abc import Mapping
 from typing import TYPE_CHECKING
 from uuid import uuid4
 
-from oteapi.models import AttrDict
-from oteapi.plugins import create_strategy
 from oteapi.utils.config_updater import populate_config_from_session
 
-from otelib.backends.strategies import AbstractBaseStrategy
+from otelib.backends.python.plugins import call_plugin_method, run_plugin_method
+from otelib.backends.python.session import Session
+from otelib.backends.strategies import AbstractBaseStrategy, StrategyResult
 from otelib.exceptions import ItemNotFoundInCache, PythonBackendException
+from otelib.tracing import trace_step
 
 if TYPE_CHECKING:  # pragma: no cover
+    from collections.abc import MutableMapping
+    from concurrent.futures import Executor
     from typing import Any, Literal
 
     from oteapi.models import GenericConfig
 
+    from otelib.backends.python.plugins import PluginCache
+
+# The locks serializing the updates of each session in this process, each kept only
+# as long as it is in use
+_SESSION_LOCKS: weakref.WeakValueDictionary[str, threading.Lock] = (
+    weakref.WeakValueDictionary()
+)
+_SESSION_LOCKS_LOCK = threading.Lock()
+
+
+def session_lock(session_id: str) -> threading.Lock:
+    """Return the lock serializing the updates of a session in this process.
+
+    Parameters:
+        session_id: The ID of the session.
+
+    Returns:
+        The same lock for all concurrent callers with the same session ID.
+
+    """
+    with _SESSION_LOCKS_LOCK:
+        lock = _SESSION_LOCKS.get(session_id)
+        if lock is None:
+            lock = _SESSION_LOCKS[session_id] = threading.Lock()
+        return lock
+
 
 class BasePythonStrategy(AbstractBaseStrategy):
     """Base class for strategies for the python backend.
@@ -26,14 +58,46 @@ class BasePythonStrategy(AbstractBaseStrategy):
     Parameters:
         source (str): The Python interpreter to use in the local environment.
             Currently only `python` is allowed.
+        cache (MutableMapping | None): The cache for sessions, e.g., a dict or a
+            bounded `otelib.cache.LRUCache`. If the cache has `pin()` and `unpin()`
+            methods, a session is pinned from its creation until the `get()` call
+            that created it completes, so it is not evicted while in use.
+        teardown_sessions (bool): Whether to remove a session from the cache once the
+            `get()` call that created it completes.
+        plugin_cache (PluginCache | None): A cache of instantiated OTEAPI plugin
+            strategies to reuse. If not given, a plugin strategy is instantiated for
+            every call.
+        executor (Executor | None): A process pool to run the plugin strategies in.
+            If not given, they are run in the calling thread.
 
     Attributes:
         interpreter (str): This is always `python` for the Python backend.
+        config (GenericConfig | None): The validated configuration the strategy was
+            created with.
         input_pipe (Pipe | None): An input pipeline.
 
+    Thread safety:
+        Strategies and their cache may be shared by threads, e.g., to run pipelines,
+        or concurrent branches of a pipeline, in a thread pool.
+        A session stored in the cache is never changed in place. Every update of a
+        session stores a new session object, serialized with the other updates of
+        the same session in this process, so no update is lost and every step reads
+        a consistent snapshot of the session.
+        The cache itself must be safe to use from several threads, as a `dict`,
+        `otelib.cache.LRUCache`, and `otelib.cache.DiskCache` are.
+        Sessions are only locked within a process. A session must not be updated
+        by several processes sharing a `DiskCache` at the same time.
+
     """
 
-    def __init__(self, source: str, cache: dict[str, Any] | None = None) -> None:
+    def __init__(
+        self,
+        source: str,
+        cache: MutableMapping[str, Any] | None = None,
+        teardown_sessions: bool = False,
+        plugin_cache: PluginCache | None = None,
+        executor: Executor | None = None,
+    ) -> None:
         super().__init__(source)
 
         self.interpreter: str | None = source
@@ -42,6 +106,9 @@ class BasePythonStrategy(AbstractBaseStrategy):
                 f"No global cache used for Python backend strategy {self}", stacklevel=2
             )
         self.cache = cache if cache is not None else {}
+        self.teardown_sessions = teardown_sessions
+        self.plugin_cache = plugin_cache
+        self.executor = executor
 
         if self.interpreter != "python":
             raise ValueError(
@@ -50,10 +117,22 @@ class BasePythonStrategy(AbstractBaseStrategy):
 
     def create(self, **config) -> None:
         session_id = config.pop("session_id", None)
-        data = self.strategy_config(**config)
+        with trace_step("validate", self):
+            data = self.strategy_config(**config)
 
+        with trace_step("create", self, session_id):
+            self._create(data, session_id)
+
+    def _create(self, data: GenericConfig, session_id: str | None) -> None:
+        """Keep a validated strategy configuration, adding the strategy to a session.
+
+        Parameters:
+            data: The validated strategy configuration.
+            session_id: The ID of a session to add the strategy to.
+
+        """
         self.strategy_id = f"{self.strategy_type}-{uuid4()}"
-        self.cache[self.strategy_id] = data.model_dump_json(exclude_unset=True)
+        self.config = data
 
         if session_id:
             if session_id not in self.cache:
@@ -63,41 +142,73 @@ class BasePythonStrategy(AbstractBaseStrategy):
 
             # Add strategy ID information to the session object.
             list_key = f"{self.strategy_type}_info"
-            if list_key in self.cache[session_id]:
-                if not isinstance(self.cache[session_id][list_key], list):
+            with session_lock(session_id):
+                session = self._fetch_session_data(session_id)
+                strategy_ids = session.get(list_key, [])
+                if not isinstance(strategy_ids, list):
                     raise TypeError(
                         f"Expected type for {list_key!r} field in session to be a "
-                        f"list, found {type(self.cache[session_id][list_key])!r}."
+                        f"list, found {type(strategy_ids)!r}."
                     )
-                self.cache[session_id][list_key].append(self.strategy_id)
-            else:
-                self.cache[session_id][list_key] = [self.strategy_id]
+                self.cache[session_id] = session.updated(
+                    {list_key: [*strategy_ids, self.strategy_id]}
+                )
 
     def fetch(self, session_id: str) -> bytes:
-        return self._run_strategy_method("get", session_id)
+        return self._run_strategy_method("get", session_id).content
 
     def initialize(self, session_id: str) -> bytes:
+        return self._run_strategy_method("initialize", session_id).content
+
+    def _fetch_result(self, session_id: str) -> StrategyResult:
+        # Respect any override of `fetch()`
+        if getattr(self.fetch, "__func__", None) is not BasePythonStrategy.fetch:
+            return super()._fetch_result(session_id)
+        return self._run_strategy_method("get", session_id)
+
+    def _initialize_result(self, session_id: str) -> StrategyResult:
+        # Respect any override of `initialize()`
+        if (
+            getattr(self.initialize, "__func__", None)
+            is not BasePythonStrategy.initialize
+        ):
+            return super()._initialize_result(session_id)
         return self._run_strategy_method("initialize", session_id)
 
     def _create_session(self) -> str:
         session_id = f"session-{uuid4()}"
-        self.cache[session_id] = {}
+        # Keep a bounded cache from evicting the session until it is closed
+        pin = getattr(self.cache, "pin", None)
+        if pin is not None:
+            pin(session_id)
+        self.cache[session_id] = Session()
         return session_id
 
+    def _update_session(self, session_id: str, session_update: dict[str, Any]) -> None:
+        self._merge_session(session_id, copy.deepcopy(session_update))
+
+    def _close_session(self, session_id: str) -> None:
+        unpin = getattr(self.cache, "unpin", None)
+        if unpin is not None:
+            unpin(session_id)
+        if self.teardown_sessions:
+            self.cache.pop(session_id, None)
+
     def _run_strategy_method(
         self, method_name: Literal["get", "initialize"], session_id: str
-    ) -> bytes:
+    ) -> StrategyResult:
         """Generic implementation of the `fetch()` and `initialize()` methods.
 
-        This will run the `method_name` method on the strategy and return the
-        serialized session update object.
+        This will run the `method_name` method on the strategy, add the returned
+        session update object to the session, and return it.
 
         Parameters:
             method_name: The name of the strategy's method to execute.
             session_id: The ID of the session shared by the pipeline.
 
         Returns:
-            The bytes-serialized output from the given strategy method.
+            The output from the given strategy method, serialized to bytes only on
+            demand.
 
         """
         if method_name not in ["get", "initialize"]:
@@ -106,36 +217,86 @@ class BasePythonStrategy(AbstractBaseStrategy):
             )
 
         # Get and update the strategy configuration with the session data
-        config = self.strategy_config(**json.loads(self.cache[self.strategy_id]))
+        config = self._session_config()
         session_data = self._fetch_session_data(session_id)
-        populate_config_from_session(session_data, config)
+        populate_config_from_session(session_data.to_dict(), config)
 
         # Perform sanity checks, including session_id and the updated config
         self._sanity_checks(session_id, config)
 
-        # Create strategy and run the method
-        strategy = create_strategy(
-            self.strategy_type.oteapi_strategy_type,
-            config.model_dump(mode="json", exclude_unset=True),
-        )
-
-        if not hasattr(strategy, method_name):
-            raise PythonBackendException(
-                f"{method_name!r} is not a valid method for {strategy}"
+        # Run the method of the plugin strategy, possibly reusing it
+        # Passing the model, not a dict, avoids validating the configuration again
+        strategy_type = self.strategy_type.oteapi_strategy_type
+        if self.executor is None:
+            session_update = call_plugin_method(
+                strategy_type, config, method_name, self.plugin_cache
             )
+            with trace_step("serialize", self, session_id):
+                update = session_update.model_dump(mode="json", exclude_unset=True)
+
+            def serialize() -> bytes:
+                with trace_step("serialize", self, session_id) as span:
+                    content = session_update.model_dump_json(exclude_unset=True).encode(
+                        encoding="utf-8"
+                    )
+                    span.size = len(content)
+                return content
+
+            result = StrategyResult(session_update=update, serialize=serialize)
+        else:
+            # The configuration with the session data is serialized once to the
+            # worker process, and only the session update is serialized back.
+            content = self.executor.submit(
+                run_plugin_method,
+                strategy_type,
+                config,
+                method_name,
+                self.plugin_cache is not None,
+            ).result()
+            update = self.codec.loads(content)
+            result = StrategyResult(content, update)
+
+        self._merge_session(session_id, update)
+        return result
+
+    def _merge_session(self, session_id: str, session_update: dict[str, Any]) -> None:
+        """Store a new session object with an update stacked on top of a session.
+
+        The session is read and stored again while holding its lock, so concurrent
+        updates of the session are all kept, while the previous session object,
+        which other steps may be reading, is left unchanged.
+        Only the session update is copied, not the data already in the session.
+
+        Parameters:
+            session_id: The ID of the session.
+            session_update: The session update to merge.
+
+        """
+        with session_lock(session_id):
+            session_data = self._fetch_session_data(session_id)
+            self.cache[session_id] = session_data.updated(session_update)
+
+    def _session_config(self) -> GenericConfig:
+        """Return a copy of the validated configuration to populate from a session.
 
-        session_update = getattr(strategy, method_name)()
+        Only the `configuration` mapping is updated with session data, so only it is
+        copied, while everything else is shared with the strategy's `config`.
+        Nothing is validated again.
 
-        if isinstance(session_update, dict):
-            session_update = AttrDict(**session_update)
+        Returns:
+            A copy of the configuration the strategy was created with.
 
-        self.cache[session_id].update(
-            session_update.model_dump(mode="json", exclude_unset=True)
-        )
+        """
+        if self.config is None:
+            raise ItemNotFoundInCache(
+                "Run create() prior to initialize()", self.strategy_id
+            )
 
-        return session_update.model_dump_json(exclude_unset=True).encode(
-            encoding="utf-8"
-        )
+        config = self.config.model_copy()
+        # Set the attribute directly to keep the set fields unchanged, making the
+        # configuration dump the same as for a newly validated model.
+        config.__dict__["configuration"] = self.config.configuration.model_copy()
+        return config
 
     def _sanity_checks(
         self, session_id: str, config: GenericConfig  # noqa: ARG002
@@ -148,29 +309,35 @@ class BasePythonStrategy(AbstractBaseStrategy):
                 data.
 
         """
-        if not self.strategy_id or self.strategy_id not in self.cache:
+        if not self.strategy_id or self.config is None:
             raise ItemNotFoundInCache(
                 "Run create() prior to initialize()", self.strategy_id
             )
 
         if session_id not in self.cache or not isinstance(
-            self.cache.get(session_id, {}), dict
+            self.cache.get(session_id, {}), Mapping
         ):
             raise ItemNotFoundInCache(
                 "Did you run this method through get()?", session_id
             )
 
-    def _fetch_session_data(self, session_id: str) -> dict[str, Any]:
-        """Perform sanity checks before running a strategy method.
+    def _fetch_session_data(self, session_id: str) -> Session:
+        """Return a session, performing sanity checks before running a strategy
+        method.
+
+        Sessions stored as a plain mapping, e.g., by an earlier version of OTELib, are
+        returned as a `Session`.
 
         Parameters:
             session_id: The ID of the session shared by the pipeline.
 
+        Returns:
+            The session.
+
         """
-        if session_id not in self.cache or not isinstance(
-            self.cache.get(session_id, {}), dict
-        ):
+        session = self.cache.get(session_id)
+        if not isinstance(session, Mapping):
             raise ItemNotFoundInCache(
                 "Did you run this method through get()?", session_id
             )
-        return self.cache[session_id]
+        return session if isinstance(session, Session) else Session(session)
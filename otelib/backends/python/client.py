@@ -2,17 +2,19 @@
 
 from __future__ import annotations
 
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from typing import TYPE_CHECKING
 
-from oteapi.plugins import load_strategies
-
 from otelib.backends.client import AbstractBaseClient
-from otelib.exceptions import PythonBackendException
+from otelib.backends.python.plugins import load_plugins
 
 if TYPE_CHECKING:  # pragma: no cover
+    from collections.abc import MutableMapping
     from typing import Any
 
     from otelib.backends.python.base import BasePythonStrategy
+    from otelib.backends.python.plugins import PluginCache
 
 CACHE: dict[str, Any] = {}
 
@@ -20,6 +22,24 @@ CACHE: dict[str, Any] = {}
 class OTEPythonClient(AbstractBaseClient):
     """The Python version of the OTEClient object.
 
+    Custom configuration options:
+        cache (MutableMapping): The cache for sessions,
+            e.g., a bounded `otelib.cache.LRUCache` or an `otelib.cache.DiskCache`
+            shared between processes. Defaults to the global `CACHE`.
+        teardown_sessions (bool): Whether to remove a session from the cache once the
+            `get()` call that created it completes. Defaults to `False`.
+        plugin_cache (PluginCache | None): A cache of instantiated OTEAPI plugin
+            strategies to reuse, e.g., a `PluginCache` or the global `PLUGIN_CACHE`.
+            Reused plugin strategies may be called by several threads at the same
+            time, so they must not keep state between calls. Defaults to `None`,
+            i.e., plugin strategies are instantiated for every call.
+        processes (int | None): The number of worker processes to run plugin
+            strategies in, e.g., to run CPU-bound plugin strategies of concurrent
+            pipelines in parallel. The process pool is started on first use and
+            shared by all strategies created by the client until it is closed.
+            Defaults to `None`, i.e., plugin strategies are run in the calling
+            thread.
+
     Attributes:
         interpreter (str): Interpreter for the python backend.
 
@@ -29,11 +49,12 @@ class OTEPythonClient(AbstractBaseClient):
 
     def __init__(self, source: str, **config) -> None:
         """Initiates an OTEAPI Python client."""
-        super().__init__(source, **config)
+        self._cache: MutableMapping[str, Any] = CACHE
+        self._teardown_sessions = False
+        self._plugin_cache: PluginCache | None = None
+        self._executor: ProcessPoolExecutor | None = None
 
-        self._cache = CACHE
-
-        load_strategies()
+        super().__init__(source, **config)
 
     @property
     def interpreter(self) -> str:
@@ -51,13 +72,47 @@ class OTEPythonClient(AbstractBaseClient):
     def _create_strategy(  # type: ignore[override]
         self, strategy_cls: type[BasePythonStrategy], **config
     ) -> BasePythonStrategy:
-        strategy = strategy_cls(self.interpreter, self._cache)
+        strategy = strategy_cls(
+            self.interpreter,
+            self._cache,
+            teardown_sessions=self._teardown_sessions,
+            plugin_cache=self._plugin_cache,
+            executor=self._executor,
+        )
         strategy.create(**config)
         return strategy
 
+    def _set_config(self, config: dict[str, Any]) -> None:
+        cache = config.pop("cache", None)
+        if cache is not None:
+            self._cache = cache
+        self._teardown_sessions = bool(config.pop("teardown_sessions", False))
+        self._plugin_cache = config.pop("plugin_cache", None)
+        processes = config.pop("processes", None)
+        if processes is not None:
+            # Worker processes are started on first use. They are spawned, since
+            # forking a process running threads, e.g., for `run_batch()`, is unsafe.
+            self._executor = ProcessPoolExecutor(
+                max_workers=processes, mp_context=multiprocessing.get_context("spawn")
+            )
+        return super()._set_config(config)
+
+    def close(self) -> None:
+        """Shut down the process pool, if any."""
+        if self._executor is not None:
+            self._executor.shutdown()
+
+    def refresh_plugins(self) -> None:
+        """Discover the installed OTEAPI plugin strategies anew.
+
+        Plugin strategies are discovered lazily, when first running a pipeline, and
+        only once per process.
+        Call this after installing or removing an OTEAPI plugin package at runtime.
+        """
+        load_plugins(refresh=True)
+        if self._plugin_cache is not None:
+            self._plugin_cache.invalidate()
+
     def clear_cache(self) -> None:
-        """Clear the global CACHE object."""
-        global CACHE  # noqa: PLW0603
-        CACHE = {}
-        if self._cache != CACHE and (self._cache or CACHE):
-            raise PythonBackendException("Could not clear the global CACHE object.")
+        """Clear the cache used by the client, by default the global CACHE object."""
+        self._cache.clear()
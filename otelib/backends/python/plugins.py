@@ -0,0 +1,328 @@
+"""Handling of OTEAPI plugin strategies for the Python backend."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sys
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from otelib.cache import LRUCache
+from otelib.exceptions import PythonBackendException
+
+if TYPE_CHECKING:  # pragma: no cover
+    from typing import Any, Literal
+
+    from oteapi.interfaces import IStrategy
+    from oteapi.models import AttrDict, GenericConfig
+    from oteapi.plugins.entry_points import EntryPointStrategyCollection
+    from oteapi.plugins.entry_points import StrategyType as OTEAPIStrategyType
+
+    PluginIndex = dict[str, list[tuple[str, str]]]
+
+_LOAD_LOCK = threading.Lock()
+
+
+def load_plugins(refresh: bool = False) -> None:
+    """Discover the installed OTEAPI plugin strategies, once per process.
+
+    If the `cache_dir` setting is set, the discovered plugin strategies are stored in
+    an index file there, keyed by a fingerprint of the installed distributions.
+    New processes then load the index instead of scanning all entry points.
+
+    Parameters:
+        refresh: Whether to discover the plugin strategies anew, even if they have
+            already been loaded or an index exists, e.g., after installing a plugin
+            package at runtime.
+
+    """
+    # Importing OTEAPI Core is deferred until plugin strategies are needed
+    from oteapi.plugins.entry_points import StrategyType as OTEAPIStrategyType
+    from oteapi.plugins.factories import StrategyFactory
+
+    from otelib.settings import Settings
+
+    with _LOAD_LOCK:
+        if not refresh and hasattr(StrategyFactory, "strategy_create_func"):
+            return
+
+        cache_dir = Settings().cache_dir
+        index_file = (
+            cache_dir / f"plugins-{_fingerprint()}.json"
+            if cache_dir is not None
+            else None
+        )
+
+        index = None if refresh else _read_index(index_file)
+        if index is None:
+            index = _discover_plugins()
+            _write_index(index_file, index)
+
+        StrategyFactory.strategy_create_func = {
+            strategy_type: _entry_point_collection(
+                strategy_type, index.get(strategy_type.value, [])
+            )
+            for strategy_type in OTEAPIStrategyType
+        }
+
+
+def create_plugin_strategy(strategy_type: str, config: GenericConfig) -> IStrategy:
+    """Instantiate a plugin strategy, discovering plugin strategies first if needed.
+
+    Parameters:
+        strategy_type: The OTEAPI strategy type.
+        config: The effective strategy configuration.
+
+    Returns:
+        A plugin strategy instantiated with the given configuration.
+
+    """
+    from oteapi.plugins import create_strategy
+
+    load_plugins()
+    return create_strategy(strategy_type, config)
+
+
+def _fingerprint() -> str:
+    """Return a fingerprint of the installed distributions.
+
+    Installing or removing a distribution changes the modification time of the
+    directory it is installed in, which is on `sys.path`.
+    """
+    entries: list[Any] = [sys.version]
+    for path in sys.path:
+        try:
+            entries.append((path, Path(path).stat().st_mtime_ns))
+        except OSError:
+            entries.append((path, None))
+    return hashlib.sha256(json.dumps(entries).encode()).hexdigest()[:16]
+
+
+def _discover_plugins() -> PluginIndex:
+    """Scan the entry points for OTEAPI plugin strategies."""
+    from importlib.metadata import entry_points
+
+    from oteapi.plugins.entry_points import StrategyType as OTEAPIStrategyType
+
+    all_entry_points = entry_points()
+    return {
+        strategy_type.value: sorted(
+            {
+                (entry_point.name, entry_point.value)
+                for entry_point in all_entry_points.select(
+                    group=f"oteapi.{strategy_type.value}"
+                )
+            }
+        )
+        for strategy_type in OTEAPIStrategyType
+    }
+
+
+def _entry_point_collection(
+    strategy_type: OTEAPIStrategyType, entry_points: list[tuple[str, str]]
+) -> EntryPointStrategyCollection:
+    """Create a collection of entry point strategies like OTEAPI Core does."""
+    from importlib.metadata import EntryPoint
+
+    from oteapi.plugins.entry_points import (
+        EntryPointStrategy,
+        EntryPointStrategyCollection,
+    )
+
+    collection = EntryPointStrategyCollection()
+    collection.exclusive_add(
+        *(
+            EntryPointStrategy(
+                EntryPoint(
+                    name=name, value=value, group=f"oteapi.{strategy_type.value}"
+                )
+            )
+            for name, value in entry_points
+        )
+    )
+    return collection
+
+
+def _read_index(index_file: Path | None) -> PluginIndex | None:
+    """Read an index of plugin strategies, if it exists and is valid."""
+    if index_file is None or not index_file.exists():
+        return None
+    try:
+        index = json.loads(index_file.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(index, dict):
+        return None
+    return {
+        strategy_type: [(name, value) for name, value in entry_points]
+        for strategy_type, entry_points in index.items()
+    }
+
+
+def _write_index(index_file: Path | None, index: PluginIndex) -> None:
+    """Write an index of plugin strategies atomically, ignoring any failure."""
+    if index_file is None:
+        return
+    temporary_file = index_file.with_suffix(f".{os.getpid()}.tmp")
+    try:
+        index_file.parent.mkdir(parents=True, exist_ok=True)
+        temporary_file.write_text(json.dumps(index), encoding="utf-8")
+        temporary_file.replace(index_file)
+    except OSError:
+        temporary_file.unlink(missing_ok=True)
+
+
+class PluginCache:
+    """A bounded cache of instantiated OTEAPI plugin strategies.
+
+    Plugin strategies are keyed by their strategy type and a hash of their effective
+    configuration, i.e., the strategy configuration populated with session data.
+    Whenever session data changes the configuration, the key changes as well, so a
+    plugin strategy is only reused for an identical configuration.
+    Computing the key serializes the effective configuration, so reuse pays off for
+    plugin strategies that are expensive to instantiate, rather than for large
+    sessions.
+
+    Thread safety:
+        The cache may be shared by threads, e.g., concurrent branches of a pipeline
+        or the pipelines of `run_batch()`. Hence, a reused plugin strategy may be
+        called by several threads at the same time. Only plugin strategies that do
+        not keep state between calls, or that are otherwise safe to use from
+        several threads, should be reused.
+
+    Parameters:
+        max_entries: The maximum number of plugin strategies to keep.
+
+    Attributes:
+        constructions (int): The number of plugin strategies instantiated.
+        constructions_avoided (int): The number of times an instantiated plugin
+            strategy was reused.
+
+    """
+
+    def __init__(self, max_entries: int | None = 128) -> None:
+        self._strategies = LRUCache(max_entries=max_entries)
+        self._lock = threading.Lock()
+        self.constructions = 0
+        self.constructions_avoided = 0
+
+    def get_strategy(self, strategy_type: str, config: GenericConfig) -> IStrategy:
+        """Return a plugin strategy for the configuration, instantiating it if needed.
+
+        Parameters:
+            strategy_type: The OTEAPI strategy type.
+            config: The effective strategy configuration.
+
+        Returns:
+            A plugin strategy instantiated with the given configuration.
+
+        """
+        key = (
+            f"{strategy_type}:"
+            + hashlib.sha256(
+                config.model_dump_json(exclude_unset=True).encode()
+            ).hexdigest()
+        )
+        try:
+            strategy = self._strategies[key]
+        except KeyError:
+            # Instantiated without holding the lock, so concurrent lookups of other
+            # plugin strategies are not blocked
+            strategy = create_plugin_strategy(strategy_type, config)
+            self._strategies[key] = strategy
+            with self._lock:
+                self.constructions += 1
+        else:
+            with self._lock:
+                self.constructions_avoided += 1
+        return strategy
+
+    def invalidate(self, strategy_type: str | None = None) -> None:
+        """Remove instantiated plugin strategies, e.g., after reloading plugins.
+
+        Parameters:
+            strategy_type: Only remove plugin strategies of this OTEAPI strategy type.
+                If not given, all plugin strategies are removed.
+
+        """
+        if strategy_type is None:
+            self._strategies.clear()
+            return
+
+        for key in list(self._strategies):
+            if key.startswith(f"{strategy_type}:"):
+                self._strategies.pop(key, None)
+
+
+PLUGIN_CACHE = PluginCache()
+
+
+def call_plugin_method(
+    strategy_type: str,
+    config: GenericConfig,
+    method_name: Literal["get", "initialize"],
+    plugin_cache: PluginCache | None = None,
+) -> AttrDict:
+    """Run the `get()` or `initialize()` method of a plugin strategy.
+
+    Parameters:
+        strategy_type: The OTEAPI strategy type.
+        config: The effective strategy configuration.
+        method_name: The name of the plugin strategy's method to run.
+        plugin_cache: A cache of instantiated plugin strategies to reuse.
+
+    Returns:
+        The session update returned by the plugin strategy's method.
+
+    """
+    from oteapi.models import AttrDict
+
+    if plugin_cache is None:
+        strategy = create_plugin_strategy(strategy_type, config)
+    else:
+        strategy = plugin_cache.get_strategy(strategy_type, config)
+
+    if not hasattr(strategy, method_name):
+        raise PythonBackendException(
+            f"{method_name!r} is not a valid method for {strategy}"
+        )
+
+    session_update = getattr(strategy, method_name)()
+    if isinstance(session_update, dict):
+        session_update = AttrDict(**session_update)
+    return session_update
+
+
+def run_plugin_method(
+    strategy_type: str,
+    config: GenericConfig,
+    method_name: Literal["get", "initialize"],
+    reuse_strategies: bool = True,
+) -> bytes:
+    """Run the `get()` or `initialize()` method of a plugin strategy in a worker
+    process.
+
+    Parameters:
+        strategy_type: The OTEAPI strategy type.
+        config: The effective strategy configuration.
+        method_name: The name of the plugin strategy's method to run.
+        reuse_strategies: Whether to reuse instantiated plugin strategies through the
+            worker process' global `PLUGIN_CACHE`.
+
+    Returns:
+        The serialized session update returned by the plugin strategy's method.
+
+    """
+    return (
+        call_plugin_method(
+            strategy_type,
+            config,
+            method_name,
+            PLUGIN_CACHE if reuse_strategies else None,
+        )
+        .model_dump_json(exclude_unset=True)
+        .encode(encoding="utf-8")
+    )
@@ -0,0 +1,91 @@
+"""Sessions of the Python backend, stored as layers of session updates."""
+
+from __future__ import annotations
+
+import sys
+from collections.abc import Mapping
+from typing import TYPE_CHECKING
+
+from otelib.cache import sizeof
+
+if TYPE_CHECKING:  # pragma: no cover
+    from collections.abc import Iterator
+    from typing import Any
+
+
+class Session(Mapping):
+    """An immutable session, made of the session updates of the steps run in it.
+
+    Updating a session returns a new session with the update stacked on top of the
+    layers of the previous one, which are shared rather than copied.
+    Hence, the cost of a step grows with the size of its own session update, not
+    with the size of the session, and a session read by a step is never changed.
+
+    Keys are looked up from the newest layer to the oldest. Once a session has more
+    than `max_layers` layers, they are merged into a single one, bounding the cost of
+    lookups.
+
+    The size reported by `sys.getsizeof()`, and hence used by an
+    `otelib.cache.LRUCache`, includes the contents of all layers, and is accumulated
+    as layers are added.
+
+    Parameters:
+        data: The initial session data.
+
+    """
+
+    max_layers = 32
+
+    def __init__(self, data: Mapping[str, Any] | None = None) -> None:
+        # The layers, from the newest to the oldest
+        self._layers: tuple[dict[str, Any], ...] = (dict(data),) if data else ()
+        self._size = sum(sizeof(layer) for layer in self._layers)
+
+    def updated(self, session_update: Mapping[str, Any]) -> Session:
+        """Return a new session with a session update stacked on top of this one.
+
+        Parameters:
+            session_update: The keys to add or replace.
+
+        Returns:
+            The updated session.
+
+        """
+        layer = dict(session_update)
+        if len(self._layers) >= self.max_layers:
+            return Session({**self.to_dict(), **layer})
+
+        session = Session()
+        session._layers = (layer, *self._layers)
+        session._size = self._size + sizeof(layer)
+        return session
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the session data as a new dictionary, without copying the values."""
+        data: dict[str, Any] = {}
+        for layer in reversed(self._layers):
+            data.update(layer)
+        return data
+
+    def __getitem__(self, key: str) -> Any:
+        for layer in self._layers:
+            if key in layer:
+                return layer[key]
+        raise KeyError(key)
+
+    def __contains__(self, key: object) -> bool:
+        return any(key in layer for layer in self._layers)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.to_dict())
+
+    def __len__(self) -> int:
+        if len(self._layers) == 1:
+            return len(self._layers[0])
+        return len(self.to_dict())
+
+    def __sizeof__(self) -> int:
+        return object.__sizeof__(self) + sys.getsizeof(self._layers) + self._size
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.to_dict()!r})"
@@ -0,0 +1,122 @@
+"""Asynchronous HTTP transport for the services/REST API backend.
+
+This module requires the `httpx` package, which is installed with the `async` extra.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+from typing import TYPE_CHECKING
+
+import httpx
+from urllib3.exceptions import InvalidHeader
+from urllib3.util.retry import Retry
+
+from otelib.backends.services.transport import backoff_time, count_retry
+
+if TYPE_CHECKING:  # pragma: no cover
+    from types import TracebackType
+
+    from otelib.backends.services.transport import RetryStats
+    from otelib.settings import Settings
+
+    if sys.version_info >= (3, 11):
+        from typing import Self
+    else:
+        from typing_extensions import Self
+
+# The errors of requests that failed to be read, after they may have been processed,
+# like the read errors retried by `urllib3`
+_READ_ERRORS = (httpx.ReadError, httpx.ReadTimeout, httpx.RemoteProtocolError)
+
+
+class AsyncRetryTransport(httpx.AsyncBaseTransport):
+    """An `httpx` transport retrying requests like `create_retry()`.
+
+    Requests with one of the idempotent `retry_methods` that fail to be read, e.g.,
+    with `httpx.ReadTimeout`, or are answered with one of the transient
+    `retry_statuses` are sent again after waiting the time given by a `Retry-After`
+    response header, or else an exponential backoff with jitter.
+    A malformed `Retry-After` header is ignored.
+    Retrying requests that fail to connect is left to the wrapped transport.
+    If all retries fail, the last response is returned, or the last read error is
+    raised.
+
+    Parameters:
+        transport: The transport to send the requests with.
+        settings: The settings to configure the retries from.
+        retry_stats: The statistics to count the retries in.
+
+    """
+
+    def __init__(
+        self,
+        transport: httpx.AsyncBaseTransport,
+        settings: Settings,
+        retry_stats: RetryStats,
+    ) -> None:
+        self._transport = transport
+        self.settings = settings
+        self.retry_stats = retry_stats
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        retries = 0
+        while True:
+            try:
+                response = await self._transport.handle_async_request(request)
+            except _READ_ERRORS:
+                if (
+                    retries >= self.settings.max_retries
+                    or request.method not in self.settings.retry_methods
+                ):
+                    raise
+                retries += 1
+                self.retry_stats.record()
+                count_retry()
+                await asyncio.sleep(backoff_time(retries, self.settings))
+                continue
+
+            retry_after = response.headers.get("Retry-After")
+            if retries >= self.settings.max_retries or not self._is_retry(
+                request.method, response.status_code, retry_after is not None
+            ):
+                return response
+
+            retries += 1
+            await response.aclose()
+            self.retry_stats.record(response.status_code)
+            count_retry()
+            await asyncio.sleep(self._wait_time(retries, retry_after))
+
+    def _wait_time(self, retries: int, retry_after: str | None) -> float:
+        """The time in seconds to wait before a retry, given by the `Retry-After`
+        response header if it is valid, or else by the backoff."""
+        if retry_after is not None:
+            try:
+                return Retry().parse_retry_after(retry_after)
+            except InvalidHeader:
+                pass
+        return backoff_time(retries, self.settings)
+
+    def _is_retry(self, method: str, status: int, has_retry_after: bool) -> bool:
+        """Whether to retry a request answered with the given status code."""
+        return method in self.settings.retry_methods and (
+            status in self.settings.retry_statuses
+            or (has_retry_after and status in Retry.RETRY_AFTER_STATUS_CODES)
+        )
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+    async def __aenter__(self) -> Self:
+        await self._transport.__aenter__()
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None = None,
+        exc_value: BaseException | None = None,
+        traceback: TracebackType | None = None,
+    ) -> None:
+        await self._transport.__aexit__(exc_type, exc_value, traceback)
@@ -2,17 +2,28 @@
 
 from __future__ import annotations
 
-import json
 from typing import TYPE_CHECKING
 
-import requests
-
+from otelib.backends.services.transport import (
+    create_async_http_client,
+    create_http_session,
+    service_capabilities,
+)
 from otelib.backends.strategies import AbstractBaseStrategy
+from otelib.codec import get_codec
 from otelib.exceptions import ApiError
 from otelib.settings import Settings
+from otelib.tracing import trace_step
 
 if TYPE_CHECKING:  # pragma: no cover
-    from typing import Any
+    from typing import IO, Any
+
+    import httpx
+    import requests
+    from oteapi.models import GenericConfig
+
+    from otelib.backends.services.client import OTEServiceClient
+    from otelib.pipeline import Pipeline
 
 
 class BaseServicesStrategy(AbstractBaseStrategy):
@@ -20,20 +31,49 @@ class BaseServicesStrategy(AbstractBaseStrategy):
 
     Parameters:
         source (str): The base URL of the OTEAPI Service.
+        http_session (requests.Session | None): A pooled HTTP session to use for all
+            requests. If not given, a new one is created for this strategy.
+        async_http_client (httpx.AsyncClient | None): An asynchronous HTTP client to
+            use for all awaitable requests. If not given, the one of `client` is used,
+            or else a new one is created for this strategy on first use.
+        client (OTEServiceClient | None): The client creating the strategy, whose
+            pooled asynchronous HTTP client is looked up on first use, so strategies
+            created synchronously share it as well.
 
     Attributes:
         url (str): The base URL of the OTEAPI Service.
         settings (otelib.settings.Settings): OTEAPI Service settings.
+        codec (otelib.codec.JSONCodec): The JSON codec for request and response
+            bodies, by default the one of the `json_codec` setting.
+        config (GenericConfig | None): The validated configuration the strategy was
+            created with.
+        http_session (requests.Session): The HTTP session used for all requests.
+        async_http_client (httpx.AsyncClient): The asynchronous HTTP client used for
+            all awaitable requests.
         input_pipe (Pipe | None): An input pipeline.
 
     """
 
-    def __init__(self, source: str) -> None:
+    def __init__(
+        self,
+        source: str,
+        http_session: requests.Session | None = None,
+        async_http_client: httpx.AsyncClient | None = None,
+        client: OTEServiceClient | None = None,
+    ) -> None:
         super().__init__(source)
 
         self.url: str | None = source
         self._headers: dict[str, Any] | None = None
         self.settings = Settings()
+        self.codec = get_codec(self.settings.json_codec)
+        self.http_session = (
+            http_session
+            if http_session is not None
+            else create_http_session(self.settings)
+        )
+        self._async_http_client = async_http_client
+        self._client = client
 
     @property
     def headers(self) -> dict[str, Any]:
@@ -50,88 +90,310 @@ class BaseServicesStrategy(AbstractBaseStrategy):
             raise TypeError("headers must be a dictionary")
         self._headers = value
 
+    @property
+    def async_http_client(self) -> httpx.AsyncClient:
+        """The asynchronous HTTP client used for all awaitable requests.
+
+        If it was not given when initializing the strategy, it is the one of the client
+        creating the strategy, or else it is created on first use.
+        """
+        if self._async_http_client is None:
+            if self._client is not None:
+                return self._client.async_http_client
+            self._async_http_client = create_async_http_client(self.settings)
+        return self._async_http_client
+
+    @async_http_client.setter
+    def async_http_client(self, value: httpx.AsyncClient) -> None:
+        """Set the asynchronous HTTP client used for all awaitable requests."""
+        self._async_http_client = value
+
     def create(self, **config) -> None:
         session_id = config.pop("session_id", None)
-        data = self.strategy_config(**config)
+        with trace_step("validate", self):
+            data = self.strategy_config(**config)
+        self._post_config(data, session_id)
 
-        response = requests.post(
-            f"{self.url}{self.settings.prefix}/{self.strategy_type}",
-            data=data.model_dump_json(exclude_unset=True),
-            params={"session_id": session_id} if session_id else {},
-            timeout=self.settings.timeout,
-            headers=self.headers,
-        )
-        if not response.ok:
-            raise ApiError(
-                f"Cannot create {self.strategy_type}: {data!r}"
-                f"{' content=' + str(response.content) if self.debug else ''}",
-                status=response.status_code,
+    def _post_config(self, data: GenericConfig, session_id: str | None) -> None:
+        """Create the strategy from a validated configuration.
+
+        Parameters:
+            data: The validated strategy configuration.
+            session_id: The ID of a session to add the strategy to.
+
+        """
+        with trace_step("create", self, session_id):
+            response = self.http_session.post(
+                self._strategy_url(),
+                data=self._serialize_config(data, session_id),
+                params={"session_id": session_id} if session_id else {},
+                timeout=self.settings.timeout,
+                headers=self.headers,
             )
+            if not response.ok:
+                raise self._create_error(data, response.status_code, response.content)
 
-        response_json: dict = response.json()
-        self.strategy_id = (
-            response_json.pop(f"{self.strategy_type}_id")
-            if f"{self.strategy_type}_id" in response_json
-            else response_json.pop(f"{self.strategy_type[len('data'):]}_id")
-        )
+            self._set_strategy_id(self.codec.loads(response.content))
+            self.config = data
 
     def fetch(self, session_id: str) -> bytes:
-        response = requests.get(
-            f"{self.url}{self.settings.prefix}/{self.strategy_type}/{self.strategy_id}",
+        response = self.http_session.get(
+            self._strategy_url(self.strategy_id),
             params={"session_id": session_id},
             timeout=self.settings.timeout,
             headers=self.headers,
         )
         if response.ok:
             return response.content
-        strategy_name = (
-            self.strategy_type[len("data") :]
-            if self.strategy_type.startswith("data")
-            else self.strategy_type
-        )
-        raise ApiError(
-            f"Cannot fetch {self.strategy_type}: session_id={session_id!r} "
-            f"{strategy_name}_id={self.strategy_id!r}"
-            f"{' content=' + str(response.content) if self.debug else ''}",
-            status=response.status_code,
+        raise self._strategy_error(
+            "fetch", session_id, response.status_code, response.content
         )
 
+    def fetch_stream(self, session_id: str, file: IO[bytes]) -> None:
+        with self.http_session.get(
+            self._strategy_url(self.strategy_id),
+            params={"session_id": session_id},
+            timeout=self.settings.timeout,
+            headers=self.headers,
+            stream=True,
+        ) as response:
+            if not response.ok:
+                raise self._strategy_error(
+                    "fetch", session_id, response.status_code, response.content
+                )
+            for chunk in response.iter_content(
+                chunk_size=self.settings.stream_chunk_size
+            ):
+                file.write(chunk)
+
     def initialize(self, session_id: str) -> bytes:
-        post_path = (
-            f"{self.url}{self.settings.prefix}"
-            f"/{self.strategy_type}/{self.strategy_id}/initialize"
-        )
-        response = requests.post(
-            post_path,
+        response = self.http_session.post(
+            self._strategy_url(self.strategy_id, "initialize"),
             params={"session_id": session_id},
             timeout=self.settings.timeout,
             headers=self.headers,
         )
         if response.ok:
             return response.content
-        strategy_name = (
-            self.strategy_type[len("data") :]
-            if self.strategy_type.startswith("data")
-            else self.strategy_type
-        )
-        raise ApiError(
-            f"Cannot initialize {self.strategy_type}: session_id={session_id!r} "
-            f"{strategy_name}_id={self.strategy_id!r}"
-            f"{' content=' + str(response.content) if self.debug else ''}",
-            status=response.status_code,
+        raise self._strategy_error(
+            "initialize", session_id, response.status_code, response.content
         )
 
     def _create_session(self) -> str:
-        response = requests.post(
+        response = self.http_session.post(
             f"{self.url}{self.settings.prefix}/session",
-            json={},
+            data=self.codec.dumps({}),
+            headers=self.headers,
+            timeout=self.settings.timeout,
+        )
+        if not response.ok:
+            raise self._session_error(response.status_code, response.content)
+        return self.codec.loads(response.content)["session_id"]
+
+    def _update_session(self, session_id: str, session_update: dict[str, Any]) -> None:
+        response = self.http_session.put(
+            f"{self.url}{self.settings.prefix}/session/{session_id}",
+            data=self.codec.dumps(session_update),
             headers=self.headers,
             timeout=self.settings.timeout,
         )
         if not response.ok:
             raise ApiError(
-                f"Cannot create session: {response.status_code} "
+                f"Cannot update session: session_id={session_id!r} "
                 f"{' content=' + str(response.content) if self.debug else ''}",
                 status=response.status_code,
             )
-        return json.loads(response.text)["session_id"]
+
+    def _run_pipeline(
+        self, pipeline: Pipeline, session_id: str | None, concurrent_initialize: bool
+    ) -> tuple[bytes, ...] | None:
+        """Run a complete pipeline in a single request to the pipeline endpoint.
+
+        The request body lists the strategies of the execution plan by their type and
+        ID, the indices of the inputs of each strategy, and the indices of the
+        strategies whose outputs to return:
+
+        ```json
+        {
+            "session_id": null,
+            "strategies": [
+                {"strategy_type": "dataresource", "strategy_id": "dataresource-..."},
+                {"strategy_type": "parser", "strategy_id": "parser-..."}
+            ],
+            "inputs": [[], [0]],
+            "outputs": [1],
+            "concurrent_initialize": false
+        }
+        ```
+
+        The response contains the ID of the session used and the outputs from
+        `fetch()` of the requested strategies:
+        `{"session_id": "session-...", "outputs": [{...}]}`.
+
+        The endpoint is only used if all strategies belong to the same OTEAPI
+        Service, and it advertises the endpoint, see `service_capabilities()`.
+
+        """
+        strategies = pipeline.strategies
+        if not all(
+            isinstance(strategy, BaseServicesStrategy)
+            and strategy.url == self.url
+            and strategy.strategy_id
+            for strategy in strategies
+        ) or not self._capabilities().get("pipeline", False):
+            return None
+
+        with trace_step("run_pipeline", self, session_id) as span:
+            response = self.http_session.post(
+                f"{self.url}{self.settings.prefix}/pipeline",
+                data=self.codec.dumps(
+                    {
+                        "session_id": session_id,
+                        "strategies": [
+                            {
+                                "strategy_type": str(strategy.strategy_type),
+                                "strategy_id": strategy.strategy_id,
+                            }
+                            for strategy in strategies
+                        ],
+                        "inputs": pipeline.inputs,
+                        "outputs": [
+                            strategies.index(output) for output in pipeline.outputs
+                        ],
+                        "concurrent_initialize": concurrent_initialize,
+                    }
+                ),
+                headers=self.headers,
+                timeout=self.settings.timeout,
+            )
+            if not response.ok:
+                raise ApiError(
+                    f"Cannot run pipeline: session_id={session_id!r} "
+                    f"{' content=' + str(response.content) if self.debug else ''}",
+                    status=response.status_code,
+                )
+
+            content = self.codec.loads(response.content)
+            span.session_id = content["session_id"]
+            span.size = len(response.content)
+
+        for strategy in strategies:
+            if strategy.debug:
+                strategy._session_id = content["session_id"]
+        return tuple(self.codec.dumps(output) for output in content["outputs"])
+
+    async def acreate(self, **config) -> None:
+        session_id = config.pop("session_id", None)
+        with trace_step("validate", self):
+            data = self.strategy_config(**config)
+
+        with trace_step("create", self, session_id):
+            response = await self.async_http_client.post(
+                self._strategy_url(),
+                content=self._serialize_config(data, session_id),
+                params={"session_id": session_id} if session_id else {},
+                headers=self.headers,
+            )
+            if not response.is_success:
+                raise self._create_error(data, response.status_code, response.content)
+
+            self._set_strategy_id(self.codec.loads(response.content))
+            self.config = data
+
+    async def afetch(self, session_id: str) -> bytes:
+        response = await self.async_http_client.get(
+            self._strategy_url(self.strategy_id),
+            params={"session_id": session_id},
+            headers=self.headers,
+        )
+        if response.is_success:
+            return response.content
+        raise self._strategy_error(
+            "fetch", session_id, response.status_code, response.content
+        )
+
+    async def ainitialize(self, session_id: str) -> bytes:
+        response = await self.async_http_client.post(
+            self._strategy_url(self.strategy_id, "initialize"),
+            params={"session_id": session_id},
+            headers=self.headers,
+        )
+        if response.is_success:
+            return response.content
+        raise self._strategy_error(
+            "initialize", session_id, response.status_code, response.content
+        )
+
+    async def _acreate_session(self) -> str:
+        response = await self.async_http_client.post(
+            f"{self.url}{self.settings.prefix}/session",
+            content=self.codec.dumps({}),
+            headers=self.headers,
+        )
+        if not response.is_success:
+            raise self._session_error(response.status_code, response.content)
+        return self.codec.loads(response.content)["session_id"]
+
+    def _capabilities(self) -> dict[str, Any]:
+        """Return the capabilities advertised by the OTEAPI Service."""
+        return service_capabilities(
+            self.http_session,
+            f"{self.url}{self.settings.prefix}",
+            self.settings,
+            self.headers,
+        )
+
+    def _serialize_config(self, data: GenericConfig, session_id: str | None) -> str:
+        """Serialize a validated strategy configuration for a `create()` request."""
+        with trace_step("serialize", self, session_id) as span:
+            serialized = data.model_dump_json(exclude_unset=True)
+            span.size = len(serialized)
+        return serialized
+
+    def _strategy_url(self, *path: str) -> str:
+        """Return the URL for the strategy type endpoint extended by `path`."""
+        return "/".join(
+            (f"{self.url}{self.settings.prefix}/{self.strategy_type}", *path)
+        )
+
+    def _set_strategy_id(self, response_json: dict[str, Any]) -> None:
+        """Set the strategy ID from the response content of a `create()` request."""
+        self.strategy_id = (
+            response_json.pop(f"{self.strategy_type}_id")
+            if f"{self.strategy_type}_id" in response_json
+            else response_json.pop(f"{self.strategy_type[len('data'):]}_id")
+        )
+
+    def _create_error(
+        self, data: GenericConfig, status: int, content: bytes
+    ) -> ApiError:
+        """Return an error for a failed `create()` request."""
+        return ApiError(
+            f"Cannot create {self.strategy_type}: {data!r}"
+            f"{' content=' + str(content) if self.debug else ''}",
+            status=status,
+        )
+
+    def _session_error(self, status: int, content: bytes) -> ApiError:
+        """Return an error for a failed session creation request."""
+        return ApiError(
+            f"Cannot create session: {status} "
+            f"{' content=' + str(content) if self.debug else ''}",
+            status=status,
+        )
+
+    def _strategy_error(
+        self, action: str, session_id: str, status: int, content: bytes
+    ) -> ApiError:
+        """Return an error for a failed `fetch()` or `initialize()` request."""
+        strategy_name = (
+            self.strategy_type[len("data") :]
+            if self.strategy_type.startswith("data")
+            else self.strategy_type
+        )
+        return ApiError(
+            f"Cannot {action} {self.strategy_type}: session_id={session_id!r} "
+            f"{strategy_name}_id={self.strategy_id!r}"
+            f"{' content=' + str(content) if self.debug else ''}",
+            status=status,
+        )
@@ -2,21 +2,49 @@
 
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
 from typing import TYPE_CHECKING
 
 from otelib.backends.client import AbstractBaseClient
+from otelib.backends.services.transport import (
+    RetryStats,
+    create_async_http_client,
+    create_http_session,
+    service_capabilities,
+)
+from otelib.codec import get_codec
+from otelib.exceptions import ApiError
+from otelib.settings import Settings
+from otelib.tracing import trace_step
 
 if TYPE_CHECKING:  # pragma: no cover
     from typing import Any
 
+    import httpx
+    from oteapi.models import GenericConfig
+
     from otelib.backends.services.base import BaseServicesStrategy
 
 
 class OTEServiceClient(AbstractBaseClient):
     """The Service version of the OTEClient object representing a remote OTE REST API.
 
+    Custom configuration options:
+        headers (dict[str, Any]): URL headers to use for all requests to the OTEAPI
+            Service.
+        retry_stats (RetryStats): The statistics to count the retried requests to the
+            OTEAPI Service in. Defaults to new, empty statistics.
+
     Attributes:
         url (str): The base URL of the OTEAPI Service.
+        settings (otelib.settings.Settings): OTEAPI Service settings.
+        codec (otelib.codec.JSONCodec): The JSON codec of the `json_codec` setting.
+        http_session (requests.Session): The pooled HTTP session shared by all
+            strategies created by this client.
+        async_http_client (httpx.AsyncClient): The pooled asynchronous HTTP client
+            shared by all strategies created by this client.
+        retry_stats (RetryStats): Counts of the retried requests to the OTEAPI
+            Service, see the `max_retries` setting.
 
     """
 
@@ -27,6 +55,11 @@ class OTEServiceClient(AbstractBaseClient):
         super().__init__(source, **config)
         self._headers: dict[str, Any] = {}
 
+        self.settings = Settings()
+        self.codec = get_codec(self.settings.json_codec)
+        self.http_session = create_http_session(self.settings, self.retry_stats)
+        self._async_http_client: httpx.AsyncClient | None = None
+
     @property
     def url(self) -> str:
         """Proxy for the source attribute."""
@@ -35,11 +68,129 @@ class OTEServiceClient(AbstractBaseClient):
     def _create_strategy(  # type: ignore[override]
         self, strategy_cls: type[BaseServicesStrategy], **config
     ) -> BaseServicesStrategy:
-        strategy = strategy_cls(self.url)
-        strategy.headers = self.headers
+        strategy = self._new_strategy(strategy_cls)
         strategy.create(**config)
         return strategy
 
+    def _create_many(  # type: ignore[override]
+        self, strategies: list[tuple[type[BaseServicesStrategy], dict[str, Any]]]
+    ) -> list[BaseServicesStrategy]:
+        """Create many strategies, validating all configurations first.
+
+        If the OTEAPI Service advertises `batch_create`, the strategies are created
+        in a single request to `POST /pipeline/strategies`, with the body
+        `{"strategies": [{"strategy_type": ..., "config": {...}, "session_id": ...}]}`
+        and the response `{"strategy_ids": [...]}`.
+        Otherwise, the create requests are sent concurrently over the pooled
+        connections.
+
+        """
+        to_create: list[tuple[BaseServicesStrategy, GenericConfig, str | None]] = []
+        for strategy_cls, strategy_config in strategies:
+            config = dict(strategy_config)
+            session_id = config.pop("session_id", None)
+            strategy = self._new_strategy(strategy_cls)
+            with trace_step("validate", strategy):
+                data = strategy.strategy_config(**config)
+            to_create.append((strategy, data, session_id))
+
+        if not to_create:
+            return []
+
+        if service_capabilities(
+            self.http_session,
+            f"{self.url}{self.settings.prefix}",
+            self.settings,
+            self.headers,
+        ).get("batch_create", False):
+            self._post_configs(to_create)
+        else:
+            with ThreadPoolExecutor(
+                max_workers=min(len(to_create), self.settings.pool_maxsize)
+            ) as executor:
+                list(
+                    executor.map(
+                        lambda item: item[0]._post_config(item[1], item[2]), to_create
+                    )
+                )
+
+        return [strategy for strategy, _, _ in to_create]
+
+    def _post_configs(
+        self, to_create: list[tuple[BaseServicesStrategy, GenericConfig, str | None]]
+    ) -> None:
+        """Create strategies from validated configurations in a single request."""
+        with trace_step("create") as span:
+            span.attributes["count"] = len(to_create)
+            response = self.http_session.post(
+                f"{self.url}{self.settings.prefix}/pipeline/strategies",
+                data=self.codec.dumps(
+                    {
+                        "strategies": [
+                            {
+                                "strategy_type": str(strategy.strategy_type),
+                                "config": data.model_dump(
+                                    mode="json", exclude_unset=True
+                                ),
+                                "session_id": session_id,
+                            }
+                            for strategy, data, session_id in to_create
+                        ]
+                    }
+                ),
+                headers=self.headers,
+                timeout=self.settings.timeout,
+            )
+            if not response.ok:
+                debug = to_create[0][0].debug
+                raise ApiError(
+                    f"Cannot create {len(to_create)} strategies"
+                    f"{' content=' + str(response.content) if debug else ''}",
+                    status=response.status_code,
+                )
+
+        for (strategy, data, _), strategy_id in zip(
+            to_create, self.codec.loads(response.content)["strategy_ids"], strict=True
+        ):
+            strategy.strategy_id = strategy_id
+            strategy.config = data
+
+    def _new_strategy(
+        self, strategy_cls: type[BaseServicesStrategy]
+    ) -> BaseServicesStrategy:
+        """Instantiate a strategy sharing the client's connections and headers."""
+        strategy = strategy_cls(
+            self.url,
+            http_session=self.http_session,
+            client=self,
+        )
+        strategy.headers = self.headers
+        return strategy
+
+    async def _acreate_strategy(  # type: ignore[override]
+        self, strategy_cls: type[BaseServicesStrategy], **config
+    ) -> BaseServicesStrategy:
+        strategy = self._new_strategy(strategy_cls)
+        await strategy.acreate(**config)
+        return strategy
+
+    @property
+    def async_http_client(self) -> httpx.AsyncClient:
+        """The pooled asynchronous HTTP client shared by all strategies.
+
+        It is created on first use.
+        """
+        if self._async_http_client is None:
+            self._async_http_client = create_async_http_client(
+                self.settings, self.retry_stats
+            )
+        return self._async_http_client
+
+    @async_http_client.setter
+    def async_http_client(self, value: httpx.AsyncClient) -> None:
+        """Set the asynchronous HTTP client shared by all strategies."""
+        self._async_http_client = value
+
     @property
     def headers(self) -> dict[str, Any]:
         """URL headers to use for all requests to the OTEAPI Service."""
@@ -57,4 +208,16 @@ class OTEServiceClient(AbstractBaseClient):
 
     def _set_config(self, config: dict[str, Any]) -> None:
         self.headers = config.pop("headers", {})
+        self.retry_stats: RetryStats = config.pop("retry_stats", None) or RetryStats()
         return super()._set_config(config)
+
+    def close(self) -> None:
+        """Close all pooled connections to the OTEAPI Service."""
+        self.http_session.close()
+
+    async def aclose(self) -> None:
+        """Close all pooled connections to the OTEAPI Service, including those of the
+        asynchronous HTTP client."""
+        self.close()
+        if self._async_http_client is not None:
+            await self._async_http_client.aclose()
@@ -0,0 +1,311 @@
+"""HTTP transport for the services/REST API backend."""
+
+from __future__ import annotations
+
+import random
+import threading
+from typing import TYPE_CHECKING
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.exceptions import RequestException
+from urllib3.exceptions import InvalidHeader
+from urllib3.util.retry import Retry
+
+from otelib.settings import Settings
+from otelib.tracing import current_span
+
+if TYPE_CHECKING:  # pragma: no cover
+    from typing import Any
+
+    import httpx
+
+# The capabilities advertised by the OTEAPI Service at a URL (including the prefix)
+_CAPABILITIES: dict[str, dict[str, Any]] = {}
+
+
+def count_retry() -> None:
+    """Count a retry in the attributes of the current tracing span, if any."""
+    span = current_span()
+    if span is not None:
+        span.attributes["retries"] = span.attributes.get("retries", 0) + 1
+
+
+class RetryStats:
+    """Counts of the requests to an OTEAPI Service that were retried.
+
+    Attributes:
+        retries (int): The total number of retries.
+        errors (int): The number of retries of requests that failed to connect or to
+            be read.
+        statuses (dict[int, int]): The number of retries per response status code.
+
+    """
+
+    def __init__(self) -> None:
+        self.retries = 0
+        self.errors = 0
+        self.statuses: dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """The retry statistics."""
+        with self._lock:
+            return {
+                "retries": self.retries,
+                "errors": self.errors,
+                **{
+                    f"status_{status}": count
+                    for status, count in sorted(self.statuses.items())
+                },
+            }
+
+    def record(self, status: int | None = None) -> None:
+        """Count a retry after a response with the given status code, or after an
+        error if no status code is given."""
+        with self._lock:
+            self.retries += 1
+            if status is None:
+                self.errors += 1
+            else:
+                self.statuses[status] = self.statuses.get(status, 0) + 1
+
+
+def backoff_time(retry: int, settings: Settings) -> float:
+    """Return the time in seconds to wait before a retry.
+
+    The backoff grows exponentially with the number of retries, up to the
+    `retry_backoff_max` setting, and a random jitter of up to the
+    `retry_backoff_jitter` setting is added.
+
+    Parameters:
+        retry: The number of the retry, starting at 1.
+        settings: The settings to configure the backoff from.
+
+    Returns:
+        The backoff in seconds.
+
+    """
+    backoff = min(
+        settings.retry_backoff_max,
+        settings.retry_backoff_factor * 2 ** (retry - 1),
+    )
+    # The jitter only spreads out retries, it is not used for security
+    return backoff + random.uniform(0, settings.retry_backoff_jitter)  # nosec B311
+
+
+class _Retry(Retry):
+    """A `urllib3` retry configuration counting retries and backing off according to
+    the settings."""
+
+    settings: Settings
+    retry_stats: RetryStats
+
+    def new(self, **kwargs: Any) -> _Retry:
+        retry = super().new(**kwargs)
+        retry.settings = self.settings
+        retry.retry_stats = self.retry_stats
+        return retry
+
+    def increment(self, *args: Any, **kwargs: Any) -> _Retry:
+        retry = super().increment(*args, **kwargs)
+        # The new retry configuration records the failed attempt last in its history
+        attempt = retry.history[-1]
+        self.retry_stats.record(None if attempt.error else attempt.status)
+        count_retry()
+        return retry
+
+    def get_backoff_time(self) -> float:
+        return backoff_time(len(self.history), self.settings) if self.history else 0
+
+    def get_retry_after(self, response: Any) -> float | None:
+        try:
+            return super().get_retry_after(response)
+        except InvalidHeader:
+            # Back off instead of giving up on a malformed `Retry-After` header
+            return None
+
+
+def create_retry(
+    settings: Settings | None = None, retry_stats: RetryStats | None = None
+) -> Retry:
+    """Create the retry configuration for requests to an OTEAPI Service.
+
+    Requests failing to connect are retried up to the `max_retries` setting.
+    Requests with one of the idempotent `retry_methods` are also retried if they fail
+    to be read, or are answered with one of the transient `retry_statuses`.
+    Between retries, the time given by a `Retry-After` response header is waited, or
+    else, e.g., if the header is malformed, an exponential backoff with jitter, see
+    `backoff_time()`.
+    If all retries fail, the last response is returned.
+    If retries are disabled, which is the default, errors reading a response are
+    raised as is, e.g., as `requests.ReadTimeout`, like `requests` does.
+
+    Parameters:
+        settings: The settings to configure the retries from.
+            If not given, the default settings are used.
+        retry_stats: The statistics to count the retries in.
+
+    Returns:
+        A `urllib3` retry configuration.
+
+    """
+    settings = settings or Settings()
+
+    retry = _Retry(
+        total=settings.max_retries,
+        # Like `requests`, raise read errors as is rather than wrapped in a
+        # `MaxRetryError` if they are not retried
+        read=settings.max_retries or False,
+        allowed_methods=settings.retry_methods,
+        status_forcelist=settings.retry_statuses,
+        backoff_factor=settings.retry_backoff_factor,
+        raise_on_status=False,
+        respect_retry_after_header=True,
+    )
+    retry.settings = settings
+    retry.retry_stats = retry_stats if retry_stats is not None else RetryStats()
+    return retry
+
+
+def create_http_session(
+    settings: Settings | None = None, retry_stats: RetryStats | None = None
+) -> requests.Session:
+    """Create a pooled HTTP session for requests to an OTEAPI Service.
+
+    All strategies sharing the returned session reuse its connection pool, avoiding a
+    new TCP (and TLS) handshake for every request.
+
+    Parameters:
+        settings: The settings to configure the connection pool and retries from.
+            If not given, the default settings are used.
+        retry_stats: The statistics to count retried requests in, see
+            `create_retry()`.
+
+    Returns:
+        A `requests.Session` with a mounted, configured connection pool.
+
+    """
+    settings = settings or Settings()
+
+    adapter = HTTPAdapter(
+        pool_connections=settings.pool_connections,
+        pool_maxsize=settings.pool_maxsize,
+        max_retries=create_retry(settings, retry_stats),
+    )
+
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+
+    if not settings.keep_alive:
+        session.headers["Connection"] = "close"
+
+    return session
+
+
+def create_async_http_client(
+    settings: Settings | None = None, retry_stats: RetryStats | None = None
+) -> httpx.AsyncClient:
+    """Create a pooled asynchronous HTTP client for requests to an OTEAPI Service.
+
+    This requires the `httpx` package, which is installed with the `async` extra,
+    i.e., `pip install otelib[async]`.
+
+    Requests are retried like those of `create_http_session()`.
+
+    Parameters:
+        settings: The settings to configure the connection pool and retries from.
+            If not given, the default settings are used.
+        retry_stats: The statistics to count retried requests in.
+
+    Returns:
+        An `httpx.AsyncClient` with a configured connection pool.
+
+    """
+    try:
+        import httpx
+    except ImportError as exc:
+        raise ImportError(
+            "The asynchronous API requires 'httpx'. Install it with: "
+            "pip install otelib[async]"
+        ) from exc
+
+    from otelib.backends.services.async_transport import AsyncRetryTransport
+
+    settings = settings or Settings()
+    connect_timeout, read_timeout = settings.timeout
+
+    return httpx.AsyncClient(
+        headers=None if settings.keep_alive else {"Connection": "close"},
+        limits=httpx.Limits(
+            max_connections=settings.pool_maxsize,
+            max_keepalive_connections=(
+                settings.pool_maxsize if settings.keep_alive else 0
+            ),
+        ),
+        timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+        transport=AsyncRetryTransport(
+            httpx.AsyncHTTPTransport(retries=settings.max_retries),
+            settings,
+            retry_stats if retry_stats is not None else RetryStats(),
+        ),
+    )
+
+
+def service_capabilities(
+    http_session: requests.Session,
+    base_url: str,
+    settings: Settings | None = None,
+    headers: dict[str, Any] | None = None,
+) -> dict[str, Any]:
+    """Return the capabilities advertised by the pipeline endpoint of an OTEAPI
+    Service.
+
+    An OTEAPI Service with a pipeline endpoint answers `GET /pipeline` with a JSON
+    object of its capabilities, e.g., `{"version": 1, "batch_create": true}`.
+    Unless the `pipeline_endpoint` setting is set, the OTEAPI Service is asked once
+    per URL, and the answer is remembered.
+    Only a `404 Not Found` or `405 Method Not Allowed` answer is remembered as the
+    OTEAPI Service not having a pipeline endpoint. If the OTEAPI Service cannot be
+    reached, or answers with another error, e.g., a transient `503`, nothing is
+    remembered, so the OTEAPI Service is asked again by the next call.
+
+    Parameters:
+        http_session: The HTTP session to ask the OTEAPI Service with.
+        base_url: The base URL of the OTEAPI Service, including the prefix.
+        settings: The settings to use. If not given, the default settings are used.
+        headers: URL headers to use for the request.
+
+    Returns:
+        The advertised capabilities, with `"pipeline": True` if the OTEAPI Service
+        has a pipeline endpoint, or an empty dictionary if it does not.
+
+    """
+    settings = settings or Settings()
+    if settings.pipeline_endpoint is not None:
+        return {"pipeline": True} if settings.pipeline_endpoint else {}
+
+    if base_url not in _CAPABILITIES:
+        try:
+            response = http_session.get(
+                f"{base_url}/pipeline", headers=headers, timeout=settings.timeout
+            )
+        except RequestException:
+            return {}
+
+        capabilities: dict[str, Any] = {}
+        if not response.ok and response.status_code not in (404, 405):
+            return capabilities
+        if response.ok:
+            try:
+                content = response.json()
+            except ValueError:
+                content = {}
+            capabilities = {
+                **(content if isinstance(content, dict) else {}),
+                "pipeline": True,
+            }
+        _CAPABILITIES[base_url] = capabilities
+    return _CAPABILITIES[base_url]
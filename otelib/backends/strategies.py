@@ -2,20 +2,101 @@
 
 from __future__ import annotations
 
+import json
 import os
 from abc import ABC, abstractmethod
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, overload
 
 from otelib.backends.utils import StrategyType
+from otelib.codec import get_codec
 from otelib.pipe import Pipe
+from otelib.pipeline import Pipeline
 
 if TYPE_CHECKING:  # pragma: no cover
+    from collections.abc import Callable, MutableMapping
+    from typing import IO, Any
 
     from oteapi.models.genericconfig import GenericConfig
 
+    from otelib.codec import JSONCodec
+
+
+class StrategyResult:
+    """The output of `initialize()` or `fetch()`, serialized only on demand.
+
+    A backend may return the output as a session update, deferring its
+    serialization to bytes until the `content` is needed, e.g., only for the last
+    strategy of a pipeline.
+
+    Parameters:
+        content: The serialized output, if already serialized.
+        session_update: The output as a session update, if already deserialized.
+        serialize: A function returning the serialized output, if not given.
+        loads: A function deserializing the output, e.g., of a `JSONCodec`.
+
+    """
+
+    __slots__ = ("_content", "_data", "_loads", "_serialize")
+
+    def __init__(
+        self,
+        content: bytes | None = None,
+        session_update: dict[str, Any] | None = None,
+        serialize: Callable[[], bytes] | None = None,
+        loads: Callable[[bytes], Any] = json.loads,
+    ) -> None:
+        if content is None and serialize is None:
+            raise ValueError("Either content or serialize must be given.")
+        self._content = content
+        self._data: Any = session_update
+        self._serialize = serialize
+        self._loads = loads
+
+    @property
+    def content(self) -> bytes:
+        """The serialized output, serializing it on first access."""
+        if self._content is None:
+            self._content = self._serialize()  # type: ignore[misc]
+            self._serialize = None
+        return self._content
+
+    @property
+    def data(self) -> Any:
+        """The deserialized output, deserializing it on first access.
+
+        An empty output gives an empty dictionary.
+        """
+        if self._data is None:
+            self._data = self._loads(self.content) if self.content else {}
+        return self._data
+
+    @property
+    def session_update(self) -> dict[str, Any]:
+        """The output as a session update, deserializing it on first access.
+
+        Outputs that are not a JSON object give an empty session update.
+        """
+        data = self.data
+        return data if isinstance(data, dict) else {}
+
+    @property
+    def size(self) -> int | None:
+        """The size of the serialized output in bytes, if it has been serialized."""
+        return None if self._content is None else len(self._content)
+
 
 class AbstractBaseStrategy(ABC):
-    """The abstract base class defining the API for strategies."""
+    """The abstract base class defining the API for strategies.
+
+    Attributes:
+        result_cache (MutableMapping | None): The cache for memoizing the results of
+            `get()`, e.g., a bounded `otelib.cache.LRUCache`. If `None`, results are
+            not memoized.
+        memoize (bool): Whether the results of this strategy, and of any pipeline it
+            is part of, may be memoized. Set this to `False` for non-deterministic
+            strategies.
+
+    """
 
     strategy_name: str
     strategy_config: type[GenericConfig]
@@ -27,12 +108,33 @@ class AbstractBaseStrategy(ABC):
 
         self.input_pipe: Pipe | None = None
         self.strategy_id: str = ""
+        self.config: GenericConfig | None = None
+        self.result_cache: MutableMapping[str, tuple[bytes, dict[str, Any]]] | None = (
+            None
+        )
+        self.memoize = True
         self.strategy_type = StrategyType(self.strategy_name)
+        self._codec: JSONCodec | None = None
 
         # For debugging/testing
         self.debug = bool(os.getenv("OTELIB_DEBUG", ""))
         self._session_id: str | None = None
 
+    @property
+    def codec(self) -> JSONCodec:
+        """The JSON codec for request and response bodies and session updates.
+
+        If not set, the codec of the `json_codec` setting is used.
+        """
+        if self._codec is None:
+            self._codec = get_codec()
+        return self._codec
+
+    @codec.setter
+    def codec(self, value: JSONCodec) -> None:
+        """Set the JSON codec for request and response bodies and session updates."""
+        self._codec = value
+
     @abstractmethod
     def create(self, **kwargs) -> None:
         """Create a strategy.
@@ -68,33 +170,123 @@ class AbstractBaseStrategy(ABC):
 
         """
 
-    def get(self, session_id: str | None = None) -> bytes:
+    def fetch_stream(self, session_id: str, file: IO[bytes]) -> None:
+        """Write the result of the current strategy to a file.
+
+        This method is called by `stream()`.
+        It should be overridden in backends able to receive the result in chunks.
+        By default, the result of `fetch()` is written.
+
+        Parameters:
+            session_id: The ID of the session shared by the pipeline.
+            file: The binary file to write the result to.
+
+        """
+        file.write(self.fetch(session_id))
+
+    def fetch_json(self, session_id: str) -> Any:
+        """Returns the deserialized result of the current strategy.
+
+        The result is deserialized with the `codec` directly from the received bytes.
+        Backends that produce the result as an object, e.g., the Python backend,
+        return it without serializing it at all.
+
+        Parameters:
+            session_id: The ID of the session shared by the pipeline.
+
+        Returns:
+            The result of `fetch()`, deserialized from JSON.
+
+        """
+        return self._fetch_result(session_id).data
+
+    def _fetch_result(self, session_id: str) -> StrategyResult:
+        """Return the result of the current strategy, serialized only on demand.
+
+        This method should not be run by a user, hence it is "private".
+        The method is used within the `get()` method and allows a backend to skip
+        serializing the output of strategies whose output is not needed.
+        By default, the output of `fetch()` is returned.
+
+        Parameters:
+            session_id: The ID of the session shared by the pipeline.
+
+        Returns:
+            The lazily serialized output of `fetch()`.
+
+        """
+        return StrategyResult(self.fetch(session_id), loads=self.codec.loads)
+
+    def _initialize_result(self, session_id: str) -> StrategyResult:
+        """Initialise the current strategy, serializing its output only on demand.
+
+        This method should not be run by a user, hence it is "private".
+        See `_fetch_result()`. By default, the output of `initialize()` is returned.
+
+        Parameters:
+            session_id: The ID of the session shared by the pipeline.
+
+        Returns:
+            The lazily serialized output of `initialize()`.
+
+        """
+        return StrategyResult(self.initialize(session_id), loads=self.codec.loads)
+
+    def get(
+        self, session_id: str | None = None, concurrent_initialize: bool = False
+    ) -> bytes:
         """Executes a pipeline.
 
-        This will call `initialize()` and then the `get()` method on the
-        input pipe, which in turn will call the `get()` method on the
-        strategy connected to its input and so forth until the beginning
-        of the pipeline.
+        The pipeline ending with this strategy is compiled into a `Pipeline`, which
+        calls `initialize()` on all strategies from this one to the beginning of the
+        pipeline, and then `fetch()` on all strategies from the beginning of the
+        pipeline to this one.
+
+        Finally, the output of `fetch()` on this strategy is returned.
 
-        Finally, `fetch()` is called and its output is returned.
+        If a `result_cache` is set, the output and session updates of each part of
+        the pipeline are memoized, keyed by the configurations of its strategies.
+        When the same part of a pipeline is run again, its session updates are added
+        to the session, without calling `initialize()` or `fetch()`.
+        Note, a strategy's result is assumed to only depend on its configuration and
+        those of the strategies before it in the pipeline.
 
         Parameters:
             session_id: The ID of the session shared by the pipeline.
+            concurrent_initialize: Whether to call `initialize()` on all strategies
+                in the pipeline concurrently, before calling `fetch()` on each of
+                them in order.
+                This is only valid for pipelines where no strategy's initialization
+                depends on session data added by the initialization of strategies
+                further down the pipeline.
 
         Returns:
             The output from `fetch()`.
 
         """
-        if session_id is None:
-            session_id = self._create_session()
+        return Pipeline.from_strategy(self).get(session_id, concurrent_initialize)
 
-        if self.debug:
-            self._session_id = session_id
+    def stream(
+        self, session_id: str | None = None, concurrent_initialize: bool = False
+    ) -> IO[bytes]:
+        """Executes a pipeline, streaming the result instead of returning it.
 
-        self.initialize(session_id)
-        if self.input_pipe:
-            self.input_pipe.get(session_id)
-        return self.fetch(session_id)
+        This runs the pipeline like `get()`, but finally calls `fetch_stream()` to
+        write the result to a temporary file in chunks.
+        The file is kept in memory until it exceeds the `stream_spool_threshold`
+        setting, after which it is spilled to disk.
+
+        Parameters:
+            session_id: The ID of the session shared by the pipeline.
+            concurrent_initialize: Whether to call `initialize()` on all strategies
+                in the pipeline concurrently. See `get()`.
+
+        Returns:
+            The binary file containing the result, positioned at its start.
+            It should be closed when no longer needed, which removes it.
+
+        """
+        return Pipeline.from_strategy(self).stream(session_id, concurrent_initialize)
 
     @abstractmethod
     def _create_session(self) -> str:
@@ -109,6 +301,141 @@ class AbstractBaseStrategy(ABC):
 
         """
 
+    def _update_session(self, session_id: str, session_update: dict[str, Any]) -> None:
+        """Update a session with the memoized session updates of a pipeline.
+
+        This method should not be run by a user, hence it is "private".
+        The method is used within the `get()` method when a `result_cache` is set.
+
+        Parameters:
+            session_id: The ID of the session to update.
+            session_update: The session updates to add to the session.
+
+        """
+        raise NotImplementedError(
+            f"{type(self).__name__} does not support memoizing results."
+        )
+
+    def _run_pipeline(
+        self,
+        pipeline: Pipeline,  # noqa: ARG002
+        session_id: str | None,  # noqa: ARG002
+        concurrent_initialize: bool,  # noqa: ARG002
+    ) -> tuple[bytes, ...] | None:
+        """Run a complete pipeline ending with this strategy in a single request.
+
+        This method should not be run by a user, hence it is "private".
+        The method is used within the `get()` method and allows a backend to run a
+        pipeline remotely. By default, `None` is returned, running the pipeline one
+        strategy method at a time.
+
+        Parameters:
+            pipeline: The pipeline to run.
+            session_id: The ID of the session shared by the pipeline. If `None`, a
+                new session is used.
+            concurrent_initialize: Whether to call `initialize()` on all strategies
+                in the pipeline concurrently. See `get()`.
+
+        Returns:
+            The outputs from `fetch()` of the strategies in `pipeline.outputs`, or
+            `None` if the pipeline cannot be run in a single request.
+
+        """
+        return None
+
+    def _close_session(self, session_id: str) -> None:  # noqa: B027
+        """Close a session created by `get()`, once the pipeline has run.
+
+        This method should not be run by a user, hence it is "private".
+        The method is used within the `get()` method and allows a backend to release
+        any resources held by the session. By default, nothing is done.
+
+        Parameters:
+            session_id: The ID of the session to close.
+
+        """
+
+    async def acreate(self, **kwargs) -> None:
+        """Create a strategy asynchronously.
+
+        This method should be overridden in backends supporting non-blocking I/O.
+        By default, `create()` is run in a separate thread.
+        """
+        import asyncio
+
+        await asyncio.to_thread(self.create, **kwargs)
+
+    async def afetch(self, session_id: str) -> bytes:
+        """Returns the result of the current strategy asynchronously.
+
+        This method should be overridden in backends supporting non-blocking I/O.
+        By default, `fetch()` is run in a separate thread.
+
+        Parameters:
+            session_id: The ID of the session shared by the pipeline.
+
+        Returns:
+            The result of calling the `get()` method on the current strategy
+
+        """
+        import asyncio
+
+        return await asyncio.to_thread(self.fetch, session_id)
+
+    async def ainitialize(self, session_id: str) -> bytes:
+        """Initialise the current strategy asynchronously.
+
+        This method should be overridden in backends supporting non-blocking I/O.
+        By default, `initialize()` is run in a separate thread.
+
+        Parameters:
+            session_id: The ID of the session shared by the pipeline.
+
+        Returns:
+            The response from the OTEAPI Service.
+
+        """
+        import asyncio
+
+        return await asyncio.to_thread(self.initialize, session_id)
+
+    async def aget(
+        self, session_id: str | None = None, concurrent_initialize: bool = False
+    ) -> bytes:
+        """Executes a pipeline asynchronously.
+
+        This is the awaitable counterpart to `get()`, following the same order of
+        `initialize()` and `fetch()` calls through the pipeline.
+
+        Parameters:
+            session_id: The ID of the session shared by the pipeline.
+            concurrent_initialize: Whether to await `ainitialize()` on all strategies
+                in the pipeline concurrently, before awaiting `afetch()` on each of
+                them in order.
+                See `get()` for when this is valid.
+
+        Returns:
+            The output from `afetch()`.
+
+        """
+        return await Pipeline.from_strategy(self).aget(
+            session_id, concurrent_initialize
+        )
+
+    async def _acreate_session(self) -> str:
+        """Create a new session asynchronously.
+
+        This method should be overridden in backends supporting non-blocking I/O.
+        By default, `_create_session()` is run in a separate thread.
+
+        Returns:
+            The newly created session's ID.
+
+        """
+        import asyncio
+
+        return await asyncio.to_thread(self._create_session)
+
     def _set_input(self, input_pipe: Pipe) -> None:
         """Used by `__rshift__` to set the input pipe.
 
@@ -120,20 +447,61 @@ class AbstractBaseStrategy(ABC):
         start_filter = _find_start_filter(self)
         start_filter.input_pipe = input_pipe
 
-    def __rshift__(self, other: AbstractBaseStrategy) -> AbstractBaseStrategy:
+    @overload
+    def __rshift__(self, other: AbstractBaseStrategy) -> AbstractBaseStrategy: ...
+
+    @overload
+    def __rshift__(
+        self, other: tuple[AbstractBaseStrategy, ...]
+    ) -> tuple[AbstractBaseStrategy, ...]: ...
+
+    @overload
+    def __rshift__(self, other: Pipeline) -> Pipeline: ...
+
+    def __rshift__(
+        self, other: AbstractBaseStrategy | tuple[AbstractBaseStrategy, ...] | Pipeline
+    ) -> AbstractBaseStrategy | tuple[AbstractBaseStrategy, ...] | Pipeline:
         """Implements strategy concatenation using the `>>` symbol.
 
         Parameters:
-            other: The next strategy this one is "piping" into.
+            other: The next strategy this one is "piping" into, a tuple of strategies
+                this one is "piping" into each of (fan-out), or a pipeline starting
+                with the next strategy.
 
         Returns:
-            The next strategy this one is "piped" into.
+            The next strategy or strategies this one is "piped" into, or, if `other`
+            is a `Pipeline`, a new pipeline continuing this strategy's pipeline.
 
         """
+        if isinstance(other, Pipeline):
+            return Pipeline.from_strategy(self) >> other
+
+        if isinstance(other, tuple):
+            for strategy in other:
+                strategy._set_input(Pipe(self))
+            return other
+
         pipe = Pipe(self)
         other._set_input(pipe)
         return other
 
+    def __rrshift__(
+        self, other: tuple[AbstractBaseStrategy, ...]
+    ) -> AbstractBaseStrategy:
+        """Implements merging strategies using the `>>` symbol (fan-in).
+
+        Parameters:
+            other: The strategies "piping" into this one.
+
+        Returns:
+            This strategy.
+
+        """
+        if not isinstance(other, tuple) or not other:
+            return NotImplemented
+        self._set_input(Pipe(*other))
+        return self
+
 
 def _find_start_filter(other):
     """Used by _set_input to find the input filter,
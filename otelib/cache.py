@@ -0,0 +1,446 @@
+"""Bounded in-memory and on-disk caches."""
+
+from __future__ import annotations
+
+import os
+
+# The values of a disk cache are pickled. Its file is owned by the user and only
+# written by the user's trusted processes, see `DiskCache`.
+import pickle  # nosec B403
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from contextlib import contextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:  # pragma: no cover
+    from collections.abc import Callable, Iterator
+    from typing import Any
+
+
+def sizeof(value: Any) -> int:
+    """Return the approximate memory size in bytes of a value and its contents."""
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(sizeof(key) + sizeof(item) for key, item in value.items())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(sizeof(item) for item in value)
+    return size
+
+
+class LRUCache(MutableMapping):
+    """A thread-safe mapping evicting its least recently used entries.
+
+    Entries are evicted when the cache exceeds `max_entries` entries or `max_bytes`
+    bytes, as well as when they have not been written for `ttl` seconds.
+    Any limit that is `None` is not enforced.
+
+    The size of an entry is determined when it is set. Hence, a mutable entry that is
+    changed in place must be set again to update its size.
+
+    Entries that are in use, e.g., the session of a running pipeline, can be pinned
+    with `pin()`. Pinned entries are neither evicted nor expire until they are
+    unpinned or deleted, even if the cache exceeds its limits meanwhile.
+
+    Parameters:
+        max_entries: The maximum number of entries.
+        max_bytes: The maximum approximate total size of all entries in bytes.
+        ttl: The time to live for an entry in seconds.
+        sizeof: A function returning the size of an entry in bytes.
+
+    Attributes:
+        hits (int): The number of successful lookups.
+        misses (int): The number of lookups of missing or expired entries.
+        evictions (int): The number of entries evicted due to the limits.
+
+    """
+
+    def __init__(
+        self,
+        max_entries: int | None = None,
+        max_bytes: int | None = None,
+        ttl: float | None = None,
+        sizeof: Callable[[Any], int] = sizeof,
+    ) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.sizeof = sizeof
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        # Key -> (value, size in bytes, time of expiration)
+        self._data: OrderedDict[str, tuple[Any, int, float]] = OrderedDict()
+        self._bytes = 0
+        self._next_sweep = float("inf") if ttl is None else time.monotonic() + ttl
+        self._pinned: set[str] = set()
+        self._lock = threading.RLock()
+
+    @property
+    def total_bytes(self) -> int:
+        """The approximate total size of all entries in bytes."""
+        return self._bytes
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """The cache statistics."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._data),
+                "bytes": self._bytes,
+            }
+
+    def pin(self, key: str) -> None:
+        """Keep an entry from being evicted or expiring until it is unpinned.
+
+        Parameters:
+            key: The key of the entry, which may also be set after pinning it.
+
+        """
+        with self._lock:
+            self._pinned.add(key)
+
+    def unpin(self, key: str) -> None:
+        """Let a pinned entry be evicted and expire again.
+
+        Parameters:
+            key: The key of the entry.
+
+        """
+        with self._lock:
+            self._pinned.discard(key)
+            self._evict()
+
+    def __getitem__(self, key: str) -> Any:
+        with self._lock:
+            if key not in self._data or self._expired(key):
+                self.misses += 1
+                raise KeyError(key)
+            self.hits += 1
+            self._data.move_to_end(key)
+            return self._data[key][0]
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        size = self.sizeof(value)
+        expires = time.monotonic() + self.ttl if self.ttl is not None else float("inf")
+        with self._lock:
+            if key in self._data:
+                self._bytes -= self._data.pop(key)[1]
+            self._data[key] = (value, size, expires)
+            self._bytes += size
+            self._evict()
+
+    def __delitem__(self, key: str) -> None:
+        with self._lock:
+            self._bytes -= self._data.pop(key)[1]
+            self._pinned.discard(key)
+
+    def __contains__(self, key: object) -> bool:
+        with self._lock:
+            return key in self._data and not self._expired(key)  # type: ignore[arg-type]
+
+    def __iter__(self) -> Iterator[str]:
+        with self._lock:
+            self._remove_expired()
+            return iter(list(self._data))
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._remove_expired()
+            return len(self._data)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._pinned.clear()
+            self._bytes = 0
+
+    def _expired(self, key: str) -> bool:
+        """Remove the entry for `key` if it has expired, returning whether it did."""
+        if key in self._pinned or self._data[key][2] > time.monotonic():
+            return False
+        del self[key]
+        self.evictions += 1
+        return True
+
+    def _remove_expired(self) -> None:
+        """Remove all expired entries."""
+        if self.ttl is not None:
+            self._next_sweep = time.monotonic() + self.ttl
+            for key in list(self._data):
+                self._expired(key)
+
+    def _evict(self) -> None:
+        """Evict the least recently used entries until the cache is within limits.
+
+        Expired entries are removed lazily when looked up, and all at once at most
+        every `ttl` seconds. Pinned entries are skipped.
+        """
+        if time.monotonic() >= self._next_sweep:
+            self._remove_expired()
+        while (self.max_entries is not None and len(self._data) > self.max_entries) or (
+            self.max_bytes is not None and self._bytes > self.max_bytes
+        ):
+            key = next((key for key in self._data if key not in self._pinned), None)
+            if key is None:
+                return
+            self._bytes -= self._data.pop(key)[1]
+            self.evictions += 1
+
+
+class DiskCache(MutableMapping):
+    """A mapping stored in an SQLite database, shared by threads and processes.
+
+    Any number of processes may read and write the same cache concurrently, e.g.,
+    the workers of a web server, letting them reuse each other's results.
+    Entries are evicted least recently used first when the cache exceeds
+    `max_bytes` bytes.
+
+    Values are pickled, so only use a cache file written by trusted processes.
+    A value changed in place must be set again to be stored.
+
+    Reading an entry does not write to the database. The times entries are used
+    at are collected in memory, and stored in batches of `access_batch_size`, before
+    setting an entry, and when closing the cache. The total size of all entries is
+    kept up to date by the database, so setting an entry only scans the entries if
+    some must be evicted.
+
+    Parameters:
+        path: The SQLite database file. Defaults to `cache.sqlite` in the directory
+            given by the `cache_dir` setting.
+        max_bytes: The maximum total size of all pickled values in bytes.
+            If `None`, the size is not limited.
+        timeout: The number of seconds to wait for another process to release a lock
+            on the database.
+
+    Attributes:
+        hits (int): The number of successful lookups in this process.
+        misses (int): The number of lookups of missing entries in this process.
+        evictions (int): The number of entries evicted by this process due to
+            `max_bytes`.
+
+    """
+
+    access_batch_size = 256
+
+    def __init__(
+        self,
+        path: str | Path | None = None,
+        max_bytes: int | None = None,
+        timeout: float = 30.0,
+    ) -> None:
+        if path is None:
+            from otelib.settings import Settings
+
+            cache_dir = Settings().cache_dir
+            if cache_dir is None:
+                raise ValueError(
+                    "Either a path or the cache_dir setting must be given for a disk "
+                    "cache."
+                )
+            path = cache_dir / "cache.sqlite"
+
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        # SQLite connections must not be shared between threads or processes
+        self._local = threading.local()
+        # Key -> time of the last use, not yet stored in the database
+        self._accessed: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._transaction() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, "
+                "value BLOB NOT NULL, size INTEGER NOT NULL, accessed REAL NOT NULL)"
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)"
+            )
+            # The total size of all entries, kept up to date by triggers
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS totals "
+                "(id INTEGER PRIMARY KEY CHECK (id = 0), size INTEGER NOT NULL)"
+            )
+            connection.execute(
+                "INSERT OR IGNORE INTO totals "
+                "SELECT 0, COALESCE(SUM(size), 0) FROM entries"
+            )
+            connection.execute(
+                "CREATE TRIGGER IF NOT EXISTS entries_insert AFTER INSERT ON entries "
+                "BEGIN UPDATE totals SET size = size + new.size; END"
+            )
+            connection.execute(
+                "CREATE TRIGGER IF NOT EXISTS entries_update AFTER UPDATE OF size "
+                "ON entries BEGIN UPDATE totals SET size = size - old.size + new.size; "
+                "END"
+            )
+            connection.execute(
+                "CREATE TRIGGER IF NOT EXISTS entries_delete AFTER DELETE ON entries "
+                "BEGIN UPDATE totals SET size = size - old.size; END"
+            )
+
+    @property
+    def total_bytes(self) -> int:
+        """The total size of all pickled values in bytes."""
+        return self._connection().execute("SELECT size FROM totals").fetchone()[0]
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """The cache statistics."""
+        entries, total_bytes = (
+            self._connection()
+            .execute("SELECT (SELECT COUNT(*) FROM entries), size FROM totals")
+            .fetchone()
+        )
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": entries,
+            "bytes": total_bytes,
+        }
+
+    def __getitem__(self, key: str) -> Any:
+        connection = self._connection()
+        row = connection.execute(
+            "SELECT value FROM entries WHERE key = ?", (key,)
+        ).fetchone()
+        with self._lock:
+            if row is None:
+                self.misses += 1
+                raise KeyError(key)
+            self.hits += 1
+            self._accessed[key] = time.time()
+            flush = len(self._accessed) >= self.access_batch_size
+        if flush:
+            with self._transaction() as connection:
+                self._store_accessed(connection)
+        # The cache file is trusted, see above
+        return pickle.loads(row[0])  # nosec B301
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._transaction() as connection:
+            # Stored first, so the entries used meanwhile are not evicted, and the
+            # time of setting this entry is not overwritten
+            self._store_accessed(connection)
+            # Unlike `INSERT OR REPLACE`, an upsert runs the triggers updating the
+            # total size
+            connection.execute(
+                "INSERT INTO entries VALUES (?, ?, ?, ?) ON CONFLICT (key) DO UPDATE "
+                "SET value = excluded.value, size = excluded.size, "
+                "accessed = excluded.accessed",
+                (key, data, len(data), time.time()),
+            )
+            self._evict(connection)
+
+    def __delitem__(self, key: str) -> None:
+        with self._transaction() as connection:
+            if not connection.execute(
+                "DELETE FROM entries WHERE key = ?", (key,)
+            ).rowcount:
+                raise KeyError(key)
+
+    def __contains__(self, key: object) -> bool:
+        return (
+            self._connection()
+            .execute("SELECT 1 FROM entries WHERE key = ?", (key,))
+            .fetchone()
+            is not None
+        )
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(
+            [key for (key,) in self._connection().execute("SELECT key FROM entries")]
+        )
+
+    def __len__(self) -> int:
+        return self._connection().execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def clear(self) -> None:
+        with self._transaction() as connection:
+            connection.execute("DELETE FROM entries")
+
+    def close(self) -> None:
+        """Store the times entries were used at, and close the database connection
+        of the current thread."""
+        if self._accessed:
+            with self._transaction() as connection:
+                self._store_accessed(connection)
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+    def _connection(self) -> sqlite3.Connection:
+        """Return the database connection of the current thread and process."""
+        if (
+            getattr(self._local, "connection", None) is None
+            or self._local.pid != os.getpid()
+        ):
+            connection = sqlite3.connect(
+                self.path, timeout=self.timeout, isolation_level=None
+            )
+            # Let readers and a writer access the database concurrently
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return self._local.connection
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """Run statements in a transaction, locking the database for writing."""
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield connection
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+
+    def _evict(self, connection: sqlite3.Connection) -> None:
+        """Evict the least recently used entries until the cache is within limits."""
+        if self.max_bytes is None:
+            return
+        (total_bytes,) = connection.execute("SELECT size FROM totals").fetchone()
+        excess = total_bytes - self.max_bytes
+        if excess <= 0:
+            return
+        evicted = []
+        for key, size in connection.execute(
+            "SELECT key, size FROM entries ORDER BY accessed"
+        ):
+            evicted.append((key,))
+            excess -= size
+            if excess <= 0:
+                break
+        connection.executemany("DELETE FROM entries WHERE key = ?", evicted)
+        with self._lock:
+            self.evictions += len(evicted)
+
+    def _store_accessed(self, connection: sqlite3.Connection) -> None:
+        """Store the times entries were used at, collected since last storing them."""
+        with self._lock:
+            accessed, self._accessed = self._accessed, {}
+        connection.executemany(
+            "UPDATE entries SET accessed = ? WHERE key = ?",
+            [(accessed_at, key) for key, accessed_at in accessed.items()],
+        )
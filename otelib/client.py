@@ -2,15 +2,24 @@
 
 from __future__ import annotations
 
+import sys
 from typing import TYPE_CHECKING
 
-from pydantic import AnyHttpUrl, ValidationError
-
 from otelib.backends.factories import client_factory
 from otelib.backends.utils import Backend, StrategyType
 
 if TYPE_CHECKING:  # pragma: no cover
+    from collections.abc import Iterable, Iterator
+    from typing import Any
+
+    from otelib.backends.client import BatchInput
     from otelib.backends.strategies import AbstractBaseStrategy
+    from otelib.pipeline import Pipeline
+
+    if sys.version_info >= (3, 11):
+        from typing import Self
+    else:
+        from typing_extensions import Self
 
 
 class OTEClient:
@@ -33,12 +42,7 @@ class OTEClient:
             config: Custom client configuration properties.
 
         """
-        try:
-            AnyHttpUrl(url)
-        except ValidationError:
-            backend = Backend.PYTHON
-        else:
-            backend = Backend.SERVICES
+        backend = Backend.PYTHON if url == Backend.PYTHON else _url_backend(url)
 
         self._impl = client_factory(backend)(url, **config)
 
@@ -50,6 +54,31 @@ class OTEClient:
         """
         return self._impl.source
 
+    def close(self) -> None:
+        """Close the client, releasing any resources held by the backend.
+
+        For the services backend this closes all pooled connections to the OTEAPI
+        Service.
+        """
+        self._impl.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    async def aclose(self) -> None:
+        """Close the client asynchronously, releasing any resources held by the
+        backend."""
+        await self._impl.aclose()
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
     def create_dataresource(self, **config) -> AbstractBaseStrategy:
         """Create a new data resource.
 
@@ -115,3 +144,140 @@ class OTEClient:
 
         """
         return self._impl.create_strategy(StrategyType.TRANSFORMATION, **config)
+
+    def create_many(
+        self, strategies: Iterable[tuple[str | StrategyType, dict[str, Any]]]
+    ) -> list[AbstractBaseStrategy]:
+        """Create many strategies at once.
+
+        For the services backend, all configurations are validated before any
+        strategy is created, and the strategies are created concurrently, or in a
+        single request if the OTEAPI Service supports it, e.g.:
+
+        ```python
+        data_resource, parser = client.create_many(
+            [
+                ("dataresource", {"downloadUrl": url, "mediaType": "application/json"}),
+                ("parser", {"parserType": "parser/json"}),
+            ]
+        )
+        ```
+
+        Any given arguments are passed on to the backend's `create_many()` method.
+
+        Returns:
+            The newly created strategies, in the same order.
+
+        """
+        return self._impl.create_many(strategies)
+
+    def run_batch(
+        self,
+        pipeline_template: AbstractBaseStrategy | Pipeline,
+        inputs: Iterable[BatchInput],
+        max_workers: int | None = None,
+    ) -> Iterator[tuple[int, bytes]]:
+        """Run a pipeline once for each of many inputs, with bounded parallelism.
+
+        Each input maps a strategy in the pipeline, or its strategy type, to the
+        configuration fields that should differ for that run, e.g.:
+
+        ```python
+        pipeline = data_resource >> parser
+        inputs = [{"dataresource": {"downloadUrl": url}} for url in urls]
+        for index, result in client.run_batch(pipeline, inputs, max_workers=8):
+            ...
+        ```
+
+        Any given arguments are passed on to the backend's `run_batch()` method.
+
+        Parameters:
+            pipeline_template: The pipeline, or the last strategy of the pipeline, to
+                run.
+            inputs: The configuration fields to vary for each run.
+            max_workers: The maximum number of pipelines to run in parallel.
+
+        Returns:
+            An iterator of tuples of an input's index in `inputs` and its result,
+            in the order the runs complete.
+
+        """
+        return self._impl.run_batch(pipeline_template, inputs, max_workers=max_workers)
+
+    async def acreate_dataresource(self, **config) -> AbstractBaseStrategy:
+        """Create a new data resource asynchronously.
+
+        Any given keyword arguments are passed on to the `acreate_strategy()` method.
+
+        Returns:
+            The newly created data resource.
+
+        """
+        return await self._impl.acreate_strategy(StrategyType.DATARESOURCE, **config)
+
+    async def acreate_parser(self, **config) -> AbstractBaseStrategy:
+        """Create a new parser asynchronously.
+
+        Any given keyword arguments are passed on to the `acreate_strategy()` method.
+
+        Returns:
+            The newly created parser.
+
+        """
+        return await self._impl.acreate_strategy(StrategyType.PARSER, **config)
+
+    async def acreate_filter(self, **config) -> AbstractBaseStrategy:
+        """Create a new filter asynchronously.
+
+        Any given keyword arguments are passed on to the `acreate_strategy()` method.
+
+        Returns:
+            The newly created filter.
+
+        """
+        return await self._impl.acreate_strategy(StrategyType.FILTER, **config)
+
+    async def acreate_function(self, **config) -> AbstractBaseStrategy:
+        """Create a new function asynchronously.
+
+        Any given keyword arguments are passed on to the `acreate_strategy()` method.
+
+        Returns:
+            The newly created function.
+
+        """
+        return await self._impl.acreate_strategy(StrategyType.FUNCTION, **config)
+
+    async def acreate_mapping(self, **config) -> AbstractBaseStrategy:
+        """Create a new mapping asynchronously.
+
+        Any given keyword arguments are passed on to the `acreate_strategy()` method.
+
+        Returns:
+            The newly created mapping.
+
+        """
+        return await self._impl.acreate_strategy(StrategyType.MAPPING, **config)
+
+    async def acreate_transformation(self, **config) -> AbstractBaseStrategy:
+        """Create a new transformation asynchronously.
+
+        Any given keyword arguments are passed on to the `acreate_strategy()` method.
+
+        Returns:
+            The newly created transformation.
+
+        """
+        return await self._impl.acreate_strategy(StrategyType.TRANSFORMATION, **config)
+
+
+def _url_backend(url: str) -> Backend:
+    """Return the backend for a URL, i.e., the services backend for an HTTP URL."""
+    # Importing pydantic is deferred, as it is slow and not needed for `python`
+    from pydantic import AnyHttpUrl, ValidationError
+
+    try:
+        AnyHttpUrl(url)
+    except ValidationError:
+        return Backend.PYTHON
+    return Backend.SERVICES
@@ -0,0 +1,119 @@
+"""JSON codecs for request and response bodies.
+
+The codec is chosen by the `json_codec` setting.
+By default (`"auto"`), the fastest installed codec is used: orjson, then msgspec,
+falling back to the `json` module of the standard library.
+
+All codecs encode to compact UTF-8 JSON bytes, and decode directly from bytes:
+
+```python
+from otelib.codec import get_codec
+
+codec = get_codec()
+codec.loads(codec.dumps({"key": "value"}))
+```
+"""
+
+from __future__ import annotations
+
+import json
+from functools import cache
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:  # pragma: no cover
+    from collections.abc import Callable
+    from typing import Any
+
+# The codecs to try, in order, for the `"auto"` codec
+_AUTO = ("orjson", "msgspec")
+
+
+class JSONCodec:
+    """A JSON encoder and decoder.
+
+    Parameters:
+        name: The name of the codec, e.g., `"orjson"`.
+        dumps: A function encoding an object to JSON bytes.
+        loads: A function decoding JSON bytes, or a string, to an object.
+
+    """
+
+    __slots__ = ("dumps", "loads", "name")
+
+    def __init__(
+        self,
+        name: str,
+        dumps: Callable[[Any], bytes],
+        loads: Callable[[bytes | str], Any],
+    ) -> None:
+        self.name = name
+        self.dumps = dumps
+        self.loads = loads
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.name!r})"
+
+
+def get_codec(name: str | None = None) -> JSONCodec:
+    """Return a JSON codec.
+
+    Parameters:
+        name: The name of the codec: `"json"`, `"orjson"`, `"msgspec"`, or `"auto"`
+            for the fastest one installed. If not given, the `json_codec` setting is
+            used.
+
+    Returns:
+        The codec, which is created once per process.
+
+    """
+    if name is None:
+        from otelib.settings import Settings
+
+        name = Settings().json_codec
+    return _load_codec(name)
+
+
+@cache
+def _load_codec(name: str) -> JSONCodec:
+    """Create a JSON codec by its name, see `get_codec()`."""
+    if name == "auto":
+        for candidate in _AUTO:
+            try:
+                return _load_codec(candidate)
+            except ImportError:
+                continue
+        return _load_codec("json")
+
+    if name == "json":
+        return JSONCodec(
+            name,
+            lambda obj: json.dumps(
+                obj, ensure_ascii=False, separators=(",", ":")
+            ).encode(),
+            json.loads,
+        )
+
+    if name == "orjson":
+        try:
+            import orjson
+        except ImportError as exc:
+            raise ImportError(
+                "The 'orjson' JSON codec requires 'orjson'. Install it with: "
+                "pip install otelib[speedups]"
+            ) from exc
+        return JSONCodec(name, orjson.dumps, orjson.loads)
+
+    if name == "msgspec":
+        try:
+            import msgspec
+        except ImportError as exc:
+            raise ImportError(
+                "The 'msgspec' JSON codec requires 'msgspec'. Install it with: "
+                "pip install msgspec"
+            ) from exc
+        return JSONCodec(name, msgspec.json.encode, msgspec.json.decode)
+
+    raise ValueError(
+        f"Unknown JSON codec {name!r}. Use one of: 'auto', 'json', 'orjson', "
+        "'msgspec'."
+    )
@@ -4,17 +4,38 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
+from otelib.pipeline import Pipeline
+
 if TYPE_CHECKING:  # pragma: no cover
 
     from otelib.backends.strategies import AbstractBaseStrategy
 
 
 class Pipe:
-    """Pipe object in a pipe-and-filter pattern."""
+    """Pipe object in a pipe-and-filter pattern.
+
+    A pipe may merge the outputs of several strategies into one (fan-in).
+
+    Attributes:
+        inputs (tuple[AbstractBaseStrategy, ...]): The strategies piped into the pipe.
 
-    def __init__(self, strategy: AbstractBaseStrategy) -> None:
-        self.input: AbstractBaseStrategy = strategy
+    """
+
+    def __init__(
+        self, strategy: AbstractBaseStrategy, *strategies: AbstractBaseStrategy
+    ) -> None:
+        self.inputs: tuple[AbstractBaseStrategy, ...] = (strategy, *strategies)
+
+    @property
+    def input(self) -> AbstractBaseStrategy:
+        """The (first) strategy piped into the pipe."""
+        return self.inputs[0]
 
     def get(self, session_id: str | None = None) -> bytes:
-        """Call the input strategy's `get()` method."""
-        return self.input.get(session_id)
+        """Run the input strategies' pipeline, returning the output of the last one."""
+        return Pipeline.from_strategies(*self.inputs).get(session_id)
+
+    async def aget(self, session_id: str | None = None) -> bytes:
+        """Await the input strategies' pipeline, returning the output of the last
+        one."""
+        return await Pipeline.from_strategies(*self.inputs).aget(session_id)
@@ -0,0 +1,678 @@
+"""Pipeline object for executing a compiled plan of strategies."""
+
+from __future__ import annotations
+
+import contextvars
+import hashlib
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import TYPE_CHECKING
+
+from otelib.tracing import trace_step
+
+if TYPE_CHECKING:  # pragma: no cover
+    from collections.abc import Awaitable, Callable, Iterable, Iterator, Sequence
+    from concurrent.futures import Future
+    from typing import IO, Any
+
+    from otelib.backends.strategies import AbstractBaseStrategy, StrategyResult
+
+    # For each strategy in a plan, the indices of the strategies piped into it
+    Inputs = tuple[tuple[int, ...], ...]
+
+
+class Pipeline:
+    """A pipeline of strategies, compiled into a flat execution plan.
+
+    A pipeline is a directed acyclic graph of strategies. A strategy may have several
+    inputs (fan-in), and a strategy may be the input of several others (fan-out).
+    Every strategy is run once per session, even if it is the input of several
+    strategies, and independent branches of the pipeline are run concurrently.
+
+    A pipeline is immutable. Extending it with `>>` returns a new pipeline, which
+    keeps a reference to this one as its beginning. Hence, extending a pipeline takes
+    constant time, and a pipeline may be forked into several pipelines.
+    The execution plan is compiled once, when it is first needed, and the pipeline
+    can be run any number of times.
+
+    ```python
+    pipeline = Pipeline(data_resource) >> parser >> mapping
+    pipeline.get()
+
+    # Fan out from the parser to two filters
+    forked = Pipeline(data_resource) >> parser >> (filter1, filter2)
+    forked.get_outputs()
+    ```
+
+    Unlike concatenating strategies with `>>`, the `input_pipe` attributes of the
+    strategies are neither used nor changed.
+
+    Parameters:
+        strategies: The strategies in the order they are connected.
+
+    """
+
+    def __init__(self, *strategies: AbstractBaseStrategy) -> None:
+        if not strategies:
+            raise ValueError("A pipeline must consist of at least one strategy.")
+
+        self._previous: Pipeline | None = None
+        self._strategies = strategies
+        self._inputs: Inputs = ((), *((index,) for index in range(len(strategies) - 1)))
+        self._outputs: tuple[int, ...] = (len(strategies) - 1,)
+        self._length = len(strategies)
+        self._plan: tuple[tuple[AbstractBaseStrategy, ...], Inputs] | None = None
+
+    @classmethod
+    def from_strategy(cls, strategy: AbstractBaseStrategy) -> Pipeline:
+        """Create a pipeline of a strategy and the strategies piped into it.
+
+        Parameters:
+            strategy: The last strategy of a pipeline concatenated with `>>`.
+
+        Returns:
+            A pipeline of the same strategies.
+
+        """
+        return cls.from_strategies(strategy)
+
+    @classmethod
+    def from_strategies(cls, *outputs: AbstractBaseStrategy) -> Pipeline:
+        """Create a pipeline of strategies and all strategies piped into them.
+
+        Parameters:
+            outputs: The last strategies of pipelines concatenated with `>>`.
+
+        Returns:
+            A pipeline of the same strategies, ending with `outputs`.
+
+        """
+        if not outputs:
+            raise ValueError("A pipeline must consist of at least one strategy.")
+
+        # Sort the strategies topologically with an iterative depth-first search
+        strategies: list[AbstractBaseStrategy] = []
+        positions: dict[int, int] = {}
+        visiting: set[int] = set()
+        stack = [(strategy, False) for strategy in reversed(outputs)]
+        while stack:
+            strategy, expanded = stack.pop()
+            if id(strategy) in positions:
+                continue
+            if expanded:
+                visiting.discard(id(strategy))
+                positions[id(strategy)] = len(strategies)
+                strategies.append(strategy)
+                continue
+            if id(strategy) in visiting:
+                raise ValueError(f"The pipeline of {strategy!r} contains a cycle.")
+            visiting.add(id(strategy))
+            stack.append((strategy, True))
+            stack.extend(
+                (input_, False) for input_ in reversed(_strategy_inputs(strategy))
+            )
+
+        return cls._create(
+            None,
+            tuple(strategies),
+            tuple(
+                tuple(positions[id(input_)] for input_ in _strategy_inputs(strategy))
+                for strategy in strategies
+            ),
+            tuple(sorted({positions[id(strategy)] for strategy in outputs})),
+        )
+
+    @classmethod
+    def _create(
+        cls,
+        previous: Pipeline | None,
+        strategies: tuple[AbstractBaseStrategy, ...],
+        inputs: Inputs,
+        outputs: tuple[int, ...],
+    ) -> Pipeline:
+        """Create a pipeline extending `previous` by `strategies`.
+
+        Parameters:
+            previous: The beginning of the pipeline.
+            strategies: The strategies added to the pipeline.
+            inputs: For each added strategy, the indices of its inputs in the
+                complete pipeline.
+            outputs: The indices of the last strategies in the complete pipeline.
+
+        Returns:
+            The new pipeline.
+
+        """
+        pipeline = cls.__new__(cls)
+        pipeline._previous = previous
+        pipeline._strategies = strategies
+        pipeline._inputs = inputs
+        pipeline._outputs = outputs
+        pipeline._length = len(strategies) + (len(previous) if previous else 0)
+        pipeline._plan = None
+        return pipeline
+
+    @property
+    def strategies(self) -> tuple[AbstractBaseStrategy, ...]:
+        """The execution plan, i.e., the strategies sorted such that each strategy
+        comes after all of its inputs."""
+        return self.compile()
+
+    @property
+    def inputs(self) -> Inputs:
+        """For each strategy in the execution plan, the indices of its inputs."""
+        return self._compile()[1]
+
+    @property
+    def outputs(self) -> tuple[AbstractBaseStrategy, ...]:
+        """The last strategies of the pipeline, in the order of the execution plan.
+
+        The last strategy in the execution plan is always the last of them.
+        """
+        strategies = self.compile()
+        return tuple(strategies[index] for index in self._outputs)
+
+    def compile(self) -> tuple[AbstractBaseStrategy, ...]:
+        """Compile the execution plan, if it has not been compiled already.
+
+        Returns:
+            The strategies sorted such that each strategy comes after all of its
+            inputs.
+
+        """
+        return self._compile()[0]
+
+    def _compile(self) -> tuple[tuple[AbstractBaseStrategy, ...], Inputs]:
+        """Compile the execution plan and the inputs of each of its strategies."""
+        if self._plan is None:
+            parts: list[tuple[tuple[AbstractBaseStrategy, ...], Inputs]] = []
+            pipeline: Pipeline | None = self
+            while pipeline is not None:
+                if pipeline._plan is not None:
+                    parts.append(pipeline._plan)
+                    break
+                parts.append((pipeline._strategies, pipeline._inputs))
+                pipeline = pipeline._previous
+            self._plan = (
+                tuple(strategy for part in reversed(parts) for strategy in part[0]),
+                tuple(inputs for part in reversed(parts) for inputs in part[1]),
+            )
+        return self._plan
+
+    def get(
+        self, session_id: str | None = None, concurrent_initialize: bool = False
+    ) -> bytes:
+        """Executes the pipeline.
+
+        This calls `initialize()` on all strategies from the end of the pipeline to
+        its start, and then `fetch()` on all strategies from its start to its end,
+        returning the output of the last one.
+        Strategies in independent branches of the pipeline are run concurrently.
+
+        If the last strategy has a `result_cache`, the output and session updates of
+        each part of the pipeline are memoized, keyed by the configurations of its
+        strategies.
+        When the same part of a pipeline is run again, its session updates are added
+        to the session, without calling `initialize()` or `fetch()`.
+        Note, a strategy's result is assumed to only depend on its configuration and
+        those of the strategies before it in the pipeline.
+
+        Otherwise, the complete pipeline is run in a single request, if the backend
+        supports it.
+
+        Parameters:
+            session_id: The ID of the session shared by the pipeline.
+            concurrent_initialize: Whether to call `initialize()` on all strategies
+                in the pipeline concurrently, before calling `fetch()` on each of
+                them in order.
+                This is only valid for pipelines where no strategy's initialization
+                depends on session data added by the initialization of strategies
+                further down the pipeline.
+
+        Returns:
+            The output from `fetch()` of the last strategy.
+
+        """
+        return self.get_outputs(session_id, concurrent_initialize)[-1]
+
+    def get_outputs(
+        self, session_id: str | None = None, concurrent_initialize: bool = False
+    ) -> tuple[bytes, ...]:
+        """Executes the pipeline like `get()`, returning the output of each of its
+        last strategies.
+
+        Parameters:
+            session_id: The ID of the session shared by the pipeline.
+            concurrent_initialize: Whether to call `initialize()` on all strategies
+                in the pipeline concurrently. See `get()`.
+
+        Returns:
+            The outputs from `fetch()` of the strategies in `outputs`.
+
+        """
+        plan = self.compile()
+        with trace_step("pipeline", plan[-1], session_id):
+            if plan[-1].result_cache is None:
+                outputs = plan[-1]._run_pipeline(
+                    self, session_id, concurrent_initialize
+                )
+                if outputs is not None:
+                    return outputs
+
+            results = self._get(session_id, concurrent_initialize)
+            return tuple(results[index] for index in self._outputs)
+
+    def stream(
+        self, session_id: str | None = None, concurrent_initialize: bool = False
+    ) -> IO[bytes]:
+        """Executes the pipeline, streaming the result instead of returning it.
+
+        This runs the pipeline like `get()`, but finally calls `fetch_stream()` on the
+        last strategy to write the result to a temporary file in chunks.
+        The file is kept in memory until it exceeds the `stream_spool_threshold`
+        setting, after which it is spilled to disk.
+
+        Parameters:
+            session_id: The ID of the session shared by the pipeline.
+            concurrent_initialize: Whether to call `initialize()` on all strategies
+                in the pipeline concurrently. See `get()`.
+
+        Returns:
+            The binary file containing the result, positioned at its start.
+            It should be closed when no longer needed, which removes it.
+
+        """
+        from tempfile import SpooledTemporaryFile
+
+        from otelib.settings import Settings
+
+        file = SpooledTemporaryFile(  # noqa: SIM115
+            max_size=Settings().stream_spool_threshold
+        )
+        try:
+            with trace_step("pipeline", self.compile()[-1], session_id):
+                self._get(session_id, concurrent_initialize, file)
+        except BaseException:
+            file.close()
+            raise
+        file.seek(0)
+        return file
+
+    async def aget(
+        self, session_id: str | None = None, concurrent_initialize: bool = False
+    ) -> bytes:
+        """Executes the pipeline asynchronously.
+
+        This is the awaitable counterpart to `get()`, following the same order of
+        `initialize()` and `fetch()` calls through the pipeline.
+        Results are not memoized.
+
+        Parameters:
+            session_id: The ID of the session shared by the pipeline.
+            concurrent_initialize: Whether to await `ainitialize()` on all strategies
+                in the pipeline concurrently, before awaiting `afetch()` on each of
+                them in order.
+                See `get()` for when this is valid.
+
+        Returns:
+            The output from `afetch()` of the last strategy.
+
+        """
+        plan = self.compile()
+        with trace_step("pipeline", plan[-1], session_id):
+            if session_id is None:
+                with trace_step("create_session", plan[-1]) as span:
+                    session_id = span.session_id = await plan[-1]._acreate_session()
+                try:
+                    return await self._aget(session_id, concurrent_initialize)
+                finally:
+                    plan[-1]._close_session(session_id)
+            return await self._aget(session_id, concurrent_initialize)
+
+    async def _aget(self, session_id: str, concurrent_initialize: bool) -> bytes:
+        """Run the pipeline asynchronously in a session. See `aget()`."""
+        plan = self.compile()
+        _set_debug_session_id(plan, session_id)
+        inputs, consumers = self.inputs, self._consumers()
+        results: list[bytes] = [b""] * len(plan)
+
+        async def initialize(index: int) -> None:
+            with trace_step("initialize", plan[index], session_id) as span:
+                span.size = len(await plan[index].ainitialize(session_id))
+
+        async def fetch(index: int) -> None:
+            with trace_step("fetch", plan[index], session_id) as span:
+                results[index] = await plan[index].afetch(session_id)
+                span.size = len(results[index])
+
+        await _arun_graph(
+            reversed(range(len(plan))),
+            (lambda _: ()) if concurrent_initialize else consumers.__getitem__,
+            initialize,
+        )
+        await _arun_graph(range(len(plan)), inputs.__getitem__, fetch)
+        return results[-1]
+
+    def _get(
+        self,
+        session_id: str | None,
+        concurrent_initialize: bool,
+        file: IO[bytes] | None = None,
+    ) -> list[bytes]:
+        """Run the pipeline, reusing and memoizing results if a `result_cache` is set.
+
+        Strategies are initialized from the end of the pipeline until memoized parts
+        of the pipeline are found, whose session updates are then added to the
+        session. The strategies after them are fetched, memoizing their results.
+
+        Parameters:
+            session_id: The ID of the session shared by the pipeline.
+            concurrent_initialize: Whether to call `initialize()` on all strategies
+                concurrently. See `get()`.
+            file: If given, the result of the last strategy is written to this file
+                with `fetch_stream()` and nothing is memoized.
+
+        Returns:
+            The output from `fetch()` of each strategy in the execution plan, or
+            empty bytes for strategies that were not run or whose output is neither
+            returned nor memoized, and hence not serialized.
+
+        """
+        plan = self.compile()
+        if session_id is None:
+            with trace_step("create_session", plan[-1]) as span:
+                session_id = span.session_id = plan[-1]._create_session()
+            try:
+                return self._get(session_id, concurrent_initialize, file)
+            finally:
+                plan[-1]._close_session(session_id)
+
+        _set_debug_session_id(plan, session_id)
+        inputs, consumers = self.inputs, self._consumers()
+
+        memoize = file is None and plan[-1].result_cache is not None
+        keys = self._result_keys() if memoize else [None] * len(plan)
+        memoized: dict[int, tuple[bytes, dict[str, Any]]] = {}
+        needed = set(self._outputs)
+        for index in reversed(range(len(plan))):
+            if index not in needed:
+                continue
+            result_cache, key = plan[index].result_cache, keys[index]
+            if result_cache is not None and key is not None:
+                memoized_result = result_cache.get(key)
+                if memoized_result is not None:
+                    needed.remove(index)
+                    memoized[index] = memoized_result
+                    continue
+            needed.update(inputs[index])
+
+        initialized: list[StrategyResult | None] = [None] * len(plan)
+        results: list[bytes] = [b""] * len(plan)
+        session_updates: list[dict[str, Any]] = [{} for _ in plan]
+        outputs = set(self._outputs)
+
+        def initialize(index: int) -> None:
+            with trace_step("initialize", plan[index], session_id) as span:
+                initialization = plan[index]._initialize_result(session_id)
+                initialized[index] = initialization
+                span.size = initialization.size
+
+        def fetch(index: int) -> None:
+            with trace_step("fetch", plan[index], session_id) as span:
+                if file is not None and index == len(plan) - 1:
+                    plan[index].fetch_stream(session_id, file)
+                    span.size = file.tell()
+                    return
+                result = plan[index]._fetch_result(session_id)
+                # Only the outputs of the pipeline and memoized results are
+                # serialized
+                if memoize or index in outputs:
+                    results[index] = result.content
+                span.size = result.size
+            if not memoize:
+                return
+
+            initialization = initialized[index]
+            session_update = (
+                dict(initialization.session_update) if initialization else {}
+            )
+            for input_ in inputs[index]:
+                session_update.update(session_updates[input_])
+            session_update.update(result.session_update)
+            session_updates[index] = session_update
+
+            result_cache, key = plan[index].result_cache, keys[index]
+            if result_cache is not None and key is not None:
+                result_cache[key] = (results[index], session_update)
+
+        _run_graph(
+            [index for index in reversed(range(len(plan))) if index in needed],
+            (
+                (lambda _: ())
+                if concurrent_initialize
+                else (
+                    lambda index: [
+                        consumer for consumer in consumers[index] if consumer in needed
+                    ]
+                )
+            ),
+            initialize,
+            concurrent=concurrent_initialize or not self._is_chain(),
+        )
+
+        for index, (result, session_update) in sorted(memoized.items()):
+            with trace_step("update_session", plan[index], session_id):
+                plan[index]._update_session(session_id, session_update)
+            results[index], session_updates[index] = result, session_update
+
+        _run_graph(
+            [index for index in range(len(plan)) if index in needed],
+            lambda index: [input_ for input_ in inputs[index] if input_ in needed],
+            fetch,
+            concurrent=not self._is_chain(),
+        )
+        return results
+
+    def _consumers(self) -> Inputs:
+        """For each strategy in the execution plan, the indices of the strategies it
+        is piped into."""
+        consumers: list[list[int]] = [[] for _ in self.compile()]
+        for index, inputs in enumerate(self.inputs):
+            for input_ in inputs:
+                consumers[input_].append(index)
+        return tuple(map(tuple, consumers))
+
+    def _is_chain(self) -> bool:
+        """Whether the pipeline is linear, i.e., has no branches."""
+        return all(
+            inputs == ((index - 1,) if index else ())
+            for index, inputs in enumerate(self.inputs)
+        )
+
+    def _result_keys(self) -> list[str | None]:
+        """Return the keys for memoizing the results of each part of the pipeline.
+
+        Returns:
+            For each strategy, a hash of the types and configurations of the
+            strategy and all strategies piped into it, or `None` if its result must
+            not be memoized.
+
+        """
+        keys: list[str | None] = []
+        for strategy, inputs in zip(self.compile(), self.inputs, strict=True):
+            input_keys = [keys[input_] for input_ in inputs]
+            if not strategy.memoize or strategy.config is None or None in input_keys:
+                keys.append(None)
+                continue
+            digest = hashlib.sha256()
+            for input_key in input_keys:
+                digest.update(f"{input_key}\n".encode())
+            digest.update(
+                f"{strategy.strategy_type}:"
+                f"{strategy.config.model_dump_json(exclude_unset=True)}\n".encode()
+            )
+            keys.append(digest.hexdigest())
+        return keys
+
+    def _substitute(self, strategies: Sequence[AbstractBaseStrategy]) -> Pipeline:
+        """Create a pipeline of the same shape with other strategies.
+
+        Parameters:
+            strategies: The strategies replacing those in the execution plan.
+
+        Returns:
+            A new pipeline.
+
+        """
+        return self._create(None, tuple(strategies), self.inputs, self._outputs)
+
+    def __rshift__(
+        self,
+        other: AbstractBaseStrategy | tuple[AbstractBaseStrategy, ...] | Pipeline,
+    ) -> Pipeline:
+        """Extend the pipeline using the `>>` symbol.
+
+        All last strategies of this pipeline are piped into `other`.
+
+        Parameters:
+            other: The strategy or pipeline this pipeline is "piping" into.
+                If it is a tuple of strategies, the pipeline fans out into each of
+                them.
+
+        Returns:
+            A new pipeline, extended by `other`.
+
+        """
+        if isinstance(other, Pipeline):
+            strategies = other.compile()
+            inputs: Inputs = tuple(
+                (
+                    tuple(input_ + self._length for input_ in other_inputs)
+                    if other_inputs
+                    else self._outputs
+                )
+                for other_inputs in other.inputs
+            )
+            outputs = tuple(output + self._length for output in other._outputs)
+        else:
+            strategies = other if isinstance(other, tuple) else (other,)
+            inputs = (self._outputs,) * len(strategies)
+            outputs = tuple(range(self._length, self._length + len(strategies)))
+
+        return self._create(self, strategies, inputs, outputs)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __iter__(self) -> Iterator[AbstractBaseStrategy]:
+        return iter(self.compile())
+
+    def __repr__(self) -> str:
+        names = [
+            f"{strategy.__class__.__name__}({strategy.strategy_id!r})"
+            for strategy in self.compile()
+        ]
+        if self._is_chain():
+            return f"{self.__class__.__name__}({' >> '.join(names)})"
+        return (
+            f"{self.__class__.__name__}("
+            + ", ".join(
+                f"{names[input_]} >> {names[index]}"
+                for index, inputs in enumerate(self.inputs)
+                for input_ in inputs
+            )
+            + ")"
+        )
+
+
+def _strategy_inputs(
+    strategy: AbstractBaseStrategy,
+) -> tuple[AbstractBaseStrategy, ...]:
+    """Return the strategies piped into a strategy with `>>`."""
+    return strategy.input_pipe.inputs if strategy.input_pipe else ()
+
+
+def _run_graph(
+    nodes: list[int],
+    dependencies: Callable[[int], Iterable[int]],
+    function: Callable[[int], None],
+    concurrent: bool,
+) -> None:
+    """Call a function for nodes once it has been called for their dependencies.
+
+    Parameters:
+        nodes: The nodes, sorted such that each node comes after its dependencies.
+        dependencies: A function returning the dependencies of a node.
+        function: The function to call for each node.
+        concurrent: Whether to call the function concurrently for nodes whose
+            dependencies are done, in at most `pipeline_max_workers` threads.
+            Otherwise, it is called in the order of `nodes`.
+
+    """
+    if not concurrent or len(nodes) < 2:
+        for node in nodes:
+            function(node)
+        return
+
+    from otelib.settings import Settings
+
+    settings = Settings()
+    max_workers = settings.pipeline_max_workers or settings.pool_maxsize
+
+    remaining = {node: set(dependencies(node)) for node in nodes}
+    dependants: dict[int, list[int]] = {node: [] for node in nodes}
+    for node, node_dependencies in remaining.items():
+        for dependency in node_dependencies:
+            dependants[dependency].append(node)
+
+    def submit(node: int) -> Future[None]:
+        # Run in a copy of the context, keeping track of the current tracing span
+        return executor.submit(contextvars.copy_context().run, function, node)
+
+    with ThreadPoolExecutor(max_workers=min(len(nodes), max_workers)) as executor:
+        running = {submit(node): node for node in nodes if not remaining[node]}
+        while running:
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                node = running.pop(future)
+                future.result()
+                for dependant in dependants[node]:
+                    remaining[dependant].discard(node)
+                    if not remaining[dependant]:
+                        running[submit(dependant)] = dependant
+
+
+async def _arun_graph(
+    nodes: Iterable[int],
+    dependencies: Callable[[int], Iterable[int]],
+    function: Callable[[int], Awaitable[None]],
+) -> None:
+    """Await a coroutine function for nodes once it is done for their dependencies.
+
+    Parameters:
+        nodes: The nodes, sorted such that each node comes after its dependencies.
+        dependencies: A function returning the dependencies of a node.
+        function: The coroutine function to await for each node.
+
+    """
+    import asyncio
+
+    tasks: dict[int, asyncio.Future[None]] = {}
+
+    async def run(node: int, node_dependencies: list[asyncio.Future[None]]) -> None:
+        await asyncio.gather(*node_dependencies)
+        await function(node)
+
+    for node in nodes:
+        tasks[node] = asyncio.ensure_future(
+            run(node, [tasks[dependency] for dependency in dependencies(node)])
+        )
+    await asyncio.gather(*tasks.values())
+
+
+def _set_debug_session_id(
+    strategies: tuple[AbstractBaseStrategy, ...], session_id: str
+) -> None:
+    """Store the session ID on all debugging strategies."""
+    for strategy in strategies:
+        if strategy.debug:
+            strategy._session_id = session_id
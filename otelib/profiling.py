@@ -0,0 +1,244 @@
+"""Profiling pipeline runs into a structured report.
+
+The steps of all pipelines run within `profile()` are collected into a `RunReport`,
+breaking down the time spent, bytes transferred, memoized results used, and retried
+requests per strategy, and finding the critical path of the run:
+
+```python
+from otelib.profiling import profile
+
+with profile() as report:
+    pipeline.get()
+
+print(report.table())
+report.to_json()
+```
+"""
+
+from __future__ import annotations
+
+import json
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import TYPE_CHECKING
+
+from otelib.tracing import add_hook, remove_hook
+
+if TYPE_CHECKING:  # pragma: no cover
+    from collections.abc import Iterator
+    from typing import Any
+
+    from otelib.tracing import Span
+
+# The steps of a run, besides the pipeline itself, that are not part of another step
+_RUN_STEPS = (
+    "create_session",
+    "update_session",
+    "run_pipeline",
+    "initialize",
+    "fetch",
+)
+
+# The steps accounted to strategies in the per-strategy breakdown
+_STRATEGY_STEPS = (*_RUN_STEPS, "serialize")
+
+# The columns of the per-strategy breakdown with their headers in `table()`
+_COLUMNS = {
+    "strategy_type": "type",
+    "strategy_id": "strategy",
+    "initialize": "initialize [s]",
+    "fetch": "fetch [s]",
+    "serialize": "serialize [s]",
+    "bytes": "bytes",
+    "cache_hits": "cache hits",
+    "retries": "retries",
+}
+
+_ACTIVE_REPORTS: ContextVar[tuple[RunReport, ...]] = ContextVar(
+    "otelib_reports", default=()
+)
+
+
+class RunReport:
+    """A report of the steps of the runs within `profile()`.
+
+    Attributes:
+        spans (list[Span]): The spans of all steps, in the order they ended.
+
+    """
+
+    def __init__(self) -> None:
+        self.spans: list[Span] = []
+
+    @property
+    def wall_time(self) -> float:
+        """The wall time in seconds from the start of the first step to the end of
+        the last one."""
+        if not self.spans:
+            return 0.0
+        return max(span.start + span.duration for span in self.spans) - min(
+            span.start for span in self.spans
+        )
+
+    @property
+    def strategies(self) -> list[dict[str, Any]]:
+        """The per-strategy breakdown, in the order the strategies were first run.
+
+        For each strategy, the total wall time in seconds of its `initialize`,
+        `fetch`, and `serialize` steps, the bytes of the output of its steps, the
+        number of memoized results used (`cache_hits`), and the number of retried
+        requests.
+        """
+        rows: dict[str, dict[str, Any]] = {}
+        for span in self.spans:
+            if not span.strategy_id or span.name not in _STRATEGY_STEPS:
+                continue
+            row = rows.setdefault(
+                span.strategy_id,
+                {
+                    "strategy_type": span.strategy_type,
+                    "strategy_id": span.strategy_id,
+                    "initialize": 0.0,
+                    "fetch": 0.0,
+                    "serialize": 0.0,
+                    "bytes": 0,
+                    "cache_hits": 0,
+                    "retries": 0,
+                },
+            )
+            if span.name in ("initialize", "fetch", "serialize"):
+                row[span.name] += span.duration
+            if span.name in ("initialize", "fetch"):
+                row["bytes"] += span.size or 0
+            if span.name == "update_session":
+                row["cache_hits"] += 1
+            row["retries"] += span.attributes.get("retries", 0)
+        return list(rows.values())
+
+    @property
+    def critical_path(self) -> list[Span]:
+        """The chain of steps that determined the wall time of the runs.
+
+        Starting from the step that ended last, each step is preceded by the step
+        that ended last before it started, i.e., the step it waited for.
+        """
+        steps = sorted(
+            (span for span in self.spans if _is_run_step(span)),
+            key=lambda span: span.start + span.duration,
+        )
+        path: list[Span] = []
+        while steps:
+            step = steps.pop()
+            path.append(step)
+            steps = [span for span in steps if span.start + span.duration <= step.start]
+        return path[::-1]
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the report as a JSON-serializable dictionary."""
+        return {
+            "wall_time": self.wall_time,
+            "retries": sum(span.attributes.get("retries", 0) for span in self.spans),
+            "strategies": self.strategies,
+            "critical_path": [
+                {
+                    "step": span.name,
+                    "strategy_type": span.strategy_type,
+                    "strategy_id": span.strategy_id,
+                    "duration": span.duration,
+                }
+                for span in self.critical_path
+            ],
+        }
+
+    def to_json(self, **kwargs: Any) -> str:
+        """Return the report as JSON.
+
+        Parameters:
+            kwargs: Keyword arguments for `json.dumps()`, e.g., `indent`.
+
+        Returns:
+            The JSON-serialized report of `to_dict()`.
+
+        """
+        return json.dumps(self.to_dict(), **kwargs)
+
+    def table(self) -> str:
+        """Return the per-strategy breakdown and critical path as a text table."""
+        rows = [
+            [
+                f"{value:.4f}" if isinstance(value, float) else str(value)
+                for value in row.values()
+            ]
+            for row in self.strategies
+        ]
+        widths = [
+            max([len(header), *(len(row[column]) for row in rows)])
+            for column, header in enumerate(_COLUMNS.values())
+        ]
+        lines = [
+            "  ".join(
+                header.ljust(width) if column < 2 else header.rjust(width)
+                for column, (header, width) in enumerate(
+                    zip(_COLUMNS.values(), widths, strict=True)
+                )
+            )
+        ]
+        lines.extend(
+            "  ".join(
+                value.ljust(width) if column < 2 else value.rjust(width)
+                for column, (value, width) in enumerate(zip(row, widths, strict=True))
+            )
+            for row in rows
+        )
+        lines.append("")
+        lines.append(f"Wall time: {self.wall_time:.4f} s")
+        lines.append("Critical path:")
+        lines.extend(
+            "  "
+            + " ".join(
+                part
+                for part in (span.name, span.strategy_id, f"{span.duration:.4f} s")
+                if part
+            )
+            for span in self.critical_path
+        )
+        return "\n".join(lines)
+
+    def _add(self, span: Span) -> None:
+        """Add the span of a step run within this report's `profile()`."""
+        if self in _ACTIVE_REPORTS.get():
+            self.spans.append(span)
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}(steps={len(self.spans)}, "
+            f"wall_time={self.wall_time!r})"
+        )
+
+
+@contextmanager
+def profile() -> Iterator[RunReport]:
+    """Profile the pipelines run within the context.
+
+    Only steps run in the current context are collected, including those run
+    concurrently by a pipeline started within it, but not those of other threads.
+
+    Yields:
+        The report, which is filled as the steps end.
+
+    """
+    report = RunReport()
+    token = _ACTIVE_REPORTS.set((*_ACTIVE_REPORTS.get(), report))
+    add_hook(report._add)
+    try:
+        yield report
+    finally:
+        remove_hook(report._add)
+        _ACTIVE_REPORTS.reset(token)
+
+
+def _is_run_step(span: Span) -> bool:
+    """Whether a span is a step of a run not part of another step."""
+    return span.name in _RUN_STEPS and (
+        span.parent is None or span.parent.name == "pipeline"
+    )
@@ -2,7 +2,8 @@
 
 from __future__ import annotations
 
-from typing import Annotated
+from pathlib import Path
+from typing import Annotated, Literal
 
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -19,3 +20,165 @@ class Settings(BaseSettings):
         tuple[float, float],
         Field(description="Tuple for URL connect and read timeouts in seconds."),
     ] = (3.0, 27.0)
+
+    pool_connections: Annotated[
+        int,
+        Field(
+            description="Number of host-specific connection pools to keep.",
+            ge=1,
+        ),
+    ] = 10
+
+    pool_maxsize: Annotated[
+        int,
+        Field(
+            description="Maximum number of connections to keep alive in each pool.",
+            ge=1,
+        ),
+    ] = 10
+
+    max_retries: Annotated[
+        int,
+        Field(
+            description=(
+                "Maximum number of retries for requests that fail to connect to the "
+                "OTEAPI Service, or, for requests with one of the `retry_methods`, "
+                "that fail to be read or are answered with one of the "
+                "`retry_statuses`."
+            ),
+            ge=0,
+        ),
+    ] = 0
+
+    retry_methods: Annotated[
+        frozenset[str],
+        Field(
+            description=(
+                "HTTP methods of the idempotent requests that may be sent again after "
+                "being received by the OTEAPI Service, e.g., fetching a strategy or "
+                "looking up a session. Other requests, e.g., creating or initializing "
+                "a strategy, are only retried if they fail to connect."
+            ),
+        ),
+    ] = frozenset({"GET", "HEAD", "OPTIONS", "PUT"})
+
+    retry_statuses: Annotated[
+        frozenset[int],
+        Field(
+            description=(
+                "Response status codes of transient errors to retry requests with one "
+                "of the `retry_methods` on. Responses with a `Retry-After` header and "
+                "the status code 413, 429, or 503 are always retried."
+            ),
+        ),
+    ] = frozenset({502, 503, 504})
+
+    retry_backoff_factor: Annotated[
+        float,
+        Field(
+            description=(
+                "Factor in seconds of the exponential backoff between retries, i.e., "
+                "retry number `n` waits `retry_backoff_factor * 2 ** (n - 1)` "
+                "seconds, unless the response has a `Retry-After` header."
+            ),
+            ge=0,
+        ),
+    ] = 0.5
+
+    retry_backoff_max: Annotated[
+        float,
+        Field(
+            description="Maximum backoff in seconds between retries.",
+            ge=0,
+        ),
+    ] = 30.0
+
+    retry_backoff_jitter: Annotated[
+        float,
+        Field(
+            description=(
+                "Maximum random time in seconds added to the backoff between retries, "
+                "spreading out retries from many clients."
+            ),
+            ge=0,
+        ),
+    ] = 0.5
+
+    keep_alive: Annotated[
+        bool,
+        Field(
+            description=(
+                "Whether to keep connections to the OTEAPI Service open for reuse "
+                "between requests."
+            ),
+        ),
+    ] = True
+
+    cache_dir: Annotated[
+        Path | None,
+        Field(
+            description=(
+                "Directory for on-disk caches, e.g., the index of discovered OTEAPI "
+                "plugin strategies for the Python backend. If not set, nothing is "
+                "cached on disk."
+            ),
+        ),
+    ] = None
+
+    stream_chunk_size: Annotated[
+        int,
+        Field(
+            description="Size in bytes of the chunks read when streaming a result.",
+            ge=1,
+        ),
+    ] = (
+        1024 * 1024
+    )
+
+    stream_spool_threshold: Annotated[
+        int,
+        Field(
+            description=(
+                "Size in bytes above which a streamed result is spilled from memory "
+                "to a temporary file."
+            ),
+            ge=0,
+        ),
+    ] = (
+        16 * 1024 * 1024
+    )
+
+    pipeline_endpoint: Annotated[
+        bool | None,
+        Field(
+            description=(
+                "Whether to run a complete pipeline in a single request to the "
+                "pipeline endpoint of the OTEAPI Service. If not set, the endpoint is "
+                "used if the OTEAPI Service advertises it, which is checked once per "
+                "URL."
+            ),
+        ),
+    ] = None
+
+    pipeline_max_workers: Annotated[
+        int | None,
+        Field(
+            description=(
+                "Maximum number of threads running the independent branches of a "
+                "pipeline concurrently. If not set, `pool_maxsize` is used, matching "
+                "the number of connections kept alive to the OTEAPI Service."
+            ),
+            ge=1,
+        ),
+    ] = None
+
+    json_codec: Annotated[
+        Literal["auto", "json", "orjson", "msgspec"],
+        Field(
+            description=(
+                "JSON codec for request and response bodies and session updates. "
+                "With `auto`, orjson or msgspec is used if installed, otherwise the "
+                "`json` module of the standard library."
+            ),
+        ),
+    ] = "auto"
@@ -0,0 +1,247 @@
+"""Timing and tracing hooks for the steps of running strategies.
+
+Every step of creating strategies and running pipelines, e.g., validating a
+configuration, creating a session, or initializing or fetching a strategy, is timed
+as a `Span`. Once a step ends, its span is passed to all hooks added with
+`add_hook()`:
+
+```python
+from otelib.tracing import add_hook
+
+
+def print_span(span):
+    print(f"{span.name} {span.strategy_id} {span.duration:.3f}s {span.size}B")
+
+
+add_hook(print_span)
+```
+
+The spans can also be emitted to OpenTelemetry with `enable_opentelemetry()`.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:  # pragma: no cover
+    from collections.abc import Callable, Iterator
+    from typing import Any
+
+    from otelib.backends.strategies import AbstractBaseStrategy
+
+    Hook = Callable[["Span"], None]
+
+_HOOKS: tuple[Hook, ...] = ()
+_HOOKS_LOCK = threading.Lock()
+
+# The OpenTelemetry tracer, if spans are emitted to OpenTelemetry
+_TRACER: Any = None
+
+# The offset of the performance counter from the time since the epoch, giving the
+# start of spans in seconds since the epoch, and their ends on the same clock
+_EPOCH_OFFSET = time.time() - time.perf_counter()
+
+_CURRENT_SPAN: ContextVar[Span | None] = ContextVar("otelib_span", default=None)
+
+
+class Span:
+    """A timed step of creating a strategy or running a pipeline.
+
+    Parameters:
+        name: The name of the step, e.g., `"initialize"` or `"fetch"`.
+        strategy: The strategy the step is run for.
+        session_id: The ID of the session the step is run in.
+
+    Attributes:
+        name (str): The name of the step. The steps reported by OTElib are:
+            `"pipeline"` (running a complete pipeline), `"create_session"`,
+            `"update_session"` (adding memoized session updates),
+            `"run_pipeline"` (running a pipeline in a single request),
+            `"create"`, `"validate"`, `"serialize"`, `"initialize"`, and
+            `"fetch"`.
+        strategy_type (str | None): The type of the strategy.
+        strategy_id (str | None): The ID of the strategy, as it is when the step
+            ends.
+        session_id (str | None): The ID of the session.
+        parent (Span | None): The span of the step this step is part of.
+        start (float): The time the step started, in seconds since the epoch.
+        duration (float): The wall time of the step in seconds.
+        size (int | None): The size in bytes of the payload of the step, e.g., the
+            output of `fetch()`.
+        error (BaseException | None): The exception raised by the step, if any.
+        attributes (dict[str, Any]): Other attributes of the step.
+
+    """
+
+    __slots__ = (
+        "_strategy",
+        "attributes",
+        "duration",
+        "error",
+        "name",
+        "parent",
+        "session_id",
+        "size",
+        "start",
+        "strategy_id",
+        "strategy_type",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        strategy: AbstractBaseStrategy | None = None,
+        session_id: str | None = None,
+    ) -> None:
+        self.name = name
+        self._strategy = strategy
+        self.strategy_type = str(strategy.strategy_type) if strategy else None
+        self.strategy_id = strategy.strategy_id if strategy else None
+        self.session_id = session_id
+        self.parent: Span | None = None
+        self.start = 0.0
+        self.duration = 0.0
+        self.size: int | None = None
+        self.error: BaseException | None = None
+        self.attributes: dict[str, Any] = {}
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}({self.name!r}, "
+            f"strategy_id={self.strategy_id!r}, session_id={self.session_id!r}, "
+            f"duration={self.duration!r}, size={self.size!r})"
+        )
+
+
+def add_hook(hook: Hook) -> None:
+    """Add a hook called with the `Span` of every step once it ends.
+
+    Hooks are called in the thread running the step, and exceptions raised by a
+    hook propagate to the caller of the step.
+
+    Parameters:
+        hook: A callable taking a `Span`.
+
+    """
+    global _HOOKS  # noqa: PLW0603
+    with _HOOKS_LOCK:
+        _HOOKS = (*_HOOKS, hook)
+
+
+def remove_hook(hook: Hook) -> None:
+    """Remove a hook added with `add_hook()`.
+
+    Parameters:
+        hook: The hook to remove.
+
+    """
+    global _HOOKS  # noqa: PLW0603
+    with _HOOKS_LOCK:
+        hooks = list(_HOOKS)
+        hooks.remove(hook)
+        _HOOKS = tuple(hooks)
+
+
+def current_span() -> Span | None:
+    """Return the span of the step currently running, if any."""
+    return _CURRENT_SPAN.get()
+
+
+def enable_opentelemetry(tracer: Any = None) -> bool:
+    """Emit the spans of all steps to OpenTelemetry.
+
+    This requires the `opentelemetry-api` package. If it is not installed, nothing
+    is emitted.
+
+    Parameters:
+        tracer: The OpenTelemetry tracer to start spans with. If not given, the
+            tracer of the global tracer provider is used.
+
+    Returns:
+        Whether spans are emitted to OpenTelemetry.
+
+    """
+    global _TRACER  # noqa: PLW0603
+    if tracer is None:
+        try:
+            from opentelemetry import trace
+        except ImportError:
+            return False
+        tracer = trace.get_tracer("otelib")
+    _TRACER = tracer
+    return True
+
+
+def disable_opentelemetry() -> None:
+    """Stop emitting the spans of all steps to OpenTelemetry."""
+    global _TRACER  # noqa: PLW0603
+    _TRACER = None
+
+
+@contextmanager
+def trace_step(
+    name: str,
+    strategy: AbstractBaseStrategy | None = None,
+    session_id: str | None = None,
+) -> Iterator[Span]:
+    """Time a step, reporting its `Span` to the hooks once it ends.
+
+    The yielded span may be updated during the step, e.g., with the size of its
+    payload.
+
+    Parameters:
+        name: The name of the step.
+        strategy: The strategy the step is run for.
+        session_id: The ID of the session the step is run in.
+
+    Yields:
+        The span of the step.
+
+    """
+    span = Span(name, strategy, session_id)
+    span.parent = _CURRENT_SPAN.get()
+    token = _CURRENT_SPAN.set(span)
+    tracer = _TRACER
+    otel_span = (
+        tracer.start_as_current_span(f"otelib.{name}") if tracer is not None else None
+    )
+    start = time.perf_counter()
+    span.start = _EPOCH_OFFSET + start
+    try:
+        if otel_span is None:
+            yield span
+        else:
+            with otel_span as current:
+                try:
+                    yield span
+                finally:
+                    current.set_attributes(_otel_attributes(span))
+    except BaseException as exc:
+        span.error = exc
+        raise
+    finally:
+        span.duration = time.perf_counter() - start
+        _CURRENT_SPAN.reset(token)
+        if span._strategy is not None:
+            span.strategy_id = span._strategy.strategy_id
+            span._strategy = None
+        for hook in _HOOKS:
+            hook(span)
+
+
+def _otel_attributes(span: Span) -> dict[str, Any]:
+    """Return the OpenTelemetry attributes of a span."""
+    attributes = {
+        "otelib.strategy_type": span.strategy_type,
+        "otelib.strategy_id": (
+            span._strategy.strategy_id if span._strategy else span.strategy_id
+        ),
+        "otelib.session_id": span.session_id,
+        "otelib.size": span.size,
+        **{f"otelib.{key}": value for key, value in span.attributes.items()},
+    }
+    return {key: value for key, value in attributes.items() if value is not None}
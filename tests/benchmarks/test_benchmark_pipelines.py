@@ -0,0 +1,196 @@
+"""Benchmarks of the overhead OTElib adds to creating and running pipelines.
+
+The benchmarks cover creating a client, creating strategies, composing pipelines
+with `>>`, and running pipelines of 1 to 100 steps with `get()`, for both the
+Python backend and the services backend.
+All pipelines consist of a no-op filter strategy, `NoOpFilter`, registered as a
+local plugin strategy, so only the overhead of OTElib is measured.
+The services backend runs against a local stand-in OTEAPI Service, see
+`ote_server.py`, whose latency per request is set in milliseconds by the
+`OTELIB_BENCHMARK_LATENCY` environment variable (default: 0).
+
+In regular test runs, each benchmark is run once as a test, since the benchmarks
+are disabled by the pytest configuration. To run the benchmarks, storing the
+results in the `.benchmarks` directory, and to compare with the previous results:
+
+```shell
+pytest tests/benchmarks --benchmark-enable --benchmark-only --no-cov \\
+    --benchmark-autosave --benchmark-compare --benchmark-compare-fail=mean:10%
+```
+
+The CI workflow stores the results of the main branch as the baseline, and
+compares the results of every other run with it.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+from oteapi.models import AttrDict, FilterConfig
+from pydantic.dataclasses import dataclass
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from ote_server import OTEServer
+    from pytest_benchmark.fixture import BenchmarkFixture
+
+    from otelib import OTEClient
+    from otelib.backends.strategies import AbstractBaseStrategy
+
+STEPS = [1, 10, 100]
+
+FILTER_CONFIG = {"filterType": "filter/noop"}
+
+
+@dataclass
+class NoOpFilter:
+    """A filter strategy doing nothing, with an empty session update."""
+
+    filter_config: FilterConfig
+
+    def initialize(self) -> AttrDict:
+        """Initialize strategy."""
+        return AttrDict()
+
+    def get(self) -> AttrDict:
+        """Execute strategy."""
+        return AttrDict()
+
+
+@pytest.fixture(autouse=True)
+def _noop_filter() -> Iterator[None]:
+    """Register `NoOpFilter` as the `filter/noop` plugin strategy."""
+    from importlib.metadata import EntryPoint
+
+    from oteapi.plugins.entry_points import EntryPointStrategy, StrategyType
+    from oteapi.plugins.factories import StrategyFactory
+
+    from otelib.backends.python.plugins import load_plugins
+
+    load_plugins()
+    collection = StrategyFactory.strategy_create_func[StrategyType.FILTER]
+    strategy = EntryPointStrategy(
+        EntryPoint(
+            name="otelib_benchmarks.filter/noop",
+            value=f"{__name__}:NoOpFilter",
+            group="oteapi.filter",
+        )
+    )
+    collection.exclusive_add(strategy)
+    yield
+    collection.remove(strategy)
+
+
+@pytest.fixture
+def benchmark_server(ote_server: OTEServer) -> OTEServer:
+    """A local stand-in OTEAPI Service with the configured latency."""
+    import os
+
+    ote_server.latency = float(os.getenv("OTELIB_BENCHMARK_LATENCY", "0")) / 1000
+    return ote_server
+
+
+@pytest.fixture(params=["python", "services"])
+def backend_client(
+    request: pytest.FixtureRequest, benchmark_server: OTEServer
+) -> Iterator[OTEClient]:
+    """A client for each backend."""
+    with create_client(request.param, benchmark_server) as client:
+        yield client
+
+
+def create_client(backend: str, server: OTEServer) -> OTEClient:
+    """Create a client for a backend."""
+    from otelib import OTEClient
+
+    if backend == "python":
+        return OTEClient("python", cache={}, teardown_sessions=True)
+    return OTEClient(server.url)
+
+
+def create_filters(client: OTEClient, steps: int) -> list[AbstractBaseStrategy]:
+    """Create a filter for each step of a pipeline."""
+    return client.create_many([("filter", FILTER_CONFIG)] * steps)
+
+
+def compose(strategies: list[AbstractBaseStrategy]) -> AbstractBaseStrategy:
+    """Concatenate strategies into a pipeline with `>>`, returning the last one."""
+    last = strategies[0]
+    for strategy in strategies[1:]:
+        last = last >> strategy
+    return last
+
+
+@pytest.mark.benchmark(group="client")
+@pytest.mark.parametrize("backend", ["python", "services"])
+def test_client(
+    benchmark: BenchmarkFixture, benchmark_server: OTEServer, backend: str
+) -> None:
+    """Benchmark creating (and closing) a client."""
+
+    def create_and_close() -> None:
+        create_client(backend, benchmark_server).close()
+
+    benchmark(create_and_close)
+
+
+@pytest.mark.benchmark(group="create")
+def test_create_strategy(
+    benchmark: BenchmarkFixture, backend_client: OTEClient
+) -> None:
+    """Benchmark creating a strategy."""
+    strategy = benchmark(backend_client.create_filter, **FILTER_CONFIG)
+    assert strategy.strategy_id
+
+
+@pytest.mark.benchmark(group="compose")
+@pytest.mark.parametrize("steps", STEPS)
+@pytest.mark.parametrize("kind", ["strategies", "pipeline"])
+def test_compose(benchmark: BenchmarkFixture, kind: str, steps: int) -> None:
+    """Benchmark composing a pipeline with `>>` and compiling its execution plan,
+    both by concatenating strategies and by extending a `Pipeline`."""
+    from otelib import OTEClient, Pipeline
+
+    strategies = create_filters(OTEClient("python", cache={}), steps)
+
+    def compose_and_compile() -> Pipeline:
+        if kind == "pipeline":
+            pipeline = Pipeline(strategies[0])
+            for strategy in strategies[1:]:
+                pipeline = pipeline >> strategy
+        else:
+            # Concatenating strategies that are already piped together would
+            # connect the pipeline to itself
+            for strategy in strategies:
+                strategy.input_pipe = None
+            pipeline = Pipeline.from_strategy(compose(strategies))
+        pipeline.compile()
+        return pipeline
+
+    assert len(benchmark(compose_and_compile)) == steps
+
+
+@pytest.mark.benchmark(group="get")
+@pytest.mark.parametrize("steps", STEPS)
+@pytest.mark.parametrize(
+    ("backend", "pipeline_endpoint"),
+    [("python", False), ("services", False), ("services", True)],
+    ids=["python", "services-steps", "services-single"],
+)
+def test_get(
+    benchmark: BenchmarkFixture,
+    benchmark_server: OTEServer,
+    backend: str,
+    pipeline_endpoint: bool,
+    steps: int,
+) -> None:
+    """Benchmark running a pipeline, for the services backend both step by step and
+    in a single request to the pipeline endpoint."""
+    import json
+
+    benchmark_server.pipeline_endpoint = pipeline_endpoint
+    with create_client(backend, benchmark_server) as client:
+        pipeline = compose(create_filters(client, steps))
+        assert json.loads(benchmark(pipeline.get)) == {}
@@ -18,8 +18,10 @@ else:
 import pytest
 
 if TYPE_CHECKING:
+    from collections.abc import Iterator
     from typing import Any, Literal, Protocol
 
+    from ote_server import OTEServer
     from requests_mock import Mocker
     from utils import ResourceType
 
@@ -180,9 +182,9 @@ def mock_session(
     ids: TestResourceIds,
     server_url: str,
 ) -> None:
-    """Mock `POST /session`.
+    """Mock `POST /session` and `GET /pipeline`.
 
-    This is called in `AbstractStrategy.get()`.
+    These are called in `AbstractStrategy.get()`.
     """
     from otelib.settings import Settings
 
@@ -191,11 +193,28 @@ def mock_session(
             f"{client.url}{Settings().prefix}/session",
             json={"session_id": ids("session")},
         )
+        # The pipeline endpoint is not available, so pipelines are run step by step
+        requests_mock.get(f"{client.url}{Settings().prefix}/pipeline", status_code=404)
     else:
         # Make sure the requests are done for real.
         requests_mock.real_http = True
 
 
+@pytest.fixture
+def ote_server() -> Iterator[OTEServer]:
+    """Run a local stand-in for an OTEAPI Service, serving the pipeline endpoint."""
+    import threading
+
+    from ote_server import OTEServer
+
+    server = OTEServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
 @pytest.fixture
 def mock_ote_response(requests_mock: Mocker, server_url: str) -> OTEResponse:
     """Provide a function to mock OTE services responses."""
@@ -0,0 +1,213 @@
+"""A local stand-in for an OTEAPI Service, running strategies with the Python backend.
+
+It serves the strategy and session endpoints used by the services backend, as well
+as a pipeline endpoint running a complete pipeline in a single request and creating
+many strategies in a single request.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import TYPE_CHECKING
+from urllib.parse import parse_qs, urlsplit
+from uuid import uuid4
+
+if TYPE_CHECKING:
+    from typing import Any
+
+    from otelib.backends.python.base import BasePythonStrategy
+
+
+class OTEServer(ThreadingHTTPServer):
+    """A local stand-in for an OTEAPI Service.
+
+    Requests are handled one at a time, each in its own thread.
+
+    Parameters:
+        pipeline_endpoint: Whether to serve the pipeline endpoint.
+        latency: The time in seconds to wait before handling each request,
+            simulating network latency.
+
+    Attributes:
+        requests (list[str]): The method and path (without the prefix) of each
+            request received, e.g., `"POST /session"`.
+        failures (dict[str, list[tuple[int, dict[str, str]]]]): Error responses to
+            answer the next requests with a given method with, as the status code and
+            the headers, see `fail()`.
+
+    """
+
+    daemon_threads = True
+
+    def __init__(self, pipeline_endpoint: bool = True, latency: float = 0.0) -> None:
+        super().__init__(("127.0.0.1", 0), _RequestHandler)
+
+        from otelib.settings import Settings
+
+        self.prefix = Settings().prefix
+        self.pipeline_endpoint = pipeline_endpoint
+        self.latency = latency
+        self.requests: list[str] = []
+        self.failures: dict[str, list[tuple[int, dict[str, str]]]] = {}
+
+        self._cache: dict[str, Any] = {}
+        self._strategies: dict[str, BasePythonStrategy] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        """The base URL of the server, without the prefix."""
+        return f"http://127.0.0.1:{self.server_port}"
+
+    def fail(
+        self,
+        method: str,
+        status: int,
+        times: int = 1,
+        headers: dict[str, str] | None = None,
+    ) -> None:
+        """Answer the next `times` requests with the given method with an error."""
+        self.failures.setdefault(method, []).extend([(status, headers or {})] * times)
+
+    def dispatch(
+        self,
+        method: str,
+        path: list[str],
+        session_id: str | None,
+        body: dict[str, Any] | None,
+    ) -> tuple[int, Any]:
+        """Handle a request, returning the status code and the content to return."""
+        if path == ["pipeline"]:
+            if not self.pipeline_endpoint:
+                return 404, {"detail": "Not Found"}
+            if method == "GET":
+                return 200, {"version": 1, "batch_create": True}
+            return 200, self._run_pipeline(body or {})
+
+        if path == ["pipeline", "strategies"] and method == "POST":
+            if not self.pipeline_endpoint:
+                return 404, {"detail": "Not Found"}
+            return 200, {
+                "strategy_ids": [
+                    self._create_strategy(
+                        strategy["strategy_type"],
+                        strategy["config"],
+                        strategy.get("session_id"),
+                    )
+                    for strategy in (body or {})["strategies"]
+                ]
+            }
+
+        if path[0] == "session":
+            if method == "POST":
+                return 200, {"session_id": self._create_session()}
+            if method == "PUT":
+                self._cache[path[1]] = {**self._cache[path[1]], **(body or {})}
+            return 200, dict(self._cache[path[1]])
+
+        if len(path) == 1 and method == "POST":
+            return 200, {
+                f"{path[0]}_id": self._create_strategy(path[0], body or {}, session_id)
+            }
+
+        strategy = self._strategies[path[1]]
+        if path[2:] == ["initialize"] and method == "POST":
+            return 200, json.loads(strategy.initialize(session_id))
+        if len(path) == 2 and method == "GET":
+            return 200, json.loads(strategy.fetch(session_id))
+        return 404, {"detail": "Not Found"}
+
+    def _create_strategy(
+        self, strategy_type: str, config: dict[str, Any], session_id: str | None
+    ) -> str:
+        """Create a strategy, returning its ID."""
+        from otelib.backends.factories import strategy_factory
+
+        strategy = strategy_factory("python", strategy_type)(
+            "python", cache=self._cache
+        )
+        strategy.create(**config, session_id=session_id)
+        self._strategies[strategy.strategy_id] = strategy
+        return strategy.strategy_id
+
+    def _create_session(self) -> str:
+        session_id = f"session-{uuid4()}"
+        self._cache[session_id] = {}
+        return session_id
+
+    def _run_pipeline(self, body: dict[str, Any]) -> dict[str, Any]:
+        """Run a pipeline of created strategies, like the pipeline endpoint."""
+        from otelib.pipeline import Pipeline
+
+        pipeline = Pipeline._create(
+            None,
+            tuple(
+                self._strategies[strategy["strategy_id"]]
+                for strategy in body["strategies"]
+            ),
+            tuple(tuple(inputs) for inputs in body["inputs"]),
+            tuple(body["outputs"]),
+        )
+        session_id = body.get("session_id") or self._create_session()
+        outputs = pipeline.get_outputs(
+            session_id, body.get("concurrent_initialize", False)
+        )
+        return {
+            "session_id": session_id,
+            "outputs": [json.loads(output) for output in outputs],
+        }
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    """Request handler dispatching to `OTEServer.dispatch()`."""
+
+    server: OTEServer
+
+    def do_GET(self) -> None:
+        self._handle("GET")
+
+    def do_POST(self) -> None:
+        self._handle("POST")
+
+    def do_PUT(self) -> None:
+        self._handle("PUT")
+
+    def log_message(self, format: str, *args: Any) -> None:
+        """Do not log requests."""
+
+    def _handle(self, method: str) -> None:
+        url = urlsplit(self.path)
+        session_id = parse_qs(url.query).get("session_id", [None])[0]
+        length = int(self.headers.get("Content-Length") or 0)
+        body = json.loads(self.rfile.read(length)) if length else None
+
+        path = url.path.removeprefix(self.server.prefix).strip("/").split("/")
+        self.server.requests.append(f"{method} /{'/'.join(path)}")
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        if self.server.failures.get(method):
+            status, headers = self.server.failures[method].pop(0)
+            self._respond(status, {"detail": "Service Unavailable"}, headers)
+            return
+
+        try:
+            with self.server._lock:
+                status, content = self.server.dispatch(method, path, session_id, body)
+        except Exception as exc:  # noqa: BLE001
+            status, content = 500, {"detail": repr(exc)}
+        self._respond(status, content)
+
+    def _respond(
+        self, status: int, content: Any, headers: dict[str, str] | None = None
+    ) -> None:
+        data = json.dumps(content).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
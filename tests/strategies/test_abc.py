@@ -201,6 +201,9 @@ def test_services_get_fails(
         },
     )
 
+    # Checking for the pipeline endpoint
+    requests_mock.get(f"{wrong_url}{Settings().prefix}/pipeline", status_code=404)
+
     # Creating a session
     requests_mock.post(
         f"{wrong_url}{Settings().prefix}/session",
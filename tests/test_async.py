@@ -0,0 +1,141 @@
+"""Test the asynchronous API."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+from utils import strategy_create_kwargs
+
+if TYPE_CHECKING:
+    from .conftest import Testdata, TestResourceIds
+
+
+def test_services_aget_pipeline(
+    ids: TestResourceIds, testdata: Testdata, server_url: str
+) -> None:
+    """Test an asynchronously created services pipeline is run with `aget()`."""
+    import asyncio
+    import json
+
+    import httpx
+
+    from otelib.client import OTEClient
+    from otelib.settings import Settings
+
+    prefix = Settings().prefix
+    requested: list[tuple[str, str]] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        """Mock the OTEAPI Service endpoints."""
+        path = request.url.path[len(prefix) :]
+        requested.append((request.method, path))
+
+        if path == "/session":
+            return httpx.Response(200, json={"session_id": ids("session")})
+        if request.method == "POST" and path == "/dataresource":
+            return httpx.Response(200, json={"resource_id": "x"})
+        if request.method == "POST" and path == "/filter":
+            return httpx.Response(200, json={"filter_id": "x"})
+        if path.endswith("/initialize"):
+            assert request.url.params["session_id"] == ids("session")
+            return httpx.Response(200, json={})
+        assert request.url.params["session_id"] == ids("session")
+        return httpx.Response(200, json=testdata(path.split("/")[1]))
+
+    async def run_pipeline() -> bytes:
+        async with OTEClient(server_url) as client:
+            client._impl.async_http_client = httpx.AsyncClient(
+                transport=httpx.MockTransport(handler)
+            )
+            create_kwargs = dict(strategy_create_kwargs())
+            data_resource, filter_ = await asyncio.gather(
+                client.acreate_dataresource(**create_kwargs["dataresource"]),
+                client.acreate_filter(**create_kwargs["filter"]),
+            )
+            assert data_resource.strategy_id == filter_.strategy_id == "x"
+            return await (filter_ >> data_resource).aget()
+
+    content = asyncio.run(run_pipeline())
+
+    assert json.loads(content) == testdata("dataresource")
+    assert requested[2:] == [
+        ("POST", "/session"),
+        ("POST", "/dataresource/x/initialize"),
+        ("POST", "/filter/x/initialize"),
+        ("GET", "/filter/x"),
+        ("GET", "/dataresource/x"),
+    ]
+
+
+def test_services_aget_fails(server_url: str) -> None:
+    """Check `aget()` raises `ApiError` upon request failure."""
+    import asyncio
+
+    import httpx
+
+    from otelib.backends.services import Filter
+    from otelib.exceptions import ApiError
+
+    strategy = Filter(
+        server_url,
+        async_http_client=httpx.AsyncClient(
+            transport=httpx.MockTransport(
+                lambda request: httpx.Response(  # noqa: ARG005
+                    500, content=b"Internal Server Error"
+                )
+            )
+        ),
+    )
+    strategy.strategy_id = "filter-test"
+
+    with pytest.raises(ApiError, match=r"^ApiError: status=500 Cannot create session"):
+        asyncio.run(strategy.aget())
+
+    with pytest.raises(ApiError, match=r"^ApiError: status=500 Cannot initialize"):
+        asyncio.run(strategy.aget("session-test"))
+
+
+def test_services_shared_async_http_client(server_url: str) -> None:
+    """Test strategies created synchronously share the client's asynchronous HTTP
+    client, which is closed with the client."""
+    import asyncio
+
+    from otelib.backends.services import DataResource, Filter
+    from otelib.client import OTEClient
+
+    client = OTEClient(server_url)
+    # Strategies are created before the asynchronous HTTP client is
+    data_resource = client._impl._new_strategy(DataResource)
+    filter_ = client._impl._new_strategy(Filter)
+    assert client._impl._async_http_client is None
+
+    async_http_client = filter_.async_http_client
+    assert async_http_client is client._impl.async_http_client
+    assert data_resource.async_http_client is async_http_client
+
+    asyncio.run(client.aclose())
+    assert async_http_client.is_closed
+
+
+def test_python_aget() -> None:
+    """Test the Python backend runs asynchronously through worker threads."""
+    import asyncio
+    import json
+
+    from oteapi.plugins import load_strategies
+
+    from otelib.client import OTEClient
+
+    load_strategies()
+
+    async def run_pipeline() -> tuple[bytes, bytes]:
+        client = OTEClient("python")
+        client._impl.clear_cache()
+        filter_ = await client.acreate_filter(
+            **dict(strategy_create_kwargs())["filter"]
+        )
+        return await asyncio.gather(filter_.aget(), filter_.aget())
+
+    for content in asyncio.run(run_pipeline()):
+        assert json.loads(content) == {}
@@ -0,0 +1,319 @@
+"""Test the `otelib.cache` module."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def test_lru_eviction() -> None:
+    """Test the least recently used entries are evicted beyond `max_entries`."""
+    from otelib.cache import LRUCache
+
+    cache = LRUCache(max_entries=2)
+    cache["a"] = 1
+    cache["b"] = 2
+
+    # Using "a" makes "b" the least recently used entry
+    assert cache["a"] == 1
+    cache["c"] = 3
+
+    assert "b" not in cache
+    assert dict(cache) == {"a": 1, "c": 3}
+    assert cache.evictions == 1
+
+    with pytest.raises(KeyError):
+        cache["b"]
+    assert cache.stats == {
+        "hits": 3,
+        "misses": 1,
+        "evictions": 1,
+        "entries": 2,
+        "bytes": cache.total_bytes,
+    }
+
+
+def test_max_bytes() -> None:
+    """Test entries are evicted beyond `max_bytes`, sizing re-set entries anew."""
+    from otelib.cache import LRUCache
+
+    cache = LRUCache(max_bytes=100, sizeof=len)
+    cache["a"] = "x" * 40
+    cache["b"] = "x" * 40
+    assert cache.total_bytes == 80
+
+    cache["a"] = "x" * 50
+    assert cache.total_bytes == 90
+    assert set(cache) == {"a", "b"}
+
+    cache["c"] = "x" * 20
+    assert set(cache) == {"a", "c"}
+    assert cache.total_bytes == 70
+
+    # An entry larger than the cache itself is not kept
+    cache["d"] = "x" * 200
+    assert not cache
+    assert cache.total_bytes == 0
+
+
+def test_ttl(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test entries expire `ttl` seconds after they were set."""
+    import time
+
+    from otelib.cache import LRUCache
+
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now)
+
+    cache = LRUCache(ttl=10)
+    cache["a"] = 1
+
+    now += 5
+    cache["b"] = 2
+    assert cache["a"] == 1
+
+    now += 6
+    assert "a" not in cache
+    assert cache["b"] == 2
+    assert cache.evictions == 1
+
+    now += 10
+    assert len(cache) == 0
+    assert cache.evictions == 2
+
+
+def test_pinned_entries(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test pinned entries are neither evicted nor expire until unpinned."""
+    import time
+
+    from otelib.cache import LRUCache
+
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now)
+
+    cache = LRUCache(max_entries=2, ttl=10)
+    cache.pin("a")
+    cache["a"] = 1
+    cache["b"] = 2
+    cache["c"] = 3
+    assert dict(cache) == {"a": 1, "c": 3}
+
+    # The cache may exceed its limits while only pinned entries are left
+    cache.pin("c")
+    cache["d"] = 4
+    assert dict(cache) == {"a": 1, "c": 3}
+
+    now += 20
+    assert cache["a"] == 1
+    cache.unpin("a")
+    assert "a" not in cache
+    assert dict(cache) == {"c": 3}
+
+
+@pytest.mark.parametrize("teardown_sessions", [True, False])
+def test_python_backend_bounded_cache(teardown_sessions: bool) -> None:
+    """Test a tightly bounded cache does not evict the session of a running
+    pipeline."""
+    import json
+
+    from oteapi.plugins import load_strategies
+    from utils import strategy_create_kwargs
+
+    from otelib import OTEClient
+    from otelib.cache import LRUCache
+
+    load_strategies()
+
+    cache = LRUCache(max_bytes=600)
+    client = OTEClient("python", cache=cache, teardown_sessions=teardown_sessions)
+    create_kwargs = dict(strategy_create_kwargs())
+    mapping = client.create_mapping(**create_kwargs["mapping"])
+    filter_ = client.create_filter(**create_kwargs["filter"])
+
+    pipeline = mapping >> filter_
+    for _ in range(3):
+        assert json.loads(pipeline.get()) == {}
+    assert cache.total_bytes <= 600
+
+
+def test_python_backend_cache() -> None:
+    """Test a custom cache with session teardown for the Python backend."""
+    import json
+
+    from oteapi.plugins import load_strategies
+    from utils import strategy_create_kwargs
+
+    from otelib import OTEClient
+    from otelib.cache import LRUCache
+
+    load_strategies()
+
+    cache = LRUCache(max_entries=10)
+    client = OTEClient("python", cache=cache, teardown_sessions=True)
+
+    filter_ = client.create_filter(**dict(strategy_create_kwargs())["filter"])
+    assert not cache
+
+    for _ in range(3):
+        assert json.loads(filter_.get()) == {}
+
+    # The sessions are removed once each `get()` has completed
+    assert not cache
+    assert cache.hits
+    assert not cache.evictions
+
+    # Sessions given to `get()` are not removed
+    session_id = filter_._create_session()
+    filter_.get(session_id)
+    assert cache[session_id] == {"sqlquery": "DROP TABLE myTable;"}
+
+
+def _set_disk_cache_entries(path: Path, worker: int) -> None:
+    """Set entries in a disk cache from a separate process."""
+    from otelib.cache import DiskCache
+
+    cache = DiskCache(path)
+    for number in range(20):
+        cache[f"{worker}-{number}"] = {"worker": worker, "number": number}
+        assert cache[f"{worker}-{number}"]["number"] == number
+
+
+def test_disk_cache(tmp_path: Path) -> None:
+    """Test a disk cache persists entries, evicting the least recently used."""
+    from otelib.cache import DiskCache
+
+    cache = DiskCache(tmp_path / "cache.sqlite", max_bytes=1000)
+    cache["a"] = b"x" * 400
+    cache["b"] = b"y" * 400
+    assert "a" in cache
+
+    # Using "a" makes "b" the least recently used entry
+    assert cache["a"] == b"x" * 400
+    cache["c"] = {"session": [1, 2, 3], "data": "z" * 300}
+
+    assert "b" not in cache
+    assert sorted(cache) == ["a", "c"]
+    assert cache.evictions == 1
+    assert cache.total_bytes <= 1000
+
+    with pytest.raises(KeyError):
+        cache["b"]
+    with pytest.raises(KeyError):
+        del cache["b"]
+
+    # The entries persist for other instances, e.g., in other processes
+    other_cache = DiskCache(tmp_path / "cache.sqlite")
+    assert other_cache["c"] == {"session": [1, 2, 3], "data": "z" * 300}
+    del other_cache["c"]
+    assert len(cache) == 1
+
+    cache.clear()
+    assert not other_cache
+    assert cache.stats == {
+        "hits": 1,
+        "misses": 1,
+        "evictions": 1,
+        "entries": 0,
+        "bytes": 0,
+    }
+
+
+def test_disk_cache_processes(tmp_path: Path) -> None:
+    """Test a disk cache with concurrent writers in separate processes."""
+    from concurrent.futures import ProcessPoolExecutor
+
+    from otelib.cache import DiskCache
+
+    path = tmp_path / "cache.sqlite"
+    cache = DiskCache(path)
+
+    with ProcessPoolExecutor(max_workers=4) as executor:
+        list(executor.map(_set_disk_cache_entries, [path] * 4, range(4)))
+
+    assert len(cache) == 4 * 20
+    assert cache["3-19"] == {"worker": 3, "number": 19}
+    assert cache.total_bytes == sum(
+        len(value)
+        for (value,) in cache._connection().execute("SELECT value FROM entries")
+    )
+
+
+def test_disk_cache_reads(tmp_path: Path) -> None:
+    """Test reading a disk cache does not write to the database, and the times
+    entries were used at are stored in batches."""
+    import pickle
+
+    from otelib.cache import DiskCache
+
+    cache = DiskCache(tmp_path / "cache.sqlite", max_bytes=1000)
+    cache.access_batch_size = 2
+    cache["a"] = b"x" * 400
+    cache["b"] = b"y" * 400
+    # Replacing an entry updates the total size
+    cache["b"] = b"y" * 300
+    assert (
+        cache.total_bytes
+        == cache.stats["bytes"]
+        == sum(
+            len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+            for value in (b"x" * 400, b"y" * 300)
+        )
+    )
+
+    changes = cache._connection().total_changes
+    assert cache["a"] == b"x" * 400
+    assert cache["a"] == b"x" * 400
+    assert cache._connection().total_changes == changes
+
+    # Using a second entry stores the batch
+    assert cache["b"] == b"y" * 300
+    assert cache._connection().total_changes == changes + 2
+
+    # Closing the cache stores the times of the pending reads
+    assert cache["b"] == b"y" * 300
+    cache.close()
+    assert not cache._accessed
+
+
+def test_python_backend_disk_cache(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test the Python backend reusing results memoized by another process."""
+    import json
+
+    from oteapi.plugins import load_strategies
+    from utils import strategy_create_kwargs
+
+    from otelib import OTEClient
+    from otelib.backends.python.filter import Filter
+    from otelib.cache import DiskCache
+
+    load_strategies()
+    monkeypatch.setenv("OTEAPI_CACHE_DIR", str(tmp_path))
+
+    initializations = []
+    original_initialize = Filter.initialize
+
+    def initialize(self, session_id: str) -> bytes:
+        initializations.append(session_id)
+        return original_initialize(self, session_id)
+
+    monkeypatch.setattr(Filter, "initialize", initialize)
+
+    # Each client represents a separate process with its own cache connections
+    for _ in range(2):
+        client = OTEClient("python", cache=DiskCache(), result_cache=DiskCache())
+        filter_ = client.create_filter(**dict(strategy_create_kwargs())["filter"])
+        assert json.loads(filter_.get()) == {}
+
+    assert len(initializations) == 1
+    sessions = [key for key in DiskCache() if key.startswith("session-")]
+    assert len(sessions) == 2
+    assert all(
+        DiskCache()[session] == {"sqlquery": "DROP TABLE myTable;"}
+        for session in sessions
+    )
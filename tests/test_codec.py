@@ -0,0 +1,118 @@
+"""Test the JSON codecs."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+from utils import strategy_create_kwargs
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from ote_server import OTEServer
+
+
+@pytest.fixture
+def _clear_codecs() -> Iterator[None]:
+    """Create the codecs anew, e.g., after hiding an installed codec package."""
+    from otelib.codec import _load_codec
+
+    _load_codec.cache_clear()
+    yield
+    _load_codec.cache_clear()
+
+
+@pytest.mark.parametrize("name", ["json", "orjson", "msgspec"])
+def test_codec(name: str) -> None:
+    """Test encoding to compact UTF-8 JSON and decoding from bytes and strings."""
+    from otelib.codec import get_codec
+
+    if name != "json":
+        pytest.importorskip(name)
+
+    codec = get_codec(name)
+    data = {"key": ["välue", 1, 1.5, None, True]}
+    content = codec.dumps(data)
+
+    assert codec.name == name
+    assert content == '{"key":["välue",1,1.5,null,true]}'.encode()
+    assert codec.loads(content) == data
+    assert codec.loads(content.decode()) == data
+    assert get_codec(name) is codec
+
+
+@pytest.mark.usefixtures("_clear_codecs")
+def test_codec_selection(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test the codec is chosen by the `json_codec` setting, falling back to the
+    standard library if no other codec is installed."""
+    import sys
+
+    from otelib.codec import get_codec
+
+    monkeypatch.setenv("OTEAPI_JSON_CODEC", "json")
+    assert get_codec().name == "json"
+
+    monkeypatch.setitem(sys.modules, "orjson", None)
+    monkeypatch.setitem(sys.modules, "msgspec", None)
+    monkeypatch.setenv("OTEAPI_JSON_CODEC", "auto")
+    assert get_codec().name == "json"
+
+    with pytest.raises(ImportError, match="orjson"):
+        get_codec("orjson")
+    with pytest.raises(ValueError, match="Unknown JSON codec"):
+        get_codec("yaml")
+
+
+def test_python_fetch_json(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test the Python backend returns the result of `fetch_json()` without
+    serializing it."""
+    import json
+
+    from oteapi.models import AttrDict
+
+    from otelib import OTEClient
+
+    client = OTEClient("python", cache={})
+    filter_ = client.create_filter(**dict(strategy_create_kwargs())["filter"])
+    session_id = filter_._create_session()
+    filter_.initialize(session_id)
+
+    def model_dump_json(*_args, **_kwargs) -> str:
+        raise AssertionError("The result must not be serialized")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(AttrDict, "model_dump_json", model_dump_json)
+        content = filter_.fetch_json(session_id)
+
+    assert content == json.loads(filter_.fetch(session_id)) == {}
+
+
+@pytest.mark.parametrize("name", ["json", "orjson"])
+def test_services_codec(
+    name: str, ote_server: OTEServer, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test the services backend sends and decodes bodies with the codec."""
+    import json
+
+    from otelib import OTEClient
+
+    if name != "json":
+        pytest.importorskip(name)
+    monkeypatch.setenv("OTEAPI_JSON_CODEC", name)
+
+    client = OTEClient(ote_server.url)
+    assert client._impl.codec.name == name
+    create_kwargs = dict(strategy_create_kwargs())
+    mapping, filter_ = client.create_many(
+        [("mapping", create_kwargs["mapping"]), ("filter", create_kwargs["filter"])]
+    )
+    assert filter_.codec.name == name
+
+    # The pipeline is run in a single request, which is encoded with the codec
+    assert json.loads((mapping >> filter_).get()) == {}
+    assert ote_server.requests[-1] == "POST /pipeline"
+
+    session_id = filter_._create_session()
+    filter_.initialize(session_id)
+    assert filter_.fetch_json(session_id) == json.loads(filter_.fetch(session_id))
@@ -0,0 +1,43 @@
+"""Test the import time of OTElib."""
+
+from __future__ import annotations
+
+import pytest
+
+HEAVY_MODULES = ("httpx", "oteapi", "pydantic", "pydantic_settings", "requests")
+
+
+def imported_modules(code: str) -> dict[str, int]:
+    """Run `code` in a new interpreter, returning the cumulative import time in
+    microseconds for each imported module, as reported by `python -X importtime`."""
+    import subprocess
+    import sys
+
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        _, cumulative, module = line.split("|")
+        modules[module.strip()] = int(cumulative)
+    return modules
+
+
+@pytest.mark.parametrize(
+    "code",
+    ["import otelib", "from otelib import OTEClient; OTEClient('python')"],
+    ids=["import", "python_client"],
+)
+def test_no_heavy_imports(code: str) -> None:
+    """Test importing OTElib and creating a Python backend client defer importing
+    heavy dependencies until they are needed."""
+    modules = imported_modules(code)
+
+    assert "otelib" in modules
+    assert not {module.split(".")[0] for module in modules} & set(HEAVY_MODULES)
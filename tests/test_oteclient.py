@@ -162,3 +162,164 @@ def test_create_strategies(
             assert session.get(key)
         else:
             assert value == session[key]
+
+
+def test_services_connection_pool(
+    monkeypatch: pytest.MonkeyPatch,
+    mock_ote_response: OTEResponse,
+    ids: TestResourceIds,
+    server_url: str,
+) -> None:
+    """Test all strategies created by a services client share its connection pool."""
+    from otelib.client import OTEClient
+
+    monkeypatch.setenv("OTEAPI_POOL_MAXSIZE", "3")
+    monkeypatch.setenv("OTEAPI_MAX_RETRIES", "2")
+
+    create_kwargs = dict(strategy_create_kwargs())
+    for strategy in ("dataresource", "filter"):
+        mock_ote_response(
+            method="post",
+            endpoint=f"/{strategy}",
+            response_json={
+                f"{strategy[len('data'):] if strategy.startswith('data') else strategy}"
+                "_id": ids(strategy)
+            },
+        )
+
+    with OTEClient(server_url) as client:
+        data_resource = client.create_dataresource(**create_kwargs["dataresource"])
+        filter_ = client.create_filter(**create_kwargs["filter"])
+
+        http_session = client._impl.http_session
+        assert data_resource.http_session is http_session
+        assert filter_.http_session is http_session
+
+        adapter = http_session.get_adapter(server_url)
+        assert adapter._pool_maxsize == 3
+        assert adapter.max_retries.total == 2
+
+
+@pytest.mark.usefixtures("mock_session")
+def test_run_batch(
+    client: OTEClient,
+    ids: TestResourceIds,
+    mock_ote_response: OTEResponse,
+    testdata: Testdata,
+    requests_mock: Mocker,
+) -> None:
+    """Test running a pipeline for many inputs, varying only the given fields."""
+    import json
+
+    backend = client._impl._backend
+
+    if backend == "services":
+        # Mock URL responses
+        for strategy in ("filter", "mapping"):
+            mock_ote_response(
+                method="post",
+                endpoint=f"/{strategy}",
+                response_json={f"{strategy}_id": ids(strategy)},
+            )
+            mock_ote_response(
+                method="post",
+                endpoint=f"/{strategy}/{ids(strategy)}/initialize",
+                params={"session_id": ids("session")},
+                response_json=testdata(strategy),
+            )
+            mock_ote_response(
+                method="get",
+                endpoint=f"/{strategy}/{ids(strategy)}",
+                params={"session_id": ids("session")},
+                response_json={},
+            )
+
+    create_kwargs = dict(strategy_create_kwargs())
+    mapping = client.create_mapping(**create_kwargs["mapping"])
+    filter_ = client.create_filter(**create_kwargs["filter"])
+    pipeline = mapping >> filter_
+
+    queries = [f"SELECT {number};" for number in range(5)]
+    results = list(
+        client.run_batch(
+            pipeline, [{"filter": {"query": query}} for query in queries], max_workers=2
+        )
+    )
+
+    assert sorted(index for index, _ in results) == list(range(len(queries)))
+    assert all(json.loads(content) == {} for _, content in results)
+
+    # The template pipeline is left untouched
+    assert filter_.input_pipe.input is mapping
+    assert mapping.input_pipe is None
+
+    if backend == "services":
+        created = [
+            request.json()
+            for request in requests_mock.request_history
+            if request.method == "POST"
+            and request.path.endswith(("/filter", "/mapping"))
+        ]
+        assert len(created) == 2 + len(queries)
+        assert sorted(config["query"] for config in created[2:]) == queries
+        assert all("mappingType" not in config for config in created[2:])
+    elif backend == "python":
+        cache = client._impl._cache
+        # Only the sessions are stored in the cache, one per run
+        assert len(cache) == len(queries)
+        assert sorted(
+            cache[key]["sqlquery"] for key in cache if key.startswith("session-")
+        ) == sorted(queries)
+
+    with pytest.raises(ValueError, match=r"exactly one strategy in the pipeline"):
+        list(client.run_batch(pipeline, [{"dataresource": {}}]))
+
+
+@pytest.mark.usefixtures("mock_session")
+def test_stream(
+    client: OTEClient,
+    ids: TestResourceIds,
+    mock_ote_response: OTEResponse,
+    testdata: Testdata,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test streaming the result of a pipeline to a temporary file."""
+    backend = client._impl._backend
+    content = b'{"data": "' + b"x" * 1000 + b'"}'
+    # Only a mocked OTEAPI Service returns the large content
+    mocked = backend == "services" and "example" in client.url
+
+    monkeypatch.setenv("OTEAPI_STREAM_CHUNK_SIZE", "64")
+    monkeypatch.setenv("OTEAPI_STREAM_SPOOL_THRESHOLD", "256")
+
+    if backend == "services":
+        # Mock URL responses
+        mock_ote_response(
+            method="post",
+            endpoint="/filter",
+            response_json={"filter_id": ids("filter")},
+        )
+        mock_ote_response(
+            method="post",
+            endpoint=f"/filter/{ids('filter')}/initialize",
+            params={"session_id": ids("session")},
+            response_json=testdata("filter"),
+        )
+        mock_ote_response(
+            method="get",
+            endpoint=f"/filter/{ids('filter')}",
+            params={"session_id": ids("session")},
+            response_content=content,
+        )
+
+    filter_ = client.create_filter(**dict(strategy_create_kwargs())["filter"])
+
+    with filter_.stream() as file:
+        result = file.read()
+        if mocked:
+            # The result exceeded the threshold and was spilled to disk
+            assert file._rolled
+
+    assert result == filter_.get()
+    if mocked:
+        assert result == content
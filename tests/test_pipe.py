@@ -423,3 +423,446 @@ def test_pipeing_concatenate(
     assert pipeline_tail.strategy_id == parserid2
     pipeline_tail = pipeline_tail.input_pipe.input
     assert pipeline_tail.strategy_id == filterid2
+
+
+@pytest.mark.parametrize("asynchronous", [False, True], ids=["get", "aget"])
+@pytest.mark.usefixtures("mock_session")
+def test_concurrent_initialize(
+    backend: str,
+    mock_ote_response: OTEResponse,
+    ids: TestResourceIds,
+    testdata: Testdata,
+    server_url: str,
+    asynchronous: bool,
+) -> None:
+    """Test initializing all strategies concurrently, then fetching them in order."""
+    import asyncio
+    import importlib
+    import json
+    import threading
+    from functools import partial
+
+    from otelib.backends.strategies import AbstractBaseStrategy
+
+    strategies = importlib.import_module(f"otelib.backends.{backend}")
+    server_url = server_url if backend != "python" else backend
+
+    if backend == "services":
+        # Mock URL responses
+        for strategy_name in ("filter", "mapping"):
+            mock_ote_response(
+                method="post",
+                endpoint=f"/{strategy_name}",
+                response_json={f"{strategy_name}_id": ids(strategy_name)},
+            )
+            mock_ote_response(
+                method="post",
+                endpoint=f"/{strategy_name}/{ids(strategy_name)}/initialize",
+                params={"session_id": ids("session")},
+                response_json=testdata(strategy_name),
+            )
+            mock_ote_response(
+                method="get",
+                endpoint=f"/{strategy_name}/{ids(strategy_name)}",
+                params={"session_id": ids("session")},
+                response_json={},
+            )
+
+    strategy_kwargs = {}
+    if backend == "python":
+        # Setup custom cache
+        cache = {}
+        strategy_kwargs["cache"] = cache
+
+    filter: Filter = strategies.Filter(server_url, **strategy_kwargs)
+    mapping = strategies.Mapping(server_url, **strategy_kwargs)
+
+    create_kwargs = dict(strategy_create_kwargs())
+    filter.create(**create_kwargs["filter"])
+    mapping.create(**create_kwargs["mapping"])
+
+    # Both initializations must be running at the same time to pass the barrier
+    barrier = threading.Barrier(2, timeout=5)
+    calls: list[tuple[str, str]] = []
+
+    for strategy in (filter, mapping):
+
+        def initialize(session_id: str, strategy: BaseStrategy = strategy) -> bytes:
+            barrier.wait()
+            calls.append(("initialize", strategy.strategy_name))
+            return type(strategy).initialize(strategy, session_id)
+
+        def fetch(session_id: str, strategy: BaseStrategy = strategy) -> bytes:
+            calls.append(("fetch", strategy.strategy_name))
+            return type(strategy).fetch(strategy, session_id)
+
+        strategy.initialize = initialize
+        strategy.fetch = fetch
+
+        if asynchronous:
+            # Run the (mocked) blocking requests in worker threads
+            strategy.ainitialize = partial(AbstractBaseStrategy.ainitialize, strategy)
+            strategy.afetch = partial(AbstractBaseStrategy.afetch, strategy)
+            strategy._acreate_session = partial(
+                AbstractBaseStrategy._acreate_session, strategy
+            )
+
+    pipeline = filter >> mapping
+
+    if asynchronous:
+        content = asyncio.run(pipeline.aget(concurrent_initialize=True))
+    else:
+        content = pipeline.get(concurrent_initialize=True)
+
+    assert json.loads(content) == {}
+    assert sorted(calls[:2]) == [("initialize", "filter"), ("initialize", "mapping")]
+    assert calls[2:] == [("fetch", "filter"), ("fetch", "mapping")]
+    assert filter._session_id == mapping._session_id
+
+
+@pytest.mark.usefixtures("mock_session")
+def test_result_cache(
+    backend: str,
+    mock_ote_response: OTEResponse,
+    ids: TestResourceIds,
+    testdata: Testdata,
+    server_url: str,
+    requests_mock: Mocker,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test memoizing the results of (parts of) pipelines."""
+    import json
+
+    from otelib import OTEClient
+    from otelib.cache import LRUCache
+
+    if backend == "services":
+        # Mock URL responses
+        for strategy_name in ("filter", "mapping"):
+            mock_ote_response(
+                method="post",
+                endpoint=f"/{strategy_name}",
+                response_json={f"{strategy_name}_id": ids(strategy_name)},
+            )
+            mock_ote_response(
+                method="post",
+                endpoint=f"/{strategy_name}/{ids(strategy_name)}/initialize",
+                params={"session_id": ids("session")},
+                response_json=testdata(strategy_name),
+            )
+            mock_ote_response(
+                method="get",
+                endpoint=f"/{strategy_name}/{ids(strategy_name)}",
+                params={"session_id": ids("session")},
+                response_json={},
+            )
+        mock_ote_response(
+            method="put", endpoint=f"/session/{ids('session')}", response_json={}
+        )
+
+    result_cache = LRUCache(max_entries=10)
+    client_kwargs = {"result_cache": result_cache}
+    if backend == "python":
+        # Setup custom cache
+        cache = {}
+        client_kwargs["cache"] = cache
+    client = OTEClient(server_url if backend != "python" else backend, **client_kwargs)
+
+    create_kwargs = dict(strategy_create_kwargs())
+    mapping = client.create_mapping(**create_kwargs["mapping"])
+    filter_ = client.create_filter(**create_kwargs["filter"])
+    other_filter = client.create_filter(
+        **{**create_kwargs["filter"], "query": "SELECT 1;"}
+    )
+    non_deterministic_filter = client.create_filter(
+        **create_kwargs["filter"], memoize=False
+    )
+
+    calls = []
+    for strategy_cls in {type(mapping), type(filter_)}:
+
+        def initialize(self, session_id: str, original=strategy_cls.initialize):
+            calls.append(self)
+            return original(self, session_id)
+
+        monkeypatch.setattr(strategy_cls, "initialize", initialize)
+
+    # The first run memoizes both the mapping and the complete pipeline
+    assert json.loads((mapping >> filter_).get()) == {}
+    assert calls == [filter_, mapping]
+
+    # The complete pipeline is memoized
+    assert json.loads(filter_.get()) == {}
+    assert calls == [filter_, mapping]
+
+    # Only the mapping is memoized
+    assert json.loads((mapping >> other_filter).get()) == {}
+    assert calls == [filter_, mapping, other_filter]
+
+    mapping >> non_deterministic_filter
+    for _ in range(2):
+        assert json.loads(non_deterministic_filter.get()) == {}
+    assert calls == [filter_, mapping, other_filter] + [non_deterministic_filter] * 2
+    assert len(result_cache) == 3
+
+    # The memoized session updates are added to the sessions
+    if backend == "services":
+        updates = [
+            request.json()
+            for request in requests_mock.request_history
+            if request.method == "PUT"
+        ]
+        assert len(updates) == 4
+        if "example" in server_url:
+            # A real OTEAPI Service may return the session content in another order
+            assert updates[0] == {**testdata("mapping"), **testdata("filter")}
+    elif backend == "python":
+        assert [
+            session.get("sqlquery")
+            for key, session in cache.items()
+            if key.startswith("session-")
+        ] == [create_kwargs["filter"]["query"]] * 2 + ["SELECT 1;"] + [
+            create_kwargs["filter"]["query"]
+        ] * 2
+
+
+@pytest.mark.usefixtures("mock_session")
+def test_pipeline(
+    backend: str,
+    mock_ote_response: OTEResponse,
+    ids: TestResourceIds,
+    testdata: Testdata,
+    server_url: str,
+) -> None:
+    """Test building, inspecting and running a `Pipeline`."""
+    import json
+
+    from otelib import OTEClient, Pipeline
+
+    if backend == "services":
+        # Mock URL responses
+        for strategy_name in ("filter", "mapping"):
+            mock_ote_response(
+                method="post",
+                endpoint=f"/{strategy_name}",
+                response_json={f"{strategy_name}_id": ids(strategy_name)},
+            )
+            mock_ote_response(
+                method="post",
+                endpoint=f"/{strategy_name}/{ids(strategy_name)}/initialize",
+                params={"session_id": ids("session")},
+                response_json=testdata(strategy_name),
+            )
+            mock_ote_response(
+                method="get",
+                endpoint=f"/{strategy_name}/{ids(strategy_name)}",
+                params={"session_id": ids("session")},
+                response_json={},
+            )
+
+    client_kwargs = {}
+    if backend == "python":
+        # Setup custom cache
+        cache = {}
+        client_kwargs["cache"] = cache
+    client = OTEClient(server_url if backend != "python" else backend, **client_kwargs)
+
+    create_kwargs = dict(strategy_create_kwargs())
+    mapping = client.create_mapping(**create_kwargs["mapping"])
+    filter_ = client.create_filter(**create_kwargs["filter"])
+    other_filter = client.create_filter(**create_kwargs["filter"])
+
+    with pytest.raises(ValueError, match="at least one strategy"):
+        Pipeline()
+
+    pipeline = Pipeline(mapping) >> filter_
+    forked = pipeline >> other_filter
+    combined = mapping >> Pipeline(filter_, other_filter)
+
+    assert pipeline.strategies == (mapping, filter_)
+    assert list(forked) == [mapping, filter_, other_filter]
+    assert combined.strategies == forked.strategies
+    assert len(forked) == 3
+    assert repr(pipeline) == (
+        f"Pipeline({type(mapping).__name__}({mapping.strategy_id!r}) >> "
+        f"{type(filter_).__name__}({filter_.strategy_id!r}))"
+    )
+
+    # Pipelines are reusable and leave the strategies' input pipes unchanged
+    for _ in range(2):
+        assert json.loads(pipeline.get()) == {}
+        assert json.loads(forked.get()) == {}
+    assert all(
+        strategy.input_pipe is None for strategy in (mapping, filter_, other_filter)
+    )
+
+    assert Pipeline.from_strategy(mapping >> filter_).strategies == (mapping, filter_)
+
+
+def test_pipeline_iterative() -> None:
+    """Test running a pipeline longer than the recursion limit."""
+    import json
+    import sys
+
+    from otelib import OTEClient
+
+    client = OTEClient("python", cache={})
+
+    create_kwargs = dict(strategy_create_kwargs())
+    strategies = [
+        client.create_filter(**create_kwargs["filter"])
+        for _ in range(sys.getrecursionlimit() + 1)
+    ]
+
+    pipeline = strategies[0]
+    for strategy in strategies[1:]:
+        pipeline = pipeline >> strategy
+
+    assert json.loads(pipeline.get()) == {}
+
+
+@pytest.mark.parametrize(
+    ("env", "max_workers"),
+    [({"OTEAPI_POOL_MAXSIZE": "3"}, 3), ({"OTEAPI_PIPELINE_MAX_WORKERS": "2"}, 2)],
+)
+def test_pipeline_max_workers(
+    env: dict[str, str], max_workers: int, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test the number of threads running independent branches is bounded."""
+    import threading
+    import time
+
+    from otelib.pipeline import _run_graph
+
+    for name, value in env.items():
+        monkeypatch.setenv(name, value)
+
+    lock = threading.Lock()
+    running = [0]
+    most_running = [0]
+
+    def function(_node: int) -> None:
+        with lock:
+            running[0] += 1
+            most_running[0] = max(most_running[0], running[0])
+        time.sleep(0.01)
+        with lock:
+            running[0] -= 1
+
+    # Twelve independent nodes, followed by one depending on all of them
+    nodes = list(range(13))
+    _run_graph(
+        nodes,
+        lambda node: range(12) if node == 12 else (),
+        function,
+        concurrent=True,
+    )
+
+    assert most_running[0] == max_workers
+
+
+@pytest.mark.usefixtures("mock_session")
+def test_pipeline_dag(
+    backend: str,
+    mock_ote_response: OTEResponse,
+    ids: TestResourceIds,
+    testdata: Testdata,
+    server_url: str,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test pipelines with fan-out and fan-in."""
+    import json
+    import threading
+
+    from otelib import OTEClient, Pipeline
+    from otelib.cache import LRUCache
+    from otelib.pipe import Pipe
+
+    if backend == "services":
+        # Mock URL responses
+        for strategy_name in ("filter", "mapping"):
+            mock_ote_response(
+                method="post",
+                endpoint=f"/{strategy_name}",
+                response_json={f"{strategy_name}_id": ids(strategy_name)},
+            )
+            mock_ote_response(
+                method="post",
+                endpoint=f"/{strategy_name}/{ids(strategy_name)}/initialize",
+                params={"session_id": ids("session")},
+                response_json=testdata(strategy_name),
+            )
+            mock_ote_response(
+                method="get",
+                endpoint=f"/{strategy_name}/{ids(strategy_name)}",
+                params={"session_id": ids("session")},
+                response_json={},
+            )
+        mock_ote_response(
+            method="put", endpoint=f"/session/{ids('session')}", response_json={}
+        )
+
+    result_cache = LRUCache(max_entries=10)
+    client_kwargs = {"result_cache": result_cache}
+    if backend == "python":
+        # Setup custom cache
+        cache = {}
+        client_kwargs["cache"] = cache
+    client = OTEClient(server_url if backend != "python" else backend, **client_kwargs)
+
+    create_kwargs = dict(strategy_create_kwargs())
+    shared = client.create_filter(**create_kwargs["filter"])
+    branch1 = client.create_filter(**{**create_kwargs["filter"], "query": "SELECT 1;"})
+    branch2 = client.create_filter(**{**create_kwargs["filter"], "query": "SELECT 2;"})
+    merge = client.create_mapping(**create_kwargs["mapping"])
+
+    # The branches must be fetched at the same time to pass the barrier
+    barrier = threading.Barrier(2, timeout=5)
+    calls: list[tuple[str, Any]] = []
+    for strategy_cls in {type(shared), type(merge)}:
+
+        def initialize(self, session_id: str, original=strategy_cls.initialize):
+            calls.append(("initialize", self))
+            return original(self, session_id)
+
+        def fetch(self, session_id: str, original=strategy_cls.fetch):
+            if self in (branch1, branch2):
+                barrier.wait()
+            calls.append(("fetch", self))
+            return original(self, session_id)
+
+        monkeypatch.setattr(strategy_cls, "initialize", initialize)
+        monkeypatch.setattr(strategy_cls, "fetch", fetch)
+
+    assert shared >> (branch1, branch2) == (branch1, branch2)
+    assert (branch1, branch2) >> merge is merge
+    assert merge.input_pipe.inputs == (branch1, branch2)
+
+    pipeline = Pipeline.from_strategy(merge)
+    assert pipeline.strategies == (shared, branch1, branch2, merge)
+    assert pipeline.inputs == ((), (0,), (0,), (1, 2))
+    assert pipeline.outputs == (merge,)
+
+    # Every strategy runs once, each after the strategies it depends on
+    assert json.loads(merge.get()) == {}
+    assert len(calls) == 8
+    assert calls[0] == ("initialize", merge)
+    assert set(calls[1:3]) == {("initialize", branch1), ("initialize", branch2)}
+    assert calls[3:5] == [("initialize", shared), ("fetch", shared)]
+    assert calls[7] == ("fetch", merge)
+
+    # The result is memoized, keyed by all strategies piped into the merge
+    assert json.loads(merge.get()) == {}
+    assert len(calls) == 8
+    assert len(result_cache) == 4
+
+    # Fan out from a pipeline to several outputs
+    forked = Pipeline(shared) >> (branch1, branch2)
+    assert forked.outputs == (branch1, branch2)
+    assert forked.get_outputs() == (b"{}", b"{}")
+    assert len(calls) == 8
+
+    # Cycles are detected
+    shared._set_input(Pipe(merge))
+    with pytest.raises(ValueError, match="contains a cycle"):
+        merge.get()
@@ -0,0 +1,151 @@
+"""Test profiling pipeline runs."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+from utils import strategy_create_kwargs
+
+if TYPE_CHECKING:
+    from ote_server import OTEServer
+
+
+def test_profile_report() -> None:
+    """Test the report of a pipeline run, including memoized results."""
+    import json
+
+    from otelib import OTEClient
+    from otelib.profiling import profile
+
+    client = OTEClient("python", cache={}, result_cache={})
+    create_kwargs = dict(strategy_create_kwargs())
+    mapping = client.create_mapping(**create_kwargs["mapping"])
+    filter_ = client.create_filter(**create_kwargs["filter"])
+    pipeline = mapping >> filter_
+
+    with profile() as report:
+        content = pipeline.get()
+
+    assert [row["strategy_id"] for row in report.strategies] == [
+        filter_.strategy_id,
+        mapping.strategy_id,
+    ]
+    filter_row = report.strategies[0]
+    assert filter_row["strategy_type"] == "filter"
+    assert filter_row["bytes"] >= len(content)
+    assert filter_row["initialize"] > 0
+    assert filter_row["fetch"] > 0
+    assert filter_row["cache_hits"] == 0
+    assert [(span.name, span.strategy_id) for span in report.critical_path] == [
+        ("create_session", filter_.strategy_id),
+        ("initialize", filter_.strategy_id),
+        ("initialize", mapping.strategy_id),
+        ("fetch", mapping.strategy_id),
+        ("fetch", filter_.strategy_id),
+    ]
+    assert report.wall_time >= sum(span.duration for span in report.critical_path)
+
+    # The second run only adds the memoized session updates of the filter
+    with profile() as report:
+        assert pipeline.get() == content
+    assert [(row["strategy_id"], row["cache_hits"]) for row in report.strategies] == [
+        (filter_.strategy_id, 1)
+    ]
+
+    report_json = json.loads(report.to_json())
+    assert report_json["strategies"] == report.strategies
+    assert [step["step"] for step in report_json["critical_path"]] == [
+        "create_session",
+        "update_session",
+    ]
+
+    table = report.table().splitlines()
+    assert table[0].split() == [
+        "type",
+        "strategy",
+        "initialize",
+        "[s]",
+        "fetch",
+        "[s]",
+        "serialize",
+        "[s]",
+        "bytes",
+        "cache",
+        "hits",
+        "retries",
+    ]
+    assert table[1].split()[:2] == ["filter", filter_.strategy_id]
+    assert table[1].split()[-2:] == ["1", "0"]
+
+
+def test_profile_retries(
+    ote_server: OTEServer, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test retried requests are accounted to the step they were sent for."""
+    from otelib import OTEClient
+    from otelib.profiling import profile
+
+    monkeypatch.setenv("OTEAPI_MAX_RETRIES", "2")
+    monkeypatch.setenv("OTEAPI_RETRY_BACKOFF_FACTOR", "0")
+    monkeypatch.setenv("OTEAPI_RETRY_BACKOFF_JITTER", "0")
+    monkeypatch.setenv("OTEAPI_PIPELINE_ENDPOINT", "false")
+
+    client = OTEClient(ote_server.url)
+    filter_ = client.create_filter(**dict(strategy_create_kwargs())["filter"])
+
+    ote_server.fail("GET", 503, times=2)
+    with profile() as report:
+        filter_.get()
+
+    # The stand-in server runs its strategies in other threads, which are left out
+    assert [
+        (row["strategy_id"], row["retries"], row["serialize"])
+        for row in report.strategies
+    ] == [(filter_.strategy_id, 2, 0.0)]
+    assert report.to_dict()["retries"] == 2
+
+
+def test_critical_path() -> None:
+    """Test the critical path follows the steps waited for in concurrent branches."""
+    from otelib.profiling import RunReport
+    from otelib.tracing import Span
+
+    def span(name: str, start: float, end: float) -> Span:
+        step = Span("fetch")
+        step.strategy_id = name
+        step.start, step.duration = start, end - start
+        return step
+
+    report = RunReport()
+    report.spans = [
+        span("a", 0.0, 1.0),
+        span("b", 0.0, 3.0),
+        span("c", 1.0, 2.0),
+        span("d", 3.0, 4.0),
+    ]
+    assert [step.strategy_id for step in report.critical_path] == ["b", "d"]
+    assert report.wall_time == 4.0
+
+
+def test_profile_context() -> None:
+    """Test only the steps run within the context are collected."""
+    import threading
+
+    from otelib.profiling import profile
+    from otelib.tracing import trace_step
+
+    def step() -> None:
+        with trace_step("fetch"):
+            pass
+
+    with profile() as outer:
+        with profile() as inner:
+            step()
+        thread = threading.Thread(target=step)
+        thread.start()
+        thread.join()
+    step()
+
+    assert len(inner.spans) == 1
+    assert outer.spans == inner.spans
@@ -0,0 +1,370 @@
+"""Tests specific to the Python backend."""
+
+from __future__ import annotations
+
+import pytest
+from utils import strategy_create_kwargs
+
+
+@pytest.fixture(autouse=True)
+def _load_strategies() -> None:
+    """Load the OTEAPI Core strategies."""
+    from oteapi.plugins import load_strategies
+
+    load_strategies()
+
+
+def test_preparsed_config(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test runs reuse the validated configuration without validating it again."""
+    import json
+
+    from oteapi.models import FilterConfig
+
+    from otelib.backends.python import Filter
+
+    filter_ = Filter("python", cache={})
+    filter_.create(**dict(strategy_create_kwargs())["filter"])
+    config = filter_.config
+
+    validations = []
+    original_init = FilterConfig.__init__
+
+    def __init__(self, **data) -> None:
+        # Plugins validate their own configuration subclasses, which is not counted
+        if type(self) is FilterConfig:
+            validations.append(data)
+        original_init(self, **data)
+
+    monkeypatch.setattr(FilterConfig, "__init__", __init__)
+
+    session_id = filter_._create_session()
+    filter_.cache[session_id] = {"from_session": "value"}
+
+    assert json.loads(filter_.get(session_id)) == {}
+    assert filter_.cache[session_id]["sqlquery"] == "DROP TABLE myTable;"
+
+    assert not validations
+    # The session data is only populated in a copy of the configuration
+    assert filter_.config is config
+    assert "from_session" not in config.configuration
+
+
+def test_plugin_cache() -> None:
+    """Test instantiated plugin strategies are reused for identical configurations."""
+    import json
+
+    from otelib import OTEClient
+    from otelib.backends.python.plugins import PluginCache
+
+    plugin_cache = PluginCache()
+    client = OTEClient("python", cache={}, plugin_cache=plugin_cache)
+
+    filter_ = client.create_filter(**dict(strategy_create_kwargs())["filter"])
+    for _ in range(3):
+        assert json.loads(filter_.get()) == {}
+
+    # The same configuration is used for both `initialize()` and `get()`
+    assert plugin_cache.constructions == 1
+    assert plugin_cache.constructions_avoided == 5
+
+    other_filter = client.create_filter(filterType="filter/sql", query="SELECT 1;")
+    other_filter.get()
+    assert plugin_cache.constructions == 2
+    assert plugin_cache.constructions_avoided == 6
+
+    plugin_cache.invalidate("filter")
+    filter_.get()
+    assert plugin_cache.constructions == 3
+    assert plugin_cache.constructions_avoided == 7
+
+
+@pytest.mark.parametrize("config", [{}, {"plugin_cache": None}])
+def test_plugin_cache_disabled(config: dict[str, None]) -> None:
+    """Test plugin strategies are instantiated for every call without a cache, which
+    is the default."""
+    from otelib import OTEClient
+    from otelib.backends.python.plugins import PLUGIN_CACHE
+
+    constructions = PLUGIN_CACHE.constructions
+
+    client = OTEClient("python", cache={}, **config)
+    filter_ = client.create_filter(**dict(strategy_create_kwargs())["filter"])
+    filter_.get()
+
+    assert filter_.plugin_cache is None
+    assert PLUGIN_CACHE.constructions == constructions
+
+
+def test_plugin_cache_threads() -> None:
+    """Test the counters of a plugin cache shared by threads are not lost."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    from otelib import OTEClient
+    from otelib.backends.python.plugins import PluginCache
+
+    plugin_cache = PluginCache()
+    client = OTEClient("python", cache={}, plugin_cache=plugin_cache)
+    filter_ = client.create_filter(**dict(strategy_create_kwargs())["filter"])
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(lambda _: filter_.get(), range(40)))
+
+    # Each `get()` looks up the plugin strategy for `initialize()` and `get()`
+    assert plugin_cache.constructions + plugin_cache.constructions_avoided == 80
+
+
+def test_lazy_plugin_discovery(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test plugin strategies are discovered when first needed, and only once."""
+    from importlib.metadata import entry_points
+
+    from oteapi.plugins.factories import StrategyFactory
+
+    from otelib import OTEClient
+
+    discoveries = []
+
+    def _entry_points():
+        discoveries.append(None)
+        return entry_points()
+
+    monkeypatch.delattr(StrategyFactory, "strategy_create_func")
+    monkeypatch.setattr("importlib.metadata.entry_points", _entry_points)
+
+    client = OTEClient("python", cache={}, plugin_cache=None)
+    data_resource = client.create_dataresource(
+        **dict(strategy_create_kwargs())["dataresource"]
+    )
+    assert not discoveries
+
+    data_resource.get()
+    data_resource.get()
+    assert len(discoveries) == 1
+
+    client._impl.refresh_plugins()
+    assert len(discoveries) == 2
+
+    data_resource.get()
+    assert len(discoveries) == 2
+
+
+def test_plugin_index(monkeypatch: pytest.MonkeyPatch, tmp_path) -> None:
+    """Test discovered plugin strategies are stored in and loaded from an index."""
+    from importlib.metadata import entry_points
+
+    from oteapi.plugins.factories import StrategyFactory
+
+    from otelib.backends.python import plugins
+
+    discoveries = []
+
+    def _entry_points():
+        discoveries.append(None)
+        return entry_points()
+
+    monkeypatch.setenv("OTEAPI_CACHE_DIR", str(tmp_path))
+    monkeypatch.delattr(StrategyFactory, "strategy_create_func")
+    monkeypatch.setattr("importlib.metadata.entry_points", _entry_points)
+
+    plugins.load_plugins()
+    assert len(discoveries) == 1
+    assert len(list(tmp_path.glob("plugins-*.json"))) == 1
+    strategies = StrategyFactory.strategy_create_func
+
+    # A new process loads the index instead of discovering plugin strategies
+    del StrategyFactory.strategy_create_func
+    plugins.load_plugins()
+    assert len(discoveries) == 1
+    assert {
+        strategy_type: sorted(map(str, collection))
+        for strategy_type, collection in StrategyFactory.strategy_create_func.items()
+    } == {
+        strategy_type: sorted(map(str, collection))
+        for strategy_type, collection in strategies.items()
+    }
+
+    # A corrupt index is ignored
+    next(tmp_path.glob("plugins-*.json")).write_text("{", encoding="utf-8")
+    del StrategyFactory.strategy_create_func
+    plugins.load_plugins()
+    assert len(discoveries) == 2
+
+
+def test_process_pool() -> None:
+    """Test running plugin strategies in a process pool reused across runs."""
+    import json
+
+    from otelib import OTEClient
+
+    cache = {}
+    with OTEClient("python", cache=cache, processes=2) as client:
+        create_kwargs = dict(strategy_create_kwargs())
+        mapping = client.create_mapping(**create_kwargs["mapping"])
+        filter_ = client.create_filter(**create_kwargs["filter"])
+        pipeline = mapping >> filter_
+
+        for _ in range(3):
+            assert json.loads(pipeline.get()) == {}
+
+        executor = client._impl._executor
+        assert 1 <= len(executor._processes) <= 2
+
+    assert [
+        session["sqlquery"]
+        for key, session in cache.items()
+        if key.startswith("session-")
+    ] == [create_kwargs["filter"]["query"]] * 3
+
+
+def test_create_many() -> None:
+    """Test creating many strategies at once, in the given order."""
+    import json
+
+    from otelib import OTEClient
+    from otelib.backends.python import DataResource, Filter
+    from otelib.backends.utils import StrategyType
+
+    client = OTEClient("python", cache={})
+    create_kwargs = dict(strategy_create_kwargs())
+    filter_, resource = client.create_many(
+        [
+            ("filter", create_kwargs["filter"]),
+            (StrategyType.DATARESOURCE, create_kwargs["dataresource"]),
+        ]
+    )
+    assert isinstance(filter_, Filter)
+    assert isinstance(resource, DataResource)
+    assert filter_.strategy_id != resource.strategy_id
+
+    assert json.loads(filter_.get()) == {}
+    assert client.create_many([]) == []
+
+
+@pytest.mark.parametrize("cache_type", ["dict", "lru", "disk"])
+def test_concurrent_session_updates(cache_type: str, tmp_path) -> None:
+    """Test no concurrent update of a session is lost, and a session is never
+    changed in place."""
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+
+    from otelib.backends.python import Filter
+    from otelib.cache import DiskCache, LRUCache
+
+    cache = {
+        "dict": dict,
+        "lru": LRUCache,
+        "disk": lambda: DiskCache(tmp_path / "cache.sqlite"),
+    }[cache_type]()
+    session_id = Filter("python", cache=cache)._create_session()
+    snapshot = cache[session_id]
+    threads = 16
+    barrier = threading.Barrier(threads)
+
+    def create(_: int) -> str:
+        filter_ = Filter("python", cache=cache)
+        barrier.wait()
+        filter_.create(
+            session_id=session_id, **dict(strategy_create_kwargs())["filter"]
+        )
+        return filter_.strategy_id
+
+    def update(index: int) -> None:
+        barrier.wait()
+        Filter("python", cache=cache)._update_session(
+            session_id, {f"key{index}": index}
+        )
+
+    with ThreadPoolExecutor(threads) as executor:
+        strategy_ids = list(executor.map(create, range(threads)))
+    with ThreadPoolExecutor(threads) as executor:
+        list(executor.map(update, range(threads)))
+
+    session = dict(cache[session_id])
+    assert sorted(session.pop("filter_info")) == sorted(strategy_ids)
+    assert session == {f"key{index}": index for index in range(threads)}
+    assert snapshot == {}
+
+
+def test_concurrent_pipelines() -> None:
+    """Test running pipelines sharing strategies and a cache in a thread pool."""
+    import json
+    from concurrent.futures import ThreadPoolExecutor
+
+    from otelib import OTEClient, Pipeline
+    from otelib.cache import LRUCache
+
+    cache = LRUCache()
+    client = OTEClient("python", cache=cache, teardown_sessions=True)
+    create_kwargs = dict(strategy_create_kwargs())
+    mapping = client.create_mapping(**create_kwargs["mapping"])
+    filter_ = client.create_filter(**create_kwargs["filter"])
+    other_filter = client.create_filter(filterType="filter/sql", query="SELECT 1;")
+    # The branches of the pipeline are run concurrently in the same session
+    pipeline = Pipeline(mapping) >> (filter_, other_filter)
+
+    with ThreadPoolExecutor(8) as executor:
+        results = list(executor.map(lambda _: pipeline.get_outputs(), range(64)))
+
+    assert [[json.loads(output) for output in outputs] for outputs in results] == [
+        [{}, {}]
+    ] * 64
+    assert not [key for key in cache if key.startswith("session-")]
+
+
+def test_layered_session(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test session updates are stacked without copying the session data."""
+    import pickle
+    import sys
+
+    from otelib.backends.python.session import Session
+
+    monkeypatch.setattr(Session, "max_layers", 3)
+
+    session = Session({"array": list(range(1000))})
+    updated = session.updated({"key": "value"}).updated({"array": []})
+
+    assert session == {"array": list(range(1000))}
+    assert updated == {"array": [], "key": "value"}
+    assert list(updated) == ["array", "key"]
+    assert len(updated) == 2
+    assert "key" in updated
+    assert "key" not in session
+    assert updated.updated({"other": 1}).updated({})["array"] == []
+
+    # The data of the earlier layers is shared, and accounted for in the size
+    assert session.updated({"key": "value"})["array"] is session["array"]
+    assert sys.getsizeof(updated) > sys.getsizeof(session)
+
+    assert pickle.loads(pickle.dumps(updated)) == updated
+
+
+def test_lazy_result(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test the output of a strategy is only serialized to bytes on demand."""
+    import json
+
+    from oteapi.models import AttrDict
+
+    from otelib import OTEClient
+
+    client = OTEClient("python", cache={})
+    create_kwargs = dict(strategy_create_kwargs())
+    mapping = client.create_mapping(**create_kwargs["mapping"])
+    filter_ = client.create_filter(**create_kwargs["filter"])
+
+    session_id = filter_._create_session()
+    result = filter_._initialize_result(session_id)
+    assert result.size is None
+    assert result.session_update == {"sqlquery": "DROP TABLE myTable;"}
+    assert json.loads(result.content) == result.session_update
+    assert result.size == len(result.content)
+
+    # Only the output of the last strategy of a pipeline is serialized
+    serialized = []
+    original = AttrDict.model_dump_json
+
+    def model_dump_json(self, *args, **kwargs) -> str:
+        serialized.append(self)
+        return original(self, *args, **kwargs)
+
+    monkeypatch.setattr(AttrDict, "model_dump_json", model_dump_json)
+    assert json.loads((mapping >> filter_).get()) == {}
+    assert len(serialized) == 1
@@ -0,0 +1,289 @@
+"""Test the services backend against a local stand-in OTEAPI Service."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+from utils import strategy_create_kwargs
+
+if TYPE_CHECKING:
+    from ote_server import OTEServer
+
+
+@pytest.mark.parametrize("pipeline_endpoint", [True, False], ids=["single", "steps"])
+def test_pipeline_endpoint(ote_server: OTEServer, pipeline_endpoint: bool) -> None:
+    """Test running a pipeline in a single request to the pipeline endpoint, and
+    falling back to a request per step if the endpoint is not advertised."""
+    import json
+
+    from otelib import OTEClient
+
+    ote_server.pipeline_endpoint = pipeline_endpoint
+    client = OTEClient(ote_server.url)
+
+    create_kwargs = dict(strategy_create_kwargs())
+    mapping = client.create_mapping(**create_kwargs["mapping"])
+    filter_ = client.create_filter(**create_kwargs["filter"])
+    assert ote_server.requests == ["POST /mapping", "POST /filter"]
+
+    pipeline = mapping >> filter_
+    for _ in range(2):
+        assert json.loads(pipeline.get()) == {}
+
+    requests = ote_server.requests[2:]
+    if pipeline_endpoint:
+        assert requests == ["GET /pipeline", "POST /pipeline", "POST /pipeline"]
+    else:
+        steps = [
+            "POST /session",
+            f"POST /filter/{filter_.strategy_id}/initialize",
+            f"POST /mapping/{mapping.strategy_id}/initialize",
+            f"GET /mapping/{mapping.strategy_id}",
+            f"GET /filter/{filter_.strategy_id}",
+        ]
+        assert requests == ["GET /pipeline", *steps, *steps]
+
+    # Both paths run the pipeline in the same session
+    assert filter_._session_id == mapping._session_id
+    session = json.loads(
+        filter_.http_session.get(
+            f"{filter_.url}{filter_.settings.prefix}/session/{filter_._session_id}"
+        ).content
+    )
+    assert session["sqlquery"] == create_kwargs["filter"]["query"]
+    assert session["triples"]
+
+
+def test_pipeline_endpoint_error(ote_server: OTEServer) -> None:
+    """Test the pipeline endpoint is asked for again after a transient error."""
+    import json
+
+    from otelib import OTEClient
+
+    client = OTEClient(ote_server.url)
+    filter_ = client.create_filter(**dict(strategy_create_kwargs())["filter"])
+
+    ote_server.fail("GET", 503)
+    assert json.loads(filter_.get()) == {}
+    assert ote_server.requests[1:3] == ["GET /pipeline", "POST /session"]
+
+    assert json.loads(filter_.get()) == {}
+    assert ote_server.requests[-2:] == ["GET /pipeline", "POST /pipeline"]
+
+
+def test_pipeline_endpoint_setting(
+    ote_server: OTEServer, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test disabling the pipeline endpoint through the settings."""
+    import json
+
+    from otelib import OTEClient
+
+    monkeypatch.setenv("OTEAPI_PIPELINE_ENDPOINT", "false")
+    client = OTEClient(ote_server.url)
+
+    filter_ = client.create_filter(**dict(strategy_create_kwargs())["filter"])
+    assert json.loads(filter_.get()) == {}
+    assert "GET /pipeline" not in ote_server.requests
+    assert "POST /session" in ote_server.requests
+
+
+@pytest.mark.parametrize("pipeline_endpoint", [True, False], ids=["batch", "pool"])
+def test_create_many(ote_server: OTEServer, pipeline_endpoint: bool) -> None:
+    """Test creating many strategies in a single request if the OTEAPI Service
+    advertises it, and concurrently otherwise."""
+    import json
+
+    from otelib import OTEClient
+
+    ote_server.pipeline_endpoint = pipeline_endpoint
+    client = OTEClient(ote_server.url)
+
+    create_kwargs = dict(strategy_create_kwargs())
+    mapping, filter_ = client.create_many(
+        [("mapping", create_kwargs["mapping"]), ("filter", create_kwargs["filter"])]
+    )
+    assert (mapping.strategy_type, filter_.strategy_type) == ("mapping", "filter")
+    assert mapping.strategy_id.startswith("mapping-")
+    assert filter_.strategy_id.startswith("filter-")
+    assert filter_.config.query == create_kwargs["filter"]["query"]
+
+    if pipeline_endpoint:
+        assert ote_server.requests == ["GET /pipeline", "POST /pipeline/strategies"]
+    else:
+        assert sorted(ote_server.requests) == [
+            "GET /pipeline",
+            "POST /filter",
+            "POST /mapping",
+        ]
+
+    mapping >> filter_
+    assert json.loads(filter_.get()) == {}
+
+
+def test_create_many_validation(ote_server: OTEServer) -> None:
+    """Test all configurations are validated before any request is sent."""
+    from pydantic import ValidationError
+
+    from otelib import OTEClient
+
+    client = OTEClient(ote_server.url)
+
+    with pytest.raises(ValidationError):
+        client.create_many(
+            [
+                ("mapping", dict(strategy_create_kwargs())["mapping"]),
+                ("filter", {"filterType": "filter/sql", "limit": "no limit"}),
+            ]
+        )
+    assert not ote_server.requests
+
+
+@pytest.fixture
+def _retry_settings(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Retry requests without backing off, and run pipelines step by step."""
+    monkeypatch.setenv("OTEAPI_MAX_RETRIES", "2")
+    monkeypatch.setenv("OTEAPI_RETRY_BACKOFF_FACTOR", "0")
+    monkeypatch.setenv("OTEAPI_RETRY_BACKOFF_JITTER", "0")
+    monkeypatch.setenv("OTEAPI_PIPELINE_ENDPOINT", "false")
+
+
+@pytest.mark.usefixtures("_retry_settings")
+def test_retry_idempotent(ote_server: OTEServer) -> None:
+    """Test fetching is retried on transient errors, honoring `Retry-After`."""
+    import json
+
+    from otelib import OTEClient
+
+    client = OTEClient(ote_server.url)
+    filter_ = client.create_filter(**dict(strategy_create_kwargs())["filter"])
+
+    ote_server.fail("GET", 503)
+    ote_server.fail("GET", 429, headers={"Retry-After": "0"})
+    assert json.loads(filter_.get()) == {}
+
+    assert ote_server.requests[-3:] == [f"GET /filter/{filter_.strategy_id}"] * 3
+    assert client._impl.retry_stats.stats == {
+        "retries": 2,
+        "errors": 0,
+        "status_429": 1,
+        "status_503": 1,
+    }
+
+    # A malformed `Retry-After` header falls back to backing off
+    ote_server.fail("GET", 503, headers={"Retry-After": "soon"})
+    assert json.loads(filter_.get()) == {}
+    assert client._impl.retry_stats.stats["status_503"] == 2
+
+
+@pytest.mark.usefixtures("_retry_settings")
+def test_retry_exhausted(ote_server: OTEServer) -> None:
+    """Test non-idempotent requests are not retried, and the last error is raised
+    once all retries failed."""
+    from otelib import OTEClient
+    from otelib.backends.services.transport import RetryStats
+    from otelib.exceptions import ApiError
+
+    retry_stats = RetryStats()
+    client = OTEClient(ote_server.url, retry_stats=retry_stats)
+    filter_ = client.create_filter(**dict(strategy_create_kwargs())["filter"])
+
+    ote_server.fail("POST", 503)
+    with pytest.raises(ApiError, match="Cannot create session") as exc_info:
+        filter_.get()
+    assert exc_info.value.status == 503
+    assert ote_server.requests[-1] == "POST /session"
+    assert retry_stats.retries == 0
+
+    ote_server.fail("GET", 502, times=3)
+    with pytest.raises(ApiError, match="Cannot fetch filter") as exc_info:
+        filter_.get()
+    assert exc_info.value.status == 502
+    assert ote_server.requests[-3:] == [f"GET /filter/{filter_.strategy_id}"] * 3
+    assert retry_stats.stats == {"retries": 2, "errors": 0, "status_502": 2}
+
+
+def test_read_timeout(ote_server: OTEServer, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test a read timeout is raised as `requests.ReadTimeout` with the default
+    settings, i.e., without retries."""
+    import requests
+
+    from otelib import OTEClient
+
+    monkeypatch.setenv("OTEAPI_TIMEOUT", "[3.0, 0.1]")
+    monkeypatch.setenv("OTEAPI_PIPELINE_ENDPOINT", "false")
+
+    client = OTEClient(ote_server.url)
+    filter_ = client.create_filter(**dict(strategy_create_kwargs())["filter"])
+    session_id = filter_._create_session()
+
+    ote_server.latency = 0.5
+    with pytest.raises(requests.ReadTimeout):
+        filter_.fetch(session_id)
+    assert ote_server.requests[-1] == f"GET /filter/{filter_.strategy_id}"
+
+
+@pytest.mark.usefixtures("_retry_settings")
+def test_retry_async(ote_server: OTEServer) -> None:
+    """Test awaitable fetching is retried on transient errors."""
+    import asyncio
+    import json
+
+    from otelib import OTEClient
+
+    async def main() -> bytes:
+        async with OTEClient(ote_server.url) as client:
+            filter_ = await client.acreate_filter(
+                **dict(strategy_create_kwargs())["filter"]
+            )
+            ote_server.fail("GET", 503, times=2)
+            return await filter_.aget(), client._impl.retry_stats.stats
+
+    content, stats = asyncio.run(main())
+    assert json.loads(content) == {}
+    assert stats == {"retries": 2, "errors": 0, "status_503": 2}
+
+
+@pytest.mark.usefixtures("_retry_settings")
+def test_retry_async_errors() -> None:
+    """Test awaitable requests failing to be read, or answered with a malformed
+    `Retry-After` header, are retried like synchronous ones."""
+    import asyncio
+
+    import httpx
+
+    from otelib.backends.services.async_transport import AsyncRetryTransport
+    from otelib.backends.services.transport import RetryStats
+    from otelib.settings import Settings
+
+    answers: list[Exception | httpx.Response] = [
+        httpx.ReadTimeout("Timed out"),
+        httpx.Response(503, headers={"Retry-After": "soon"}),
+        httpx.Response(200, json={}),
+    ]
+
+    def handler(_request: httpx.Request) -> httpx.Response:
+        """Answer the requests in turn."""
+        answer = answers.pop(0)
+        if isinstance(answer, Exception):
+            raise answer
+        return answer
+
+    retry_stats = RetryStats()
+    transport = AsyncRetryTransport(
+        httpx.MockTransport(handler), Settings(), retry_stats
+    )
+
+    async def request(method: str) -> httpx.Response:
+        async with httpx.AsyncClient(transport=transport) as client:
+            return await client.request(method, "http://ote.test/api/v1/filter")
+
+    assert asyncio.run(request("GET")).status_code == 200
+    assert retry_stats.stats == {"retries": 2, "errors": 1, "status_503": 1}
+
+    # Non-idempotent requests are not retried
+    answers[:] = [httpx.ReadTimeout("Timed out")]
+    with pytest.raises(httpx.ReadTimeout):
+        asyncio.run(request("POST"))
+    assert retry_stats.retries == 2
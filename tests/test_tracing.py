@@ -0,0 +1,186 @@
+"""Test the timing and tracing hooks."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+from utils import strategy_create_kwargs
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from ote_server import OTEServer
+
+    from otelib.tracing import Span
+
+
+@pytest.fixture
+def spans() -> Iterator[list[Span]]:
+    """Collect the spans of all steps."""
+    from otelib.tracing import add_hook, remove_hook
+
+    collected: list[Span] = []
+    add_hook(collected.append)
+    yield collected
+    remove_hook(collected.append)
+
+
+def test_python_spans(spans: list[Span]) -> None:
+    """Test the steps of creating strategies and running a pipeline are reported."""
+    from otelib import OTEClient
+
+    cache = {}
+    client = OTEClient("python", cache=cache)
+    create_kwargs = dict(strategy_create_kwargs())
+    mapping = client.create_mapping(**create_kwargs["mapping"])
+    filter_ = client.create_filter(**create_kwargs["filter"])
+
+    assert [(span.name, span.strategy_id) for span in spans] == [
+        ("validate", ""),
+        ("create", mapping.strategy_id),
+        ("validate", ""),
+        ("create", filter_.strategy_id),
+    ]
+    assert spans[1].parent is None
+    # The configurations are kept by the strategies, not serialized to the cache
+    assert not cache
+
+    spans.clear()
+    content = (mapping >> filter_).get()
+
+    assert [(span.name, span.strategy_type) for span in spans] == [
+        ("create_session", "filter"),
+        ("serialize", "filter"),
+        ("initialize", "filter"),
+        ("serialize", "mapping"),
+        ("initialize", "mapping"),
+        ("serialize", "mapping"),
+        ("fetch", "mapping"),
+        ("serialize", "filter"),
+        ("serialize", "filter"),
+        ("fetch", "filter"),
+        ("pipeline", "filter"),
+    ]
+    pipeline_span = spans[-1]
+    session_id = spans[0].session_id
+    assert session_id
+    for span in spans[:-1]:
+        assert span.duration >= 0
+        assert span.start >= pipeline_span.start
+        if span.name != "serialize":
+            assert span.parent is pipeline_span
+            assert span.session_id == session_id
+    assert spans[-2].size == spans[-3].size == len(content)
+    assert spans[-2].strategy_id == filter_.strategy_id
+    # Only the output of the last strategy is serialized to bytes
+    assert spans[2].size is None
+    assert spans[6].size is None
+    assert spans[-3].parent is spans[-2]
+    assert pipeline_span.duration >= sum(
+        span.duration for span in spans if span.parent is pipeline_span
+    )
+
+
+def test_error_span(spans: list[Span]) -> None:
+    """Test a failing step is reported with its exception."""
+    from pydantic import ValidationError
+
+    from otelib import OTEClient
+
+    client = OTEClient("python", cache={})
+    with pytest.raises(ValidationError):
+        client.create_filter(filterType="filter/sql", limit="no limit")
+
+    assert [span.name for span in spans] == ["validate"]
+    assert isinstance(spans[0].error, ValidationError)
+
+
+def test_services_spans(ote_server: OTEServer) -> None:
+    """Test running a pipeline in a single request is reported."""
+    import threading
+
+    from otelib import OTEClient
+    from otelib.tracing import add_hook, remove_hook
+
+    spans: list[Span] = []
+
+    def hook(span: Span) -> None:
+        """Collect the spans of the client, not those of the stand-in server."""
+        if threading.current_thread() is threading.main_thread():
+            spans.append(span)
+
+    add_hook(hook)
+    try:
+        client = OTEClient(ote_server.url)
+        filter_ = client.create_filter(**dict(strategy_create_kwargs())["filter"])
+        assert [span.name for span in spans] == ["validate", "serialize", "create"]
+        assert spans[-1].strategy_id == filter_.strategy_id
+
+        spans.clear()
+        filter_.get()
+    finally:
+        remove_hook(hook)
+
+    assert [span.name for span in spans] == ["run_pipeline", "pipeline"]
+    assert spans[0].session_id.startswith("session-")
+    assert spans[0].size
+    assert spans[0].parent is spans[1]
+
+
+def test_remove_hook() -> None:
+    """Test a removed hook is no longer called."""
+    from otelib.tracing import add_hook, remove_hook, trace_step
+
+    spans: list[Span] = []
+    add_hook(spans.append)
+    with trace_step("step"):
+        pass
+    remove_hook(spans.append)
+    with trace_step("step"):
+        pass
+
+    assert len(spans) == 1
+
+
+def test_opentelemetry(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test spans are emitted to an OpenTelemetry tracer, and nothing is emitted if
+    OpenTelemetry is not installed."""
+    import sys
+    from contextlib import contextmanager
+
+    from otelib import OTEClient
+    from otelib.tracing import disable_opentelemetry, enable_opentelemetry
+
+    monkeypatch.setitem(sys.modules, "opentelemetry", None)
+    assert not enable_opentelemetry()
+
+    emitted: list[tuple[str, dict]] = []
+
+    class Span:
+        def __init__(self, name: str) -> None:
+            self.name = name
+
+        def set_attributes(self, attributes: dict) -> None:
+            emitted.append((self.name, attributes))
+
+    class Tracer:
+        @contextmanager
+        def start_as_current_span(self, name: str):
+            yield Span(name)
+
+    assert enable_opentelemetry(Tracer())
+    try:
+        client = OTEClient("python", cache={})
+        filter_ = client.create_filter(**dict(strategy_create_kwargs())["filter"])
+    finally:
+        disable_opentelemetry()
+
+    assert [name for name, _ in emitted] == [
+        "otelib.validate",
+        "otelib.create",
+    ]
+    assert emitted[-1][1] == {
+        "otelib.strategy_type": "filter",
+        "otelib.strategy_id": filter_.strategy_id,
+    }